@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class WeightConfig:
+    """
+    Ein Satz Lagrange-Gewichte für einen Sweep-Lauf.
+    Reihenfolge wie in den Notebooks: WeightConfig(name, c1, c2, c3_and, c3_cap, c4, makespan).
+    """
+    name: str
+    lam_c1: float
+    lam_c2: float
+    lam_c3_and: float
+    lam_c3_cap: float
+    lam_c4: float
+    w_makespan: float
+    lam_c5: float = 0.0
+
+    def as_weights(self) -> Dict[str, float]:
+        """Gewichte je Term-Gruppe (Namen wie in create_component_qubo)."""
+        return {
+            "c1": self.lam_c1,
+            "c2": self.lam_c2,
+            "c3_and": self.lam_c3_and,
+            "c3_cap": self.lam_c3_cap,
+            "c4": self.lam_c4,
+            "c5": self.lam_c5,
+            "makespan": self.w_makespan,
+        }
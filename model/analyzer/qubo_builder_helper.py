@@ -0,0 +1,130 @@
+from typing import Callable, List, Optional, Tuple
+
+from model.indexer import assign_ent_to_layout
+from model.precedence import analyze_precedence
+from model.qubo_builder import SparseQuboBuilder
+from model.constraints import c1, c2, c3, c4, c5
+from model.objectives.makespan import add_makespan_objective
+from model.symmetry import SYMMETRY_MODES, AuxIndexer, add_load_ordering, first_task_mask
+
+
+def prepare_layout(
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    window_aware: bool = False,
+    propagate_precedence: bool = False,
+    robot_mask=None,
+    occupancy: bool = False,
+):
+    """
+    Variablen-Layout wie in create_component_qubo.
+    occupancy: w als Belegungsvariable (siehe uses_occupancy_w).
+    Rückgabe: (layout, x, y, w, precedence, windows) – precedence ggf. transitiv reduziert.
+    """
+    windows = None
+    if propagate_precedence:
+        info = analyze_precedence(tasks, slots, precedence)
+        if not info.feasible:
+            raise ValueError(f"Präzedenzketten passen nicht in den Horizont: {info.windows}")
+        precedence, windows = info.edges, info.windows
+    layout, x, y, w = assign_ent_to_layout(robots, slots, tasks, window_aware, windows, robot_mask, occupancy)
+    return layout, x, y, w, precedence, windows
+
+
+def uses_occupancy_w(c3_func: Callable) -> bool:
+    """True für C3-Varianten, deren w_{t,r,z} die Belegung von Slot z meint (model.constraints.c3_)."""
+    return bool(getattr(c3_func, "w_occupancy", False))
+
+
+def create_component_qubo(
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    c3_func: Callable = c3.add_c3_capacity_no_overlap_inline,
+    window_aware: bool = False,
+    propagate_precedence: bool = False,
+    factored: bool = False,
+    symmetry: Optional[str] = None,
+):
+    """
+    Baut jede Term-Gruppe genau einmal mit Gewicht 1:
+        c1, c2, c3_and, c3_cap, c4, c5, makespan
+    Danach liefert qb.weighted(...) / qb.reweighted(...) das QUBO für beliebige
+    Gewichte, ohne die Builder erneut aufzurufen.
+
+    c3_func: eine der C3-Varianten mit Signatur (qb, tasks, robots, slots, x, y, w, lam_and, lam_cap).
+    window_aware: nur y/w-Variablen für Startslots mit z + p_t <= H anlegen; bei den
+    c3_-Varianten (w = Belegung) bleiben alle w, die ein zulässiger Start belegt.
+    propagate_precedence: Präzedenzen transitiv reduzieren und die daraus propagierten
+    Startfenster sowohl bei der Variablenerzeugung als auch in C5 verwenden.
+    factored: c4 als faktorisierte Quadrate speichern (siehe add_squared_linear_many).
+    symmetry: Symmetriebrechung für identische Roboter (model.symmetry):
+        "first_task"  Task k nur auf R_1 … R_{k+1} – x/w-Variablen entfallen
+        "load"        zusätzliche Gruppe "symmetry": Lasten nicht-steigend (Slack-Bits
+                      hinter dem Layout, qb.indexer ist dann ein AuxIndexer)
+    """
+    if symmetry is not None and symmetry not in SYMMETRY_MODES:
+        raise ValueError(f"Unbekannte Symmetriebrechung: {symmetry!r} (erlaubt: {SYMMETRY_MODES})")
+    robot_mask = first_task_mask(tasks, robots) if symmetry == "first_task" else None
+    layout, x, y, w, precedence, windows = prepare_layout(
+        tasks, robots, slots, precedence, window_aware, propagate_precedence, robot_mask,
+        uses_occupancy_w(c3_func),
+    )
+    qb = SparseQuboBuilder(AuxIndexer(layout) if symmetry == "load" else layout)
+
+    with qb.term_group("c1"):
+        c1.add_startslot_exactly_one_constraints(qb, tasks, slots, y, 1.0)
+    with qb.term_group("c2"):
+        c2.add_assignment_exactly_one_constraints(qb, tasks, robots, x, 1.0)
+    with qb.term_group("c3_and"):
+        c3_func(qb, tasks, robots, slots, x, y, w, 1.0, 0.0)
+    with qb.term_group("c3_cap"):
+        c3_func(qb, tasks, robots, slots, x, y, w, 0.0, 1.0)
+    with qb.term_group("c4"):
+        c4.add_c4_consistency_inline(qb, tasks, robots, slots, x, y, 1.0, factored)
+    with qb.term_group("c5"):
+        c5.add_c5_precedence_inline(qb, tasks, slots, y, precedence or [], 1.0, windows)
+    with qb.term_group("makespan"):
+        add_makespan_objective(qb, tasks, slots, y, 1.0)
+    if symmetry == "load":
+        with qb.term_group("symmetry"):
+            add_load_ordering(qb, tasks, robots, x, 1.0)
+
+    return qb, x, y, w
+
+
+def create_qubo_builder_func(
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    c3_func: Callable = c3.add_c3_capacity_no_overlap_inline,
+    window_aware: bool = False,
+    propagate_precedence: bool = False,
+):
+    """
+    Liefert qubo_builder_func(lam_c1, lam_c2, lam_c3_and, lam_c3_cap, lam_c4, w_makespan, lam_c5=0)
+    -> (qb, x, y, w). Die Komponenten werden einmal gebaut; jeder Aufruf ist nur noch
+    eine gewichtete Summe der gecachten Sparse-Matrizen.
+    """
+    base, x, y, w = create_component_qubo(
+        tasks, robots, slots, precedence, c3_func, window_aware, propagate_precedence
+    )
+
+    def qubo_builder_func(lam_c1, lam_c2, lam_c3_and, lam_c3_cap, lam_c4, w_makespan, lam_c5=0.0):
+        qb = base.reweighted({
+            "c1": lam_c1,
+            "c2": lam_c2,
+            "c3_and": lam_c3_and,
+            "c3_cap": lam_c3_cap,
+            "c4": lam_c4,
+            "c5": lam_c5,
+            "makespan": w_makespan,
+        })
+        return qb, x, y, w
+
+    qubo_builder_func.base = base
+    return qubo_builder_func
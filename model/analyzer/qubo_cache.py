@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model.analyzer.qubo_builder_helper import create_component_qubo, prepare_layout, uses_occupancy_w
+from model.constraints import c3
+from model.indexer import load_amr_config
+from model.qubo_builder import SparseQuboBuilder
+
+CACHE_FORMAT = 1
+
+# Quellen, deren Änderung gebaute QUBOs ungültig macht (relativ zu model/)
+_BUILDER_SOURCES = (
+    "qubo_builder.py",
+    "indexer.py",
+    "precedence.py",
+    "analyzer/qubo_builder_helper.py",
+    "constraints",
+    "objectives",
+)
+
+
+@lru_cache(maxsize=1)
+def builder_fingerprint() -> str:
+    """SHA-256 über den Quelltext aller QUBO-Builder (ändert sich mit jeder Codeänderung)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    files = []
+    for rel in _BUILDER_SOURCES:
+        path = os.path.join(root, rel)
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".py"))
+        else:
+            files.append(path)
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _func_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _as_weights(weights) -> Optional[Dict[str, float]]:
+    if weights is None:
+        return None
+    if hasattr(weights, "as_weights"):
+        weights = weights.as_weights()
+    return {k: float(v) for k, v in sorted(weights.items())}
+
+
+def cache_key(
+    robots: List[str],
+    slots: List[int],
+    tasks: List[dict],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    weights=None,
+    **params,
+) -> str:
+    """
+    Inhaltsadresse: SHA-256 über Instanz (kanonisches JSON), Gewichte (None = Komponenten),
+    Build-Parameter, Cache-Format und builder_fingerprint().
+    """
+    payload = {
+        "format": CACHE_FORMAT,
+        "builder": builder_fingerprint(),
+        "instance": {
+            "robots": list(robots),
+            "slots": list(slots),
+            "tasks": tasks,
+            "precedence": [list(e) for e in (precedence or [])],
+        },
+        "weights": _as_weights(weights),
+        "params": {k: _func_name(v) if callable(v) else v for k, v in sorted(params.items())},
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def index_table(layout) -> np.ndarray:
+    """
+    (n, 4) int32-Tabelle der Variablen: (Art, Task, Roboter, Slot) als Ordinalzahlen,
+    Art 0 = x, 1 = y, 2 = w; nicht benutzte Spalten sind -1.
+    """
+    full = np.arange(layout.T * layout.block) if layout._expand is None else layout._expand
+    t, rem = np.divmod(full, layout.block)
+    out = np.full((len(full), 4), -1, dtype=np.int32)
+    out[:, 1] = t
+    is_x = rem < layout.R
+    is_y = ~is_x & (rem < layout.R + layout.Z)
+    is_w = ~(is_x | is_y)
+    out[is_x, 0], out[is_x, 2] = 0, rem[is_x]
+    out[is_y, 0], out[is_y, 3] = 1, rem[is_y] - layout.R
+    r, z = np.divmod(rem[is_w] - layout.R - layout.Z, layout.Z)
+    out[is_w, 0], out[is_w, 2], out[is_w, 3] = 2, r, z
+    return out
+
+
+@dataclass
+class CachedComponents:
+    """
+    Komponenten-Basis aus dem Cache (rows, cols, V memory-mapped) – wie
+    SparseQuboBuilder.component_basis(); reweighted() verhält sich wie beim Builder.
+    """
+    layout: object
+    rows: np.ndarray
+    cols: np.ndarray
+    names: List[str]
+    V: np.ndarray
+
+    @property
+    def component_names(self) -> List[str]:
+        return list(self.names)
+
+    def component_basis(self):
+        return self.rows, self.cols, self.names, self.V
+
+    def weighted_coo(self, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        unknown = set(weights) - set(self.names)
+        if unknown:
+            raise KeyError(f"Unbekannte Term-Gruppen: {sorted(unknown)}")
+        coef = np.array([1.0] + [float(weights.get(g, 1.0)) for g in self.names])
+        return self.rows, self.cols, coef @ self.V
+
+    def reweighted(self, weights: Dict[str, float]) -> SparseQuboBuilder:
+        qb = SparseQuboBuilder(self.layout, capacity=1)
+        qb._merged = self.weighted_coo(weights)
+        return qb
+
+
+class QuboCache:
+    """
+    Inhaltsadressierter Plattencache gebauter QUBOs.
+
+    Ein Eintrag ist ein Verzeichnis <cache_dir>/<key>/ mit .npy-Dateien (rows, cols,
+    vals bzw. V, index) und einer kleinen meta.json.  Geladen wird mit
+    np.load(mmap_mode="r"): kein Parsen, und alle Prozesse teilen sich dieselben
+    Seiten im Page-Cache.  Einträge werden in ein temporäres Verzeichnis geschrieben
+    und atomar umbenannt, parallele Worker sehen also nie halbe Einträge.
+
+        cache = QuboCache(".qubo_cache")
+        qb, x, y, w = cache.qubo_from_file("data/amr4_slots10_task10.json", config)
+        base, x, y, w = cache.components(tasks, robots, slots, precedence)
+    """
+
+    def __init__(self, cache_dir: str = ".qubo_cache"):
+        self.cache_dir = cache_dir
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path(key), "meta.json"))
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    # ---- Rohzugriff -------------------------------------------------
+    def _write(self, key: str, arrays: Dict[str, np.ndarray], meta: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.cache_dir)
+        try:
+            for name, arr in arrays.items():
+                np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(arr))
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp, self.path(key))
+        except OSError:
+            # ein anderer Prozess war schneller – dessen Eintrag ist identisch
+            shutil.rmtree(tmp, ignore_errors=True)
+            if key not in self:
+                raise
+
+    def _read(self, key: str, names: List[str]) -> Tuple[dict, Dict[str, np.ndarray]]:
+        path = self.path(key)
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names}
+        return meta, arrays
+
+    def load_index(self, key: str) -> np.ndarray:
+        """Memory-mapped (n, 4) Index-Tabelle eines Eintrags (siehe index_table)."""
+        return self._read(key, ["index"])[1]["index"]
+
+    # ---- gewichtetes QUBO ------------------------------------------
+    def qubo(
+        self,
+        tasks: List[dict],
+        robots: List[str],
+        slots: List[int],
+        precedence: Optional[List[Tuple[str, str]]] = None,
+        weights=None,
+        c3_func: Callable = c3.add_c3_capacity_no_overlap_inline,
+        window_aware: bool = False,
+        propagate_precedence: bool = False,
+    ):
+        """
+        QUBO für weights (dict oder WeightConfig) aus dem Cache bzw. neu gebaut und abgelegt.
+        Rückgabe wie qubo_builder_func: (qb, x, y, w); qb.coo() liefert die gemappten Arrays.
+        """
+        weights = _as_weights(weights) or {}
+        params = dict(c3_func=c3_func, window_aware=window_aware, propagate_precedence=propagate_precedence)
+        key = cache_key(robots, slots, tasks, precedence, weights, **params)
+        layout, x, y, w, _, _ = prepare_layout(
+            tasks, robots, slots, precedence, window_aware, propagate_precedence,
+            occupancy=uses_occupancy_w(c3_func),
+        )
+
+        if key not in self:
+            base_key = cache_key(robots, slots, tasks, precedence, None, **params)
+            base, *_ = self._components(base_key, tasks, robots, slots, precedence, **params)
+            rows, cols, vals = base.weighted_coo(weights)
+            self._write(key, {"rows": rows, "cols": cols, "vals": vals, "index": index_table(layout)},
+                        {"format": CACHE_FORMAT, "kind": "qubo", "n": len(layout), "weights": weights})
+
+        meta, arr = self._read(key, ["rows", "cols", "vals"])
+        if meta["n"] != len(layout):
+            raise ValueError(f"Cache-Eintrag {key} passt nicht zum Layout ({meta['n']} != {len(layout)}).")
+        qb = SparseQuboBuilder(layout, capacity=1)
+        qb._merged = (arr["rows"], arr["cols"], arr["vals"])
+        return qb, x, y, w
+
+    def qubo_from_file(self, path: str, weights=None, **kwargs):
+        """Wie qubo(), aber direkt aus einer Instanz-JSON (Schlüssel über deren Inhalt)."""
+        robots, slots, tasks, precedence = load_amr_config(path)
+        return self.qubo(tasks, robots, slots, precedence, weights, **kwargs)
+
+    # ---- Komponenten (für Sweeps) ----------------------------------
+    def components(
+        self,
+        tasks: List[dict],
+        robots: List[str],
+        slots: List[int],
+        precedence: Optional[List[Tuple[str, str]]] = None,
+        c3_func: Callable = c3.add_c3_capacity_no_overlap_inline,
+        window_aware: bool = False,
+        propagate_precedence: bool = False,
+    ):
+        """
+        Gewichtsunabhängige Komponenten-Basis wie create_component_qubo, aber aus dem Cache.
+        Rückgabe: (CachedComponents, x, y, w); base.reweighted(weights) -> SparseQuboBuilder.
+        """
+        params = dict(c3_func=c3_func, window_aware=window_aware, propagate_precedence=propagate_precedence)
+        key = cache_key(robots, slots, tasks, precedence, None, **params)
+        return self._components(key, tasks, robots, slots, precedence, **params)
+
+    def _components(self, key, tasks, robots, slots, precedence, c3_func, window_aware, propagate_precedence):
+        layout, x, y, w, _, _ = prepare_layout(
+            tasks, robots, slots, precedence, window_aware, propagate_precedence,
+            occupancy=uses_occupancy_w(c3_func),
+        )
+        if key not in self:
+            qb, *_ = create_component_qubo(
+                tasks, robots, slots, precedence, c3_func, window_aware, propagate_precedence
+            )
+            rows, cols, names, V = qb.component_basis()
+            self._write(key, {"rows": rows, "cols": cols, "V": V, "index": index_table(layout)},
+                        {"format": CACHE_FORMAT, "kind": "components", "n": len(layout), "names": names})
+
+        meta, arr = self._read(key, ["rows", "cols", "V"])
+        if meta["n"] != len(layout):
+            raise ValueError(f"Cache-Eintrag {key} passt nicht zum Layout ({meta['n']} != {len(layout)}).")
+        base = CachedComponents(layout, arr["rows"], arr["cols"], meta["names"], arr["V"])
+        return base, x, y, w
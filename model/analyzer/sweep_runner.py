@@ -0,0 +1,270 @@
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from model.analyzer.config import WeightConfig
+from model.analyzer.qubo_builder_helper import create_component_qubo, uses_occupancy_w
+from model.analyzer.qubo_cache import QuboCache
+from model.constraints import c3
+from model.evaluation.violations import check_samples
+from model.solvers.annealer import SimulatedAnnealer
+
+# Komponenten-QUBO pro Instanz; wird vor dem Start gebaut und bei "fork" an die Worker vererbt.
+_BASE_CACHE: Dict[str, tuple] = {}
+
+
+def job_id(config: WeightConfig, trial: int, fingerprint: Optional[str] = None) -> str:
+    """"<config>#<trial>", mit fingerprint (sweep_fingerprint) als "<config>#<trial>@<hash>"."""
+    jid = f"{config.name}#{trial}"
+    return jid if fingerprint is None else f"{jid}@{fingerprint}"
+
+
+def _func_name(func: Optional[Callable]) -> Optional[str]:
+    return None if func is None else f"{func.__module__}.{func.__qualname__}"
+
+
+def sweep_fingerprint(
+    config: WeightConfig,
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]],
+    seed: int,
+    sa_params: Optional[dict],
+    solver: Optional[Callable],
+    c3_func: Callable,
+) -> str:
+    """
+    Kurzer SHA-256 über Instanz (Tasks, Roboter, Slots, Präzedenzen), Gewichte der config
+    und Solver-Parameter.  Teil der Job-ID – ein gemeinsamer Store liefert beim Fortsetzen
+    nur Läufe mit genau diesen Eingaben zurück.
+    """
+    payload = {
+        "instance": [tasks, list(robots), list(slots), [list(e) for e in (precedence or [])]],
+        "weights": config.as_weights(),
+        "seed": seed,
+        "sa_params": sa_params or {},
+        "solver": _func_name(solver),
+        "c3_func": _func_name(c3_func),
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def load_results(store_path: str) -> pd.DataFrame:
+    """Alle bisher gespeicherten Läufe (eine JSON-Zeile pro Lauf) als DataFrame."""
+    return pd.DataFrame(_read_records(store_path))
+
+
+def _read_records(store_path: str) -> List[dict]:
+    if not os.path.exists(store_path):
+        return []
+    records = []
+    with open(store_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # halb geschriebene letzte Zeile nach einem Absturz
+                continue
+    return records
+
+
+def _append_record(store_path: str, record: dict) -> None:
+    with open(store_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _default_solver(qb, seed, sa_params):
+    params = dict(sa_params or {})
+    res = SimulatedAnnealer(num_workers=1).sample(qb, seed=seed, **params)
+    return res.samples, res.energies
+
+
+def _build_base(tasks, robots, slots, precedence, c3_func, cache_dir):
+    if cache_dir is None:
+        return create_component_qubo(tasks, robots, slots, precedence, c3_func)
+    return QuboCache(cache_dir).components(tasks, robots, slots, precedence, c3_func)
+
+
+def _run_job(spec: dict, conn) -> None:
+    """Läuft im Worker-Prozess: QUBO gewichten, lösen, auswerten, Ergebnis zurückschicken."""
+    try:
+        t0 = time.perf_counter()
+        key = spec["instance_key"]
+        if key not in _BASE_CACHE:
+            _BASE_CACHE[key] = _build_base(
+                spec["tasks"], spec["robots"], spec["slots"], spec["precedence"], spec["c3_func"], spec["cache_dir"]
+            )
+        base, x, y, w = _BASE_CACHE[key]
+        config: WeightConfig = spec["config"]
+        qb = base.reweighted(config.as_weights())
+        t_build = time.perf_counter() - t0
+
+        solver = spec["solver"] or _default_solver
+        t1 = time.perf_counter()
+        samples, energies = solver(qb, spec["seed"], spec["sa_params"])
+        t_solve = time.perf_counter() - t1
+
+        rep = check_samples(
+            samples, spec["tasks"], spec["robots"], spec["slots"], x, y, w, spec["precedence"],
+            occupancy=uses_occupancy_w(spec["c3_func"]),
+        )
+        best = int(np.argmin(energies))
+        feas = rep.feasible
+        record = {
+            "status": "ok",
+            "energy": float(energies[best]),
+            "violations": int(rep.n_violations[best]),
+            "feasible": bool(feas[best]),
+            "n_feasible": int(feas.sum()),
+            "feasible_ratio": float(feas.mean()),
+            "makespan": float(rep.makespan[best]),
+            "best_feasible_makespan": float(np.min(rep.makespan[feas])) if feas.any() else float("nan"),
+            "build_time": t_build,
+            "solve_time": t_solve,
+        }
+    except Exception as e:  # noqa: BLE001 – Fehler landen im Store statt den Sweep abzubrechen
+        record = {"status": "error", "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    conn.send(record)
+    conn.close()
+
+
+def _receive(recv, proc) -> dict:
+    """Ergebnis eines fertigen oder beendeten Workers abholen (danach ist proc gejoint)."""
+    record = None
+    if recv.poll():
+        try:
+            record = recv.recv()
+        except EOFError:
+            pass
+    proc.join()
+    return record or {"status": "error", "error": f"Worker beendet (exitcode {proc.exitcode})"}
+
+
+def run_weight_sweep_parallel(
+    weight_configs: Sequence[WeightConfig],
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    store_path: str = "weight_sweep_results.jsonl",
+    num_trials: int = 1,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    sa_params: Optional[dict] = None,
+    solver: Optional[Callable] = None,
+    seed: int = 123,
+    retry_failed: bool = False,
+    c3_func: Callable = c3.add_c3_capacity_no_overlap_inline,
+    cache_dir: Optional[str] = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Paralleler, fortsetzbarer Weight-Sweep.
+
+    Jeder (config, trial)-Job läuft in einem eigenen Prozess (max. max_workers gleichzeitig).
+    Jedes Ergebnis wird sofort als JSON-Zeile an store_path angehängt (fsync); bei einem
+    Neustart werden bereits gespeicherte Jobs übersprungen (retry_failed=True wiederholt
+    Jobs mit Status "error"/"timeout").  Die Job-ID enthält sweep_fingerprint (Instanz,
+    Gewichte, Seed, Solver-Parameter); Läufe anderer Instanzen oder Parameter im selben
+    Store gelten also nicht als erledigt.  Läuft ein Job länger als timeout Sekunden, wird
+    sein Prozess beendet und "timeout" gespeichert.
+
+    solver: optional solver(qb, seed, sa_params) -> (samples, energies); Standard ist der
+    In-Repo SimulatedAnnealer mit sa_params (z.B. {"num_reads": 5000, "sweeps": 2000}).
+    Die Solver-Funktion muss auf Modulebene definiert sein (Pickle bei "spawn").
+
+    cache_dir: Komponenten-QUBO über QuboCache von der Platte laden bzw. dort ablegen
+    (memory-mapped; auch "spawn"-Worker und spätere Sweeps bauen dann nicht neu).
+
+    Rückgabe: alle Einträge des Stores (auch aus früheren Läufen und anderen Instanzen –
+    Spalte "fingerprint") als DataFrame.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    instance_key = json.dumps([tasks, robots, slots, precedence or [], _func_name(c3_func)], sort_keys=True, default=str)
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    if ctx.get_start_method() == "fork" and instance_key not in _BASE_CACHE:
+        _BASE_CACHE[instance_key] = _build_base(tasks, robots, slots, precedence, c3_func, cache_dir)
+
+    done = set()
+    for rec in _read_records(store_path):
+        if rec.get("status") == "ok" or not retry_failed:
+            done.add(rec.get("job_id"))
+
+    pending = deque()
+    n_done = 0
+    for config in weight_configs:
+        fp = sweep_fingerprint(config, tasks, robots, slots, precedence, seed, sa_params, solver, c3_func)
+        for trial in range(num_trials):
+            jid = job_id(config, trial, fp)
+            if jid in done:
+                n_done += 1
+                continue
+            pending.append((jid, config, trial, fp))
+    if verbose:
+        print(f"{len(pending)} Jobs offen, {n_done} bereits im Store ({store_path}).")
+
+    def _finish(jid, config, trial, fp, record, t_start):
+        record = {
+            "job_id": jid,
+            "fingerprint": fp,
+            "config": config.name,
+            "trial": trial,
+            **{k: v for k, v in asdict(config).items() if k != "name"},
+            "wall_time": time.perf_counter() - t_start,
+            **record,
+        }
+        _append_record(store_path, record)
+        if verbose:
+            print(f"  {jid}: {record['status']}" + (f"  E={record['energy']:.2f}" if record["status"] == "ok" else ""))
+
+    running: Dict[str, tuple] = {}
+    while pending or running:
+        while pending and len(running) < max_workers:
+            jid, config, trial, fp = pending.popleft()
+            spec = {
+                "instance_key": instance_key,
+                "tasks": tasks, "robots": robots, "slots": slots, "precedence": precedence or [],
+                "config": config, "seed": seed + trial, "sa_params": sa_params,
+                "solver": solver, "c3_func": c3_func, "cache_dir": cache_dir,
+            }
+            recv, send = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_run_job, args=(spec, send), daemon=True)
+            proc.start()
+            send.close()
+            running[jid] = (proc, recv, config, trial, fp, time.perf_counter())
+
+        for jid, (proc, recv, config, trial, fp, t_start) in list(running.items()):
+            # is_alive() zuerst: ein Worker kann zwischen poll() und is_alive() senden
+            # und sich beenden – _receive liest die Pipe danach noch einmal
+            if not proc.is_alive() or recv.poll():
+                record = _receive(recv, proc)
+            elif timeout is not None and time.perf_counter() - t_start > timeout:
+                proc.terminate()
+                proc.join()
+                record = {"status": "timeout", "error": f"> {timeout} s"}
+            else:
+                continue
+            recv.close()
+            del running[jid]
+            _finish(jid, config, trial, fp, record, t_start)
+
+        if running:
+            time.sleep(0.02)
+
+    return load_results(store_path)
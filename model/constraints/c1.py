@@ -1,5 +1,7 @@
 from typing import List, Dict, Tuple
+import numpy as np
 from model.qubo_builder import QuboBuilder
+from model.indexer import gather
 
 def add_startslot_exactly_one_constraints(
     qb: QuboBuilder,
@@ -17,27 +19,13 @@ def add_startslot_exactly_one_constraints(
     if not lam_c1 or not tasks or not slots:
         return qb
 
-    for t in tasks:
-        tname = t["name"]
-        
-        # explizit hier drin (reproduzierbar):
-        var_indices = [y[(tname, z)] for z in slots]
+    # Alle Tasks auf einmal: Zeile t = [y_{t,z} für z in slots]
+    groups = startslot_groups(tasks, slots, y)
+    qb.one_hot_many(groups, lam_c1)
 
-        if not var_indices:
-            continue
+    return qb
 
-        # Diagonal/linear
-        for i in var_indices:
-            qb.add_linear(i, lam_c1)         # aus v_i^2 (binär)
-            qb.add_linear(i, -2.0 * lam_c1)  # aus -2 * sum v_i
 
-        # Paare
-        n = len(var_indices)
-        for a in range(n):
-            
-            ia = var_indices[a]
-            for b in range(a + 1, n):
-                ib = var_indices[b]
-                qb.add_quad(ia, ib, 2.0 * lam_c1)
-
-    return qb
\ No newline at end of file
+def startslot_groups(tasks: List[dict], slots, y) -> np.ndarray:
+    """One-Hot-Gruppen dieses Constraints: (T, Z)-Array, Zeile t = [y_{t,z} ...]."""
+    return gather(y, [t["name"] for t in tasks], slots)
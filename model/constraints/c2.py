@@ -1,5 +1,7 @@
 from typing import List, Dict, Tuple
+import numpy as np
 from model.qubo_builder import QuboBuilder
+from model.indexer import gather
 
 def add_assignment_exactly_one_constraints(
     qb: QuboBuilder,
@@ -21,25 +23,13 @@ def add_assignment_exactly_one_constraints(
     if not lam_c2 or not tasks or not robots:
         return qb
 
-    for t in tasks:
-        tname = t["name"]
-                # Explizit hier drin (reproduzierbar):
-        var_indices = [x[(tname, r)] for r in robots]
+    # Alle Tasks auf einmal: Zeile t = [x_{t,r} für r in robots]
+    groups = assignment_groups(tasks, robots, x)
+    qb.one_hot_many(groups, lam_c2)
 
-        if not var_indices:
-            continue
-
-        # Diagonal/linear
-        for i in var_indices:
-            qb.add_linear(i, lam_c2)         # aus v_i^2 (binär)
-            qb.add_linear(i, -2.0 * lam_c2)  # aus -2 * ∑ v_i
+    return qb
 
-        # Paare (i<j)
-        n = len(var_indices)
-        for a in range(n):
-            ia = var_indices[a]
-            for b in range(a + 1, n):
-                ib = var_indices[b]
-                qb.add_quad(ia, ib, 2.0 * lam_c2)
 
-    return qb
+def assignment_groups(tasks: List[dict], robots, x) -> np.ndarray:
+    """One-Hot-Gruppen dieses Constraints: (T, R)-Array, Zeile t = [x_{t,r} ...]."""
+    return gather(x, [t["name"] for t in tasks], robots)
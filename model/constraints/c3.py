@@ -1,5 +1,6 @@
 from typing import List, Dict, Tuple
 from model.qubo_builder import QuboBuilder
+from model.indexer import gather
 
 def add_c3_capacity_no_overlap_inline(
     qb: QuboBuilder,
@@ -57,60 +58,21 @@ def add_c3_capacity_no_overlap_inline(
         Lagrange-Faktor für die Kapazitätsbedingung (Exactly-One).
         Höherer Wert → stärkeres Erzwingen der Nicht-Überlappung.
     """    
-    # --- eingebettete Hilfsfunktionen -------------------------------
-    def _and_link(xi: int, yi: int, wi: int, lam: float):
-        # (w - x)^2 = w + x - 2 w x
-        qb.add_linear(wi, lam)
-        qb.add_linear(xi, lam)
-        qb.add_quad(wi, xi, -2 * lam)
-        # (w - y)^2 = w + y - 2 w y
-        qb.add_linear(wi, lam)
-        qb.add_linear(yi, lam)
-        qb.add_quad(wi, yi, -2 * lam)
-        # (x + y - w - 1)^2 = x + y + w + 2xy - 2xw - 2yw - 2x - 2y + 2w + 1
-        qb.add_linear(xi, lam)
-        qb.add_linear(yi, lam)
-        qb.add_linear(wi, lam)
-        qb.add_quad(xi, yi, 2 * lam)
-        qb.add_quad(xi, wi, -2 * lam)
-        qb.add_quad(yi, wi, -2 * lam)
-        qb.add_linear(xi, -2 * lam)
-        qb.add_linear(yi, -2 * lam)
-        qb.add_linear(wi,  2 * lam)
-
-    def _one_hot(vars_: List[int], lam: float):
-        # (Σ v - 1)^2 = Σ v_i^2 + 2 Σ_{i<j} v_i v_j - 2 Σ v_i + 1
-        if not vars_ or not lam:
-            return
-        for v_i in vars_:
-            qb.add_linear(v_i, lam)         # Σ v_i^2  (binär)
-        for a in range(len(vars_)):
-            for b in range(a + 1, len(vars_)):
-                qb.add_quad(vars_[a], vars_[b], 2 * lam)  # 2 Σ_{i<j} v_i v_j
-        for v_i in vars_:
-            qb.add_linear(v_i, -2 * lam)    # -2 Σ v_i
-    # ----------------------------------------------------------------
-
     if not tasks or not robots or not slots:
         return qb
 
-    # AND-Verknüpfungen: w_{t,r,z} = x_{t,r} ∧ y_{t,z}
+    # Index-Tensoren (T, R), (T, Z), (T, R, Z)
+    names = [t["name"] for t in tasks]
+    X = gather(x, names, robots)
+    Y = gather(y, names, slots)
+    W = gather(w, names, robots, slots)
+
+    # AND-Verknüpfungen: w_{t,r,z} = x_{t,r} ∧ y_{t,z}  (alle (t,r,z) in einem Aufruf)
     if lam3_and:
-        for t in tasks:
-            tname = t["name"]
-            for r in robots:
-                for z in slots:
-                    _and_link(
-                        x[(tname, r)],
-                        y[(tname, z)],
-                        w[(tname, r, z)],
-                        lam3_and
-                    )
-
-    # Kapazität pro (r,z): Exactly-One über w_{t,r,z}
+        qb.and_link_many(X[:, :, None], Y[:, None, :], W, lam3_and)
+
+    # Kapazität pro (r,z): Exactly-One über w_{t,r,z}  -> Gruppen (R·Z, T)
     if lam3_cap:
-        for r in robots:
-            for z in slots:
-                _one_hot([w[(t["name"], r, z)] for t in tasks], lam3_cap)
+        qb.one_hot_many(W.transpose(1, 2, 0).reshape(-1, len(tasks)), lam3_cap)
 
     return qb
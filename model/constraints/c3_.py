@@ -1,5 +1,9 @@
 from typing import List, Dict, Tuple
+
+import numpy as np
+
 from model.qubo_builder import QuboBuilder
+from model.indexer import gather
 
 def add_c3_simplified(
     qb: QuboBuilder,
@@ -41,63 +45,15 @@ def add_c3_simplified(
     if not tasks or not robots or not slots:
         return qb
 
-    dur = {t["name"]: t["p"] for t in tasks}
-
-    # ═══════════════════════════════════════════════════════════
-    #  HELPER FUNCTIONS
-    # ═══════════════════════════════════════════════════════════
-    
-    def _at_most_one(vars_, lam):
-        """At-most-one constraint: Σ_i v_i ≤ 1 via pairwise penalties."""
-        if not vars_ or not lam:
-            return
-        for a in range(len(vars_)):
-            for b in range(a + 1, len(vars_)):
-                qb.add_quad(vars_[a], vars_[b], 2 * lam)
-
-    def _link_w_le_x(wi, xi, lam):
-        """Upper bound: w ≤ x via penalty w(1-x)"""
-        qb.add_linear(wi, lam)
-        qb.add_quad(wi, xi, -lam)
-
-    def _link_w_le_window(wi, y_idxs, lam):
-        """Upper bound: w ≤ Σy via penalty w(1 - Σy)"""
-        if not y_idxs:
-            # Kein gültiges Fenster -> w muss 0 sein
-            qb.add_linear(wi, lam)
-            return
-        
-        # Standard: w(1 - Σy)
-        qb.add_linear(wi, lam)
-        for yi in y_idxs:
-            qb.add_quad(wi, yi, -lam)
-
     # ═══════════════════════════════════════════════════════════
     #  LINKING (lam_c3_and) - OHNE Duration!
     # ═══════════════════════════════════════════════════════════
-    
+
+    # 1) w_{t,r,z} ≤ x_{t,r}   2) w_{t,r,z} ≤ Σ_{s: s≤z<s+p} y_{t,s}
     if lam_c3_and:
-        for t in tasks:
-            tname = t["name"]
-            p = dur[tname]
-            
-            for r in robots:
-                xi = x[(tname, r)]
-                
-                for z in slots:
-                    wi = w[(tname, r, z)]
-
-                    # 1) Upper bound: w_{t,r,z} ≤ x_{t,r}
-                    _link_w_le_x(wi, xi, lam_c3_and)
-
-                    # 2) Upper bound: w_{t,r,z} ≤ Σ_{s: s≤z<s+p} y_{t,s}
-                    #    (z ist aktiv, wenn Task in [z-p+1, ..., z] startet)
-                    window_s = [s for s in slots if z - p + 1 <= s <= z]
-                    y_idxs = [y[(tname, s)] for s in window_s]
-                    _link_w_le_window(wi, y_idxs, lam_c3_and)
-
-                # ❌ ENTFERNT: Duration-Constraint
-                # _eq_sum_w_equals_p_times_x(w_all_z, xi, p, lam_c3_and)
+        _link_w_many(qb, tasks, robots, slots, x, y, w, lam_c3_and)
+
+    # ❌ ENTFERNT: Duration-Constraint (siehe add_c3_capacity_no_overlap)
 
     # ═══════════════════════════════════════════════════════════
     #  CAPACITY (lam_c3_cap)
@@ -105,10 +61,10 @@ def add_c3_simplified(
     
     # 4) Capacity: At-most-one Task pro (Robot, Slot)
     if lam_c3_cap:
-        for r in robots:
-            for z in slots:
-                conflict_vars = [w[(t["name"], r, z)] for t in tasks]
-                _at_most_one(conflict_vars, lam_c3_cap)
+        # Alle (r,z)-Gruppen auf einmal: Zeile = [w_{t,r,z} für t in tasks]
+        W = gather(w, [t["name"] for t in tasks], robots, slots)
+        groups = W.transpose(1, 2, 0).reshape(-1, len(tasks))
+        qb.at_most_one_many(groups, lam_c3_cap)
 
     return qb
 
@@ -138,76 +94,71 @@ def add_c3_capacity_no_overlap(
     if not tasks or not robots or not slots:
         return qb
 
-    dur = {t["name"]: t["p"] for t in tasks}
-
-    def _at_most_one(vars_, lam):
-        if not vars_ or not lam:
-            return
-        for a in range(len(vars_)):
-            for b in range(a + 1, len(vars_)):
-                qb.add_quad(vars_[a], vars_[b], 2 * lam)
-
-    def _link_w_le_x(wi, xi, lam):
-        qb.add_linear(wi, lam)
-        qb.add_quad(wi, xi, -lam)
-
-    def _link_w_le_window(wi, y_idxs, lam):
-        if not y_idxs:
-            qb.add_linear(wi, lam)
-            return
-        qb.add_linear(wi, lam)
-        for yi in y_idxs:
-            qb.add_quad(wi, yi, -lam)
-
-    def _eq_sum_w_equals_p_times_x(w_idxs, xi, p, lam):
-        """
-        ⚠️ ERZEUGT w-w KOPPLUNGEN!
-        (Σ_z w - p·x)² = (Σw)² - 2p·x·Σw + p²·x
-        """
-        if not w_idxs or not lam:
-            return
-        
-        # (Σw)²: erzeugt w-w Kopplungen!
-        for i in range(len(w_idxs)):
-            qb.add_linear(w_idxs[i], lam)
-            for j in range(i + 1, len(w_idxs)):
-                qb.add_quad(w_idxs[i], w_idxs[j], 2 * lam)  # ← 420 w-w Terme!
-        
-        # -2p·x·Σw
-        for wi in w_idxs:
-            qb.add_quad(wi, xi, -2 * p * lam)
-        
-        # +p²·x
-        qb.add_linear(xi, (p * p) * lam)
-
     # Linking + Duration
     if lam_c3_and:
-        for t in tasks:
-            tname = t["name"]
-            p = dur[tname]
-            
-            for r in robots:
-                xi = x[(tname, r)]
-                w_all_z = []
-                
-                for z in slots:
-                    wi = w[(tname, r, z)]
-                    w_all_z.append(wi)
-
-                    _link_w_le_x(wi, xi, lam_c3_and)
-
-                    window_s = [s for s in slots if z - p + 1 <= s <= z]
-                    y_idxs = [y[(tname, s)] for s in window_s]
-                    _link_w_le_window(wi, y_idxs, lam_c3_and)
-
-                # ⚠️ Duration-Constraint (erzeugt w-w!)
-                _eq_sum_w_equals_p_times_x(w_all_z, xi, p, lam_c3_and)
+        X, W = _link_w_many(qb, tasks, robots, slots, x, y, w, lam_c3_and)
+        _duration_many(qb, tasks, X, W, lam_c3_and)
 
     # Capacity
     if lam_c3_cap:
-        for r in robots:
-            for z in slots:
-                conflict_vars = [w[(t["name"], r, z)] for t in tasks]
-                _at_most_one(conflict_vars, lam_c3_cap)
+        # Alle (r,z)-Gruppen auf einmal: Zeile = [w_{t,r,z} für t in tasks]
+        W = gather(w, [t["name"] for t in tasks], robots, slots)
+        groups = W.transpose(1, 2, 0).reshape(-1, len(tasks))
+        qb.at_most_one_many(groups, lam_c3_cap)
 
-    return qb
\ No newline at end of file
+    return qb
+
+
+# ═══════════════════════════════════════════════════════════
+#  BATCH-TERME (alle (t, r, z) auf einmal, -1 = Variable fehlt)
+# ═══════════════════════════════════════════════════════════
+
+def _link_w_many(qb, tasks, robots, slots, x, y, w, lam):
+    """
+    Für jedes vorhandene w_{t,r,z} mit vorhandenem x_{t,r}:
+        w(1 - x)       (w ≤ x)
+        w(1 - Σ y_s)   (w ≤ Σ_{s: s≤z<s+p} y_{t,s}; ohne Fenster nur +lam·w)
+    Rückgabe: (X, W) aus gather, W bereits auf vorhandene x eingeschränkt.
+    """
+    names = [t["name"] for t in tasks]
+    X = gather(x, names, robots)
+    Y = gather(y, names, slots)
+    W = gather(w, names, robots, slots)
+    W = np.where(X[:, :, None] >= 0, W, -1)
+    t_i, r_i, z_i = np.nonzero(W >= 0)
+    wi = W[t_i, r_i, z_i]
+
+    qb.add_terms(wi, wi, 2.0 * lam)
+    qb.add_terms(wi, X[t_i, r_i], -lam)
+
+    # cover[t, z, s]: Start in Slot s belegt Slot z
+    zv = np.asarray(slots)
+    p = np.array([int(t["p"]) for t in tasks], dtype=np.int64)
+    cover = (zv[None, None, :] <= zv[None, :, None]) & (zv[None, :, None] - p[:, None, None] + 1 <= zv[None, None, :])
+    cover &= Y[:, None, :] >= 0
+    k, s_i = np.nonzero(cover[t_i, z_i])
+    qb.add_terms(wi[k], Y[t_i[k], s_i], -lam)
+    return X, W
+
+
+def _duration_many(qb, tasks, X, W, lam):
+    """
+    (Σ_z w_{t,r,z} - p_t·x_{t,r})² = Σw + 2Σ_{z<z'} w w' - 2p·x·Σw + p²·x
+    für jedes (t, r) mit mindestens einem w.  ⚠️ erzeugt die w-w Kopplungen!
+    """
+    p = np.array([int(t["p"]) for t in tasks], dtype=np.float64)
+    t_i, r_i, z_i = np.nonzero(W >= 0)
+    wi = W[t_i, r_i, z_i]
+    qb.add_terms(wi, wi, lam)
+    qb.at_most_one_many(W.reshape(-1, W.shape[2]), lam)
+    qb.add_terms(wi, X[t_i, r_i], -2.0 * p[t_i] * lam)
+    has_w = (W >= 0).any(axis=2)
+    t_x, r_x = np.nonzero(has_w)
+    qb.add_terms(X[t_x, r_x], X[t_x, r_x], p[t_x] ** 2 * lam)
+
+
+# w_{t,r,z} heißt in beiden Varianten "Task t belegt Slot z auf Roboter r" (nicht: startet
+# in z).  prepare_layout/create_component_qubo behalten bei window_aware deshalb alle
+# belegbaren Slots (VariableLayout(occupancy=True)).
+add_c3_simplified.w_occupancy = True
+add_c3_capacity_no_overlap.w_occupancy = True
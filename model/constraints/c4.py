@@ -9,6 +9,7 @@ def add_c4_consistency_inline(
     x: Dict[Tuple[str, str], int],      # (tname, rname) -> idx  für x_{t,r}
     y: Dict[Tuple[str, int], int],      # (tname, z)     -> idx  für y_{t,z}
     lam_c4: float,                      # Strafgewicht λ
+    factored: bool = False,
 ):
     """
     C4 - Robot-Slot Consistency:
@@ -30,17 +31,36 @@ def add_c4_consistency_inline(
         x: Mapping (task, robot) -> QUBO-Variable-Index
         y: Mapping (task, slot) -> QUBO-Variable-Index
         lam_c4: Gewichtungsfaktor für dieses Constraint
+        factored: (Σx - Σy)² als faktorisierten Term speichern (qb.add_squared_linear_many)
+                  statt (R + Z)²/2 Paar-Kopplern
     """
 
     if not lam_c4 or not tasks or not robots or not slots:
         return qb
 
+    if factored:
+        groups, coefs = [], []
+        for t in tasks:
+            tname = t["name"]
+            x_idxs = [x[(tname, r)] for r in robots if (tname, r) in x]
+            y_idxs = [y[(tname, z)] for z in slots if (tname, z) in y]
+            groups.append(x_idxs + y_idxs)
+            coefs.append([1.0] * len(x_idxs) + [-1.0] * len(y_idxs))
+        k = max(len(g) for g in groups)
+        qb.add_squared_linear_many(
+            [g + [-1] * (k - len(g)) for g in groups],
+            [c + [0.0] * (k - len(c)) for c in coefs],
+            0.0,
+            lam_c4,
+        )
+        return qb
+
     for t in tasks:
         tname = t["name"]
         
         # Sammle alle Indizes für diesen Task
-        x_idxs = [x[(tname, r)] for r in robots]
-        y_idxs = [y[(tname, z)] for z in slots]
+        x_idxs = [x[(tname, r)] for r in robots if (tname, r) in x]
+        y_idxs = [y[(tname, z)] for z in slots if (tname, z) in y]
 
         # ═══════════════════════════════════════════════════════════
         #  (Σx - Σy)² EXPANSION
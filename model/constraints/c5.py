@@ -1,5 +1,8 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 from model.qubo_builder import QuboBuilder
+from model.indexer import gather
+from model.precedence import window_mask
 
 def add_c5_precedence_inline(
     qb: QuboBuilder,
@@ -8,12 +11,16 @@ def add_c5_precedence_inline(
     y: Dict[Tuple[str, int], int],          # (tname, z) -> idx  für y_{t,z}
     precedence: List[Tuple[str, str]],      # Paare (a,b) mit a ≺ b
     lam_c5: float,                          # λ für c5 (Präzedenz)
+    windows: Optional[Dict[str, Tuple[int, int]]] = None,  # Startfenster je Task
 ):
     """
     c5 = H7 = ∑_{(a,b)∈P} ∑_{z_a∈Z} ∑_{z_b < z_a + p_a} y_{a,z_a} * y_{b,z_b}
 
     Bestraft alle Startzeit-Kombinationen, bei denen b vor dem Ende von a startet.
     (Nur Quadratterme; keine linearen Beiträge.)
+
+    Mit windows (z.B. model.precedence.analyze_precedence(...).windows, zusammen mit
+    den reduzierten Kanten .edges) werden nur Startslots innerhalb der Fenster bestraft.
     """
     if not lam_c5 or not tasks or not slots or not precedence:
         return qb
@@ -21,11 +28,19 @@ def add_c5_precedence_inline(
     # Dauer p_t pro Task
     p_by_t = {t["name"]: int(t["p"]) for t in tasks}
 
+    names = [t["name"] for t in tasks]
+    t_ord = {name: i for i, name in enumerate(names)}
+    Y = gather(y, names, slots)          # (T, Z)
+    if windows is not None:
+        Y = np.where(window_mask(tasks, slots, windows), Y, -1)
+    z_arr = np.asarray(slots)
+
     for (a, b) in precedence:
         p_a = p_by_t[a]
-        for z_a in slots:
-            for z_b in slots:
-                if z_b < z_a + p_a:  # Verletzung: b startet zu früh
-                    qb.add_quad(y[(a, z_a)], y[(b, z_b)], lam_c5)
+        # Verletzung: b startet zu früh (z_b < z_a + p_a) – alle Paare auf einmal
+        za, zb = np.nonzero(z_arr[None, :] < z_arr[:, None] + p_a)
+        ya, yb = Y[t_ord[a], za], Y[t_ord[b], zb]
+        keep = (ya >= 0) & (yb >= 0)         # nicht registrierte Startslots überspringen
+        qb.add_terms(ya[keep], yb[keep], lam_c5)
 
     return qb
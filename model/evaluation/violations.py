@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from model.indexer import gather, occupancy_cover, uses_occupancy
+
+
+@dataclass
+class ViolationReport:
+    """
+    Ergebnis von check_samples – ein Eintrag pro Read (Zeile der Sample-Matrix).
+
+    c1        Tasks mit Σ_z y_{t,z} != 1
+    c2        Tasks mit Σ_r x_{t,r} != 1
+    c3_and    (t,r,z) mit w_{t,r,z} != x_{t,r} ∧ y_{t,z}   (0, wenn keine w übergeben);
+              bei Belegungs-w (c3_) w_{t,r,z} != x_{t,r} ∧ Σ_{s≤z<s+p_t} y_{t,s}
+    c3_cap    Überbelegung: Σ_{r,z} max(0, #aktive Tasks auf (r,z) - 1)
+    c4        Tasks mit Σ_r x_{t,r} != Σ_z y_{t,z}
+    c5        verletzte Präzedenz-Startpaare  Σ_{(a,b)} Σ_{z_b < z_a + p_a} y_{a,z_a} y_{b,z_b}
+    horizon   Tasks, die nach dem letzten Slot enden (z + p_t > max(slots) + 1)
+    """
+    task_names: List[str]
+    robots: List[str]
+    slots: List[int]
+    durations: np.ndarray          # (T,)
+    robot: np.ndarray              # (n, T) Roboter-Ordinal, -1 = nicht eindeutig
+    start: np.ndarray              # (n, T) Startslot (Wert), -1 = nicht eindeutig
+    c1: np.ndarray
+    c2: np.ndarray
+    c3_and: np.ndarray
+    c3_cap: np.ndarray
+    c4: np.ndarray
+    c5: np.ndarray
+    horizon: np.ndarray
+    makespan: np.ndarray           # (n,) max_t (start_t + p_t), nan wenn nicht dekodierbar
+
+    @property
+    def n_violations(self) -> np.ndarray:
+        return self.c1 + self.c2 + self.c3_and + self.c3_cap + self.c4 + self.c5 + self.horizon
+
+    @property
+    def feasible(self) -> np.ndarray:
+        return self.n_violations == 0
+
+    def feasible_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.feasible)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Eine Zeile pro Read mit allen Zählern, Feasibility und Makespan."""
+        return pd.DataFrame({
+            "c1": self.c1, "c2": self.c2, "c3_and": self.c3_and, "c3_cap": self.c3_cap,
+            "c4": self.c4, "c5": self.c5, "horizon": self.horizon,
+            "violations": self.n_violations, "feasible": self.feasible, "makespan": self.makespan,
+        })
+
+    def schedule(self, reads: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """
+        Dekodierter Plan (read, task, robot, start, end) für die gewählten Reads
+        (Standard: alle). Nicht eindeutig dekodierbare Einträge sind None.
+        """
+        reads = np.arange(len(self.c1)) if reads is None else np.asarray(reads, dtype=np.int64)
+        T = len(self.task_names)
+        r = self.robot[reads].ravel()
+        st = self.start[reads].ravel()
+        robots = np.array(self.robots + [None], dtype=object)
+        p = np.tile(self.durations, len(reads))
+        return pd.DataFrame({
+            "read": np.repeat(reads, T),
+            "task": np.tile(np.array(self.task_names, dtype=object), len(reads)),
+            "robot": robots[r],
+            "start": np.where(st >= 0, st, None),
+            "end": np.where(st >= 0, st + p, None),
+        })
+
+
+def _take(S: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """S[:, idx] mit 0 für nicht registrierte Variablen (idx = -1)."""
+    return np.where(idx >= 0, S[:, np.maximum(idx, 0)], 0).astype(S.dtype)
+
+
+def _decode_one_hot(M: np.ndarray) -> np.ndarray:
+    """(n, T, K) -> (n, T) Ordinal der gesetzten Variable, -1 wenn nicht genau eine."""
+    idx = M.argmax(axis=2)
+    return np.where(M.sum(axis=2) == 1, idx, -1)
+
+
+def check_samples(
+    samples,
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    x,
+    y,
+    w=None,
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    occupancy: Optional[bool] = None,
+) -> ViolationReport:
+    """
+    Prüft alle Reads einer Sample-Matrix (n_samples, n_vars) in einem vektorisierten
+    Durchlauf gegen C1–C5 und dekodiert Roboter/Startslot je Task.
+
+    x, y, w: Index-Mappings wie von assign_ent_to_indexer bzw. assign_ent_to_layout.
+    occupancy: w heißt "Task belegt Slot" (C3-Varianten in c3_) statt "startet in Slot";
+    None übernimmt es aus dem Layout von w (uses_occupancy).
+    """
+    S = np.asarray(samples)
+    if S.ndim == 1:
+        S = S[None, :]
+    S = S.astype(np.int8, copy=False)
+    names = [t["name"] for t in tasks]
+    p = np.array([int(t["p"]) for t in tasks], dtype=np.int64)
+    z_vals = np.asarray(slots, dtype=np.int64)
+    n = S.shape[0]
+
+    X = _take(S, gather(x, names, robots))                 # (n, T, R)
+    Y = _take(S, gather(y, names, slots))                  # (n, T, Z)
+    sx = X.sum(axis=2)
+    sy = Y.sum(axis=2)
+
+    c1 = (sy != 1).sum(axis=1)
+    c2 = (sx != 1).sum(axis=1)
+    c4 = (sx != sy).sum(axis=1)
+
+    if w is not None:
+        W = _take(S, gather(w, names, robots, slots))      # (n, T, R, Z)
+        if occupancy is None:
+            occupancy = uses_occupancy(w)
+        if occupancy:
+            busy = np.einsum("nts,tsk->ntk", Y.astype(np.int64), occupancy_cover(slots, tasks).astype(np.int64)) > 0
+        else:
+            busy = Y
+        c3_and = (W != (X[:, :, :, None] & busy[:, :, None, :])).sum(axis=(1, 2, 3))
+    else:
+        c3_and = np.zeros(n, dtype=np.int64)
+
+    robot = _decode_one_hot(X)
+    z_ord = _decode_one_hot(Y)
+    start = np.where(z_ord >= 0, z_vals[np.maximum(z_ord, 0)], -1)
+    end = start + p[None, :]
+    ok = start >= 0
+
+    # Belegung pro (r, z): Task t ist in Slot k aktiv, wenn start_t <= k < start_t + p_t
+    active = ok[:, :, None] & (z_vals[None, None, :] >= start[:, :, None]) & (z_vals[None, None, :] < end[:, :, None])
+    on_robot = (robot[:, :, None] == np.arange(len(robots))[None, None, :])  # (n, T, R)
+    occ = np.einsum("ntr,ntk->nrk", on_robot.astype(np.int64), active.astype(np.int64))
+    c3_cap = np.maximum(occ - 1, 0).sum(axis=(1, 2))
+
+    horizon = (ok & (end > z_vals.max() + 1)).sum(axis=1)
+
+    c5 = np.zeros(n, dtype=np.int64)
+    t_ord = {name: i for i, name in enumerate(names)}
+    for (a, b) in precedence or []:
+        ia, ib = t_ord[a], t_ord[b]
+        viol = (z_vals[None, :] < z_vals[:, None] + p[ia]).astype(np.int64)   # (z_a, z_b)
+        c5 += np.einsum("nz,zq,nq->n", Y[:, ia].astype(np.int64), viol, Y[:, ib].astype(np.int64))
+
+    makespan = np.where(ok.all(axis=1), np.where(ok, end, 0).max(axis=1), np.nan)
+
+    return ViolationReport(
+        task_names=names,
+        robots=list(robots),
+        slots=list(slots),
+        durations=p,
+        robot=robot,
+        start=start,
+        c1=c1, c2=c2, c3_and=c3_and, c3_cap=c3_cap, c4=c4, c5=c5, horizon=horizon,
+        makespan=makespan,
+    )
+
+
+def decode_sample(sample, tasks, robots, slots, x, y, w=None, precedence=None, occupancy=None) -> pd.DataFrame:
+    """Plan eines einzelnen Samples (dict idx->0/1 oder Array) als DataFrame."""
+    if isinstance(sample, dict):
+        n_vars = max(sample) + 1
+        arr = np.zeros(n_vars, dtype=np.int8)
+        arr[list(sample.keys())] = list(sample.values())
+        sample = arr
+    return check_samples(sample, tasks, robots, slots, x, y, w, precedence, occupancy).schedule([0])
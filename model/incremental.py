@@ -0,0 +1,296 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from model.indexer import DynamicIndexer
+from model.qubo_builder import QuboBuilder, SparseQuboBuilder
+from model.constraints import c1, c2, c3, c4, c5
+from model.objectives.makespan import add_makespan_objective
+from model.precedence import topological_order
+
+# Term-Gruppen wie in create_component_qubo
+GROUPS = ("c1", "c2", "c3_and", "c3_cap", "c4", "c5", "makespan")
+
+
+@dataclass
+class QuboDelta:
+    """
+    Änderung des QUBOs durch eine Operation: Q_neu = Q_alt + (rows, cols, vals).
+    added/removed: neu vergebene bzw. freigegebene Indizes -> Variablen-Schlüssel.
+    Freigegebene Indizes haben danach keine Terme mehr und können von einer späteren
+    Operation neu vergeben werden; size ist die QUBO-Dimension nach der Operation.
+    """
+    rows: np.ndarray
+    cols: np.ndarray
+    vals: np.ndarray
+    added: Dict[int, Tuple] = field(default_factory=dict)
+    removed: Dict[int, Tuple] = field(default_factory=dict)
+    size: int = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def as_dict(self) -> Dict[Tuple[int, int], float]:
+        return dict(zip(zip(self.rows.tolist(), self.cols.tolist()), self.vals.tolist()))
+
+    def to_scipy_sparse(self, fmt: str = "csr", size: Optional[int] = None):
+        """Delta als obere Dreiecksmatrix (z.B. zum Aufaddieren auf eine Solver-Matrix)."""
+        from scipy.sparse import coo_matrix
+        n = size or self.size
+        return coo_matrix((self.vals, (self.rows, self.cols)), shape=(n, n)).asformat(fmt)
+
+
+class IncrementalQuboBuilder(QuboBuilder):
+    """
+    QUBO (c1–c5 + Makespan) für eine sich ändernde Task-Menge.
+
+    add_task / remove_task / change_duration / add_precedence berühren nur die Terme,
+    an denen die betroffene Task beteiligt ist:
+        c1, c2, c3_and, c4, makespan   nur Variablen der Task selbst
+        c3_cap                         Paare w_{t,r,z}·w_{u,r,z} mit den übrigen Tasks
+        c5                             Kanten, an denen die Task hängt
+    Der Aufwand hängt damit von der Größe der Änderung ab (O(R·Z) Variablen plus die
+    Kapazitätspaare mit den anderen Tasks), nicht vom Neuaufbau aller Constraints.
+    Jede Operation liefert ein QuboDelta; Q selbst (Dict wie beim QuboBuilder) wird
+    gleich mit aktualisiert.  Indizes kommen aus einem DynamicIndexer mit Freiliste.
+
+    weights: {gruppe: λ} bzw. WeightConfig, Namen wie in create_component_qubo
+    (fehlende Gruppen haben Gewicht 1).
+    window_aware: y/w nur für Startslots mit z + p_t <= H (ändert sich mit change_duration).
+
+        qb = IncrementalQuboBuilder(robots, slots, weights, tasks, precedence)
+        delta = qb.add_task({"name": "T9", "p": 2}, after=["T3"])
+        delta = qb.remove_task("T4")
+    """
+
+    def __init__(
+        self,
+        robots: List[str],
+        slots: List[int],
+        weights=None,
+        tasks: Iterable[dict] = (),
+        precedence: Iterable[Tuple[str, str]] = (),
+        window_aware: bool = False,
+        eps: float = 1e-12,
+    ):
+        super().__init__(DynamicIndexer())
+        if hasattr(weights, "as_weights"):
+            weights = weights.as_weights()
+        weights = dict(weights or {})
+        unknown = set(weights) - set(GROUPS)
+        if unknown:
+            raise KeyError(f"Unbekannte Term-Gruppen: {sorted(unknown)}")
+        self.lam = {g: float(weights.get(g, 1.0)) for g in GROUPS}
+        self.robots = list(robots)
+        self.slots = list(slots)
+        self.horizon = max(self.slots) + 1
+        self.window_aware = window_aware
+        self.eps = eps
+        self.tasks: Dict[str, dict] = {}
+        self.precedence: List[Tuple[str, str]] = []
+        self.x: Dict[Tuple[str, str], int] = {}
+        self.y: Dict[Tuple[str, int], int] = {}
+        self.w: Dict[Tuple[str, str, int], int] = {}
+        # Kapazitätsgruppen (r, z) -> {task: w-Index} für die c3_cap-Paare
+        self._cap: Dict[Tuple[str, int], Dict[str, int]] = {}
+
+        for t in tasks:
+            self.add_task(t)
+        for a, b in precedence:
+            self.add_precedence(a, b)
+
+    # ---- Variablen ------------------------------------------------
+    def _starts(self, p: int) -> List[int]:
+        if not self.window_aware:
+            return list(self.slots)
+        return [z for z in self.slots if z + p <= self.horizon]
+
+    def _register(self, name: str, added: Dict[int, Tuple]) -> None:
+        """Fehlende x/y/w-Variablen der Task anlegen (bestehende behalten ihren Index)."""
+        starts = self._starts(int(self.tasks[name]["p"]))
+        keys = [("x", name, r) for r in self.robots]
+        keys += [("y", name, z) for z in starts]
+        keys += [("w", name, r, z) for r in self.robots for z in starts]
+        for key in keys:
+            if key in self.indexer:
+                continue
+            idx = self.indexer.get(key)
+            added[idx] = key
+            if key[0] == "x":
+                self.x[key[1:]] = idx
+            elif key[0] == "y":
+                self.y[key[1:]] = idx
+            else:
+                self.w[key[1:]] = idx
+                self._cap.setdefault((key[2], key[3]), {})[name] = idx
+
+    def _release(self, name: str, removed: Dict[int, Tuple], keep_starts: Optional[List[int]] = None) -> None:
+        """Variablen der Task freigeben; keep_starts: x und diese Startslots bleiben erhalten."""
+        keep = None if keep_starts is None else set(keep_starts)
+        if keep is None:
+            for r in self.robots:
+                removed[self.indexer.release(("x", name, r))] = ("x", name, r)
+                del self.x[(name, r)]
+        for z in self.slots:
+            if (name, z) not in self.y or (keep is not None and z in keep):
+                continue
+            removed[self.indexer.release(("y", name, z))] = ("y", name, z)
+            del self.y[(name, z)]
+            for r in self.robots:
+                removed[self.indexer.release(("w", name, r, z))] = ("w", name, r, z)
+                del self.w[(name, r, z)]
+                del self._cap[(r, z)][name]
+
+    # ---- Terme einer Task ------------------------------------------
+    def _task_terms(self, name: str, delta: SparseQuboBuilder) -> None:
+        """Alle Terme, an denen Task name beteiligt ist (bei aktuellem Zustand), nach delta."""
+        lam = self.lam
+        task = [self.tasks[name]]
+        c1.add_startslot_exactly_one_constraints(delta, task, self.slots, self.y, lam["c1"])
+        c2.add_assignment_exactly_one_constraints(delta, task, self.robots, self.x, lam["c2"])
+        # AND-Links und lineare Kapazitätsterme der eigenen w (Gruppe mit nur einer Task)
+        c3.add_c3_capacity_no_overlap_inline(
+            delta, task, self.robots, self.slots, self.x, self.y, self.w, lam["c3_and"], lam["c3_cap"]
+        )
+        if lam["c3_cap"]:
+            rows, cols = [], []
+            for r in self.robots:
+                for z in self.slots:
+                    group = self._cap.get((r, z), {})
+                    if name not in group:
+                        continue
+                    own = group[name]
+                    others = [i for u, i in group.items() if u != name]
+                    rows += [own] * len(others)
+                    cols += others
+            delta.add_terms(rows, cols, 2.0 * lam["c3_cap"])
+        c4.add_c4_consistency_inline(delta, task, self.robots, self.slots, self.x, self.y, lam["c4"])
+        add_makespan_objective(delta, task, self.slots, self.y, lam["makespan"])
+        for a, b in self.precedence:
+            if name in (a, b):
+                self._edge_terms(a, b, delta)
+
+    def _edge_terms(self, a: str, b: str, delta: SparseQuboBuilder) -> None:
+        c5.add_c5_precedence_inline(
+            delta, [self.tasks[a], self.tasks[b]], self.slots, self.y, [(a, b)], self.lam["c5"]
+        )
+
+    # ---- Delta anwenden --------------------------------------------
+    def _commit(self, delta: SparseQuboBuilder, sign: SparseQuboBuilder, added, removed) -> QuboDelta:
+        """
+        delta (+) und sign (-) zusammenführen, auf Q anwenden und als QuboDelta liefern.
+        Einträge, die sich exakt aufheben, tauchen im Delta nicht auf.
+        """
+        r_p, c_p, v_p = delta.coo()
+        r_m, c_m, v_m = sign.coo()
+        if len(r_m):
+            merged = SparseQuboBuilder(self.indexer, capacity=len(r_p) + len(r_m))
+            merged.add_terms(r_p, c_p, v_p)
+            merged.add_terms(r_m, c_m, -v_m)
+            r_p, c_p, v_p = merged.coo()
+        nz = v_p != 0
+        rows, cols, vals = r_p[nz], c_p[nz], v_p[nz]
+
+        gone = set(removed)
+        for i, j, v in zip(rows.tolist(), cols.tolist(), vals.tolist()):
+            q = self.Q[(i, j)] + v
+            if i in gone or j in gone or abs(q) < self.eps:
+                del self.Q[(i, j)]
+            else:
+                self.Q[(i, j)] = q
+        self._basis = None
+        return QuboDelta(rows, cols, vals, added, removed, len(self.indexer))
+
+    def _builder(self) -> SparseQuboBuilder:
+        return SparseQuboBuilder(self.indexer, capacity=1024)
+
+    # ---- Operationen -----------------------------------------------
+    def add_task(self, task: dict, after: Iterable[str] = (), before: Iterable[str] = ()) -> QuboDelta:
+        """
+        Neue Task registrieren; after/before: Präzedenzen a ≺ task bzw. task ≺ b
+        zu bereits vorhandenen Tasks.
+        """
+        name = task["name"]
+        if name in self.tasks:
+            raise ValueError(f"Task {name!r} existiert bereits.")
+        edges = [(a, name) for a in after] + [(name, b) for b in before]
+        for e in edges:
+            self._check_edge(*e, new=name)
+        self._check_acyclic(edges, new=name)
+        self.tasks[name] = dict(task)
+        added: Dict[int, Tuple] = {}
+        self._register(name, added)
+        self.precedence += edges
+        delta = self._builder()
+        self._task_terms(name, delta)
+        return self._commit(delta, self._builder(), added, {})
+
+    def remove_task(self, name: str) -> QuboDelta:
+        """Task samt Variablen, Kapazitätspaaren und Präzedenzkanten entfernen."""
+        if name not in self.tasks:
+            raise KeyError(name)
+        old = self._builder()
+        self._task_terms(name, old)
+        removed: Dict[int, Tuple] = {}
+        self._release(name, removed)
+        self.precedence = [(a, b) for a, b in self.precedence if name not in (a, b)]
+        del self.tasks[name]
+        return self._commit(self._builder(), old, {}, removed)
+
+    def change_duration(self, name: str, p: int) -> QuboDelta:
+        """
+        Dauer ändern: Terme der Task mit alter Dauer abziehen, mit neuer addieren.
+        x-Variablen und weiterhin gültige Startslots behalten ihre Indizes.
+        """
+        if name not in self.tasks:
+            raise KeyError(name)
+        old = self._builder()
+        self._task_terms(name, old)
+        removed: Dict[int, Tuple] = {}
+        added: Dict[int, Tuple] = {}
+        self.tasks[name]["p"] = int(p)
+        # erst anlegen, dann freigeben: kein Index wechselt innerhalb einer Operation die Variable
+        self._register(name, added)
+        self._release(name, removed, keep_starts=self._starts(int(p)))
+        new = self._builder()
+        self._task_terms(name, new)
+        return self._commit(new, old, added, removed)
+
+    def add_precedence(self, a: str, b: str) -> QuboDelta:
+        """Präzedenz a ≺ b zwischen zwei vorhandenen Tasks (nur c5-Terme dieser Kante)."""
+        self._check_edge(a, b)
+        self._check_acyclic([(a, b)])
+        self.precedence.append((a, b))
+        delta = self._builder()
+        self._edge_terms(a, b, delta)
+        return self._commit(delta, self._builder(), {}, {})
+
+    def _check_edge(self, a: str, b: str, new: Optional[str] = None) -> None:
+        for n in (a, b):
+            if n != new and n not in self.tasks:
+                raise KeyError(f"Präzedenz ({a}, {b}) verweist auf unbekannte Task.")
+        if a == b:
+            raise ValueError(f"Präzedenz ({a}, {b}) ist ein Zyklus.")
+
+    def _check_acyclic(self, edges: List[Tuple[str, str]], new: Optional[str] = None) -> None:
+        """
+        Zyklenprüfung wie in validate_instance, bevor edges übernommen werden;
+        bei einem Zyklus ValueError und der Zustand bleibt unverändert.
+        """
+        tasks = self.task_list() + ([{"name": new}] if new is not None else [])
+        try:
+            topological_order(tasks, self.precedence + list(edges))
+        except ValueError as err:
+            raise ValueError(f"Präzedenz {list(edges)} erzeugt einen Zyklus: {err}") from err
+
+    # ---- Export ------------------------------------------------------
+    def task_list(self) -> List[dict]:
+        return [dict(t) for t in self.tasks.values()]
+
+    def to_sparse(self) -> SparseQuboBuilder:
+        """Aktuellen Stand als SparseQuboBuilder (gleiche Indizes, für die Solver)."""
+        qb = SparseQuboBuilder(self.indexer, capacity=1)
+        rows, cols, vals = self.coo()
+        qb._merged = (rows, cols, vals)
+        return qb
@@ -1,5 +1,11 @@
+import heapq
 import json
-from typing import Dict, List, Tuple
+from collections.abc import Mapping
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from model.precedence import window_mask
 
 class Indexer:
     def __init__(self):
@@ -19,7 +25,263 @@ class Indexer:
 
     def __len__(self):
         return len(self._from_idx)
-    
+
+
+class DynamicIndexer(Indexer):
+    """
+    Indexer mit Freiliste: release() gibt Indizes zurück, get() vergibt zuerst den
+    kleinsten freien Index wieder.  Die QUBO-Dimension (len) wächst also nur, wenn
+    mehr Variablen gleichzeitig aktiv sind als je zuvor.  Freie Indizes haben kein
+    Schlüssel-Tupel (reverse liefert None).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._free: List[int] = []
+
+    def get(self, key: Tuple) -> int:
+        if key in self._to_idx:
+            return self._to_idx[key]
+        if not self._free:
+            return super().get(key)
+        idx = heapq.heappop(self._free)
+        self._to_idx[key] = idx
+        self._from_idx[idx] = key
+        return idx
+
+    def release(self, key: Tuple) -> int:
+        """Variable abmelden; KeyError, wenn sie nicht registriert ist."""
+        idx = self._to_idx.pop(key)
+        self._from_idx[idx] = None
+        heapq.heappush(self._free, idx)
+        return idx
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._to_idx
+
+    @property
+    def n_active(self) -> int:
+        return len(self._to_idx)
+
+
+class VariableLayout:
+    """
+    Strukturiertes Variablen-Layout mit geschlossener Indexformel.
+
+    Gleiche Reihenfolge wie assign_ent_to_indexer (pro Task ein Block):
+        [x_{t,r} für r] [y_{t,z} für z] [w_{t,r,z} für r, z]
+    also mit B = R + Z + R·Z:
+        x(t,r)   = t·B + r
+        y(t,z)   = t·B + R + z
+        w(t,r,z) = t·B + R + Z + r·Z + z
+    (t, r, z sind Ordinalzahlen). Es wird nichts pro Variable gespeichert –
+    nur je eine kleine Ordinal-Tabelle für Tasks, Roboter und Slots.
+
+    window_aware=True: y_{t,z} und w_{t,r,z} existieren nur für Startslots mit
+    z + p_t <= H (siehe feasible_start_mask); die verbleibenden Variablen werden
+    lückenlos durchnummeriert (gleiche Reihenfolge, eine Id-Tabelle für die Lücken).
+    Fehlende Variablen liefern in den Formeln/Tensoren -1.
+    windows: zusätzliche Startfenster {task: (frühester, spätester Start)}, z.B. aus
+    model.precedence.analyze_precedence (impliziert window_aware).
+    robot_mask: (T, R)-Maske erlaubter Task-Roboter-Paare (z.B. aus model.symmetry);
+    x_{t,r} und w_{t,r,·} fehlen für verbotene Paare (ebenfalls kompakt nummeriert).
+    occupancy=True: w_{t,r,z} heißt "Task t belegt Slot z" (C3-Varianten in c3_) statt
+    "startet in z" – w bleibt dann für jeden Slot erhalten, den ein zulässiger Start
+    belegt (occupancy_mask), nicht nur für die Startslots selbst.
+    """
+
+    def __init__(
+        self,
+        robots: Sequence[str],
+        slots: Sequence[int],
+        tasks: List[dict],
+        window_aware: bool = False,
+        windows: Optional[Dict[str, Tuple[int, int]]] = None,
+        robot_mask: Optional[np.ndarray] = None,
+        occupancy: bool = False,
+    ):
+        self.robots = list(robots)
+        self.slots = list(slots)
+        self.task_names = [t["name"] for t in tasks]
+        self._t = {name: i for i, name in enumerate(self.task_names)}
+        self._r = {r: i for i, r in enumerate(self.robots)}
+        self._z = {z: i for i, z in enumerate(self.slots)}
+        self.R = len(self.robots)
+        self.Z = len(self.slots)
+        self.T = len(self.task_names)
+        self.occupancy = bool(occupancy)
+        self.block = self.R + self.Z + self.R * self.Z
+        # window_aware: kompakte Nummerierung nur der registrierten Variablen
+        self._compact = None    # volle Id -> kompakte Id (-1 = nicht registriert)
+        self._expand = None     # kompakte Id -> volle Id
+        if window_aware or windows is not None or robot_mask is not None:
+            if window_aware or windows is not None:
+                ok = feasible_start_mask(slots, tasks, windows)        # (T, Z)
+            else:
+                ok = np.ones((self.T, self.Z), dtype=bool)
+            w_ok = occupancy_mask(slots, tasks, ok) if occupancy else ok
+            rm = np.ones((self.T, self.R), dtype=bool) if robot_mask is None else np.asarray(robot_mask, dtype=bool)
+            t = np.arange(self.T)[:, None]
+            keep = np.ones(self.T * self.block, dtype=bool)
+            keep[self._x_full(t, np.arange(self.R)[None, :])] = rm
+            keep[self._y_full(t, np.arange(self.Z)[None, :])] = ok
+            keep[self._w_full(t[:, :, None], np.arange(self.R)[None, :, None], np.arange(self.Z)[None, None, :])] = (
+                w_ok[:, None, :] & rm[:, :, None]
+            )
+            self._expand = np.flatnonzero(keep)
+            self._compact = np.full(len(keep), -1, dtype=np.int64)
+            self._compact[self._expand] = np.arange(len(self._expand))
+
+    # ---- Formeln (skalar oder NumPy-Arrays von Ordinalzahlen) -----
+    def _x_full(self, t, r):
+        return t * self.block + r
+
+    def _y_full(self, t, z):
+        return t * self.block + self.R + z
+
+    def _w_full(self, t, r, z):
+        return t * self.block + self.R + self.Z + r * self.Z + z
+
+    def _map(self, full):
+        return full if self._compact is None else self._compact[full]
+
+    def x_id(self, t, r):
+        """Index von x_{t,r}; -1, wenn das Paar (robot_mask) nicht existiert."""
+        return self._map(self._x_full(t, r))
+
+    def y_id(self, t, z):
+        """Index von y_{t,z}; -1, wenn die Variable (window_aware) nicht existiert."""
+        return self._map(self._y_full(t, z))
+
+    def w_id(self, t, r, z):
+        """Index von w_{t,r,z}; -1, wenn die Variable (window_aware) nicht existiert."""
+        return self._map(self._w_full(t, r, z))
+
+    # ---- ganze Index-Tensoren -------------------------------------
+    def x_index(self) -> np.ndarray:
+        """(T, R)-Array aller x-Indizes."""
+        t = np.arange(self.T)[:, None]
+        return self.x_id(t, np.arange(self.R)[None, :])
+
+    def y_index(self) -> np.ndarray:
+        """(T, Z)-Array aller y-Indizes."""
+        t = np.arange(self.T)[:, None]
+        return self.y_id(t, np.arange(self.Z)[None, :])
+
+    def w_index(self) -> np.ndarray:
+        """(T, R, Z)-Array aller w-Indizes."""
+        t = np.arange(self.T)[:, None, None]
+        r = np.arange(self.R)[None, :, None]
+        z = np.arange(self.Z)[None, None, :]
+        return self.w_id(t, r, z)
+
+    # ---- Indexer-kompatible API -----------------------------------
+    def get(self, key: Tuple) -> int:
+        kind = key[0]
+        if kind == "x":
+            idx = self.x_id(self._t[key[1]], self._r[key[2]])
+        elif kind == "y":
+            idx = self.y_id(self._t[key[1]], self._z[key[2]])
+        elif kind == "w":
+            idx = self.w_id(self._t[key[1]], self._r[key[2]], self._z[key[3]])
+        else:
+            raise KeyError(key)
+        if idx < 0:
+            raise KeyError(key)
+        return int(idx)
+
+    def reverse(self, i: int) -> Tuple:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        if self._expand is not None:
+            i = self._expand[i]
+        t, rem = divmod(int(i), self.block)
+        tname = self.task_names[t]
+        if rem < self.R:
+            return ("x", tname, self.robots[rem])
+        rem -= self.R
+        if rem < self.Z:
+            return ("y", tname, self.slots[rem])
+        r, z = divmod(rem - self.Z, self.Z)
+        return ("w", tname, self.robots[r], self.slots[z])
+
+    def __len__(self):
+        if self._expand is not None:
+            return len(self._expand)
+        return self.T * self.block
+
+    @property
+    def x(self) -> "LayoutView":
+        return LayoutView(self, "x")
+
+    @property
+    def y(self) -> "LayoutView":
+        return LayoutView(self, "y")
+
+    @property
+    def w(self) -> "LayoutView":
+        return LayoutView(self, "w")
+
+
+class LayoutView(Mapping):
+    """
+    Dict-artige Sicht (tname, r) / (tname, z) / (tname, r, z) -> idx auf ein
+    VariableLayout. Ersetzt die x/y/w-Dicts ohne Speicher pro Variable.
+    """
+
+    def __init__(self, layout: VariableLayout, kind: str):
+        self.layout = layout
+        self.kind = kind
+
+    def _axes(self) -> List[Sequence]:
+        L = self.layout
+        if self.kind == "x":
+            return [L.task_names, L.robots]
+        if self.kind == "y":
+            return [L.task_names, L.slots]
+        return [L.task_names, L.robots, L.slots]
+
+    def __getitem__(self, key: Tuple) -> int:
+        return self.layout.get((self.kind,) + tuple(key))
+
+    def __iter__(self):
+        if self.layout._compact is None:
+            return iter(product(*self._axes()))
+        keep = self.tensor(*self._axes()).ravel() >= 0
+        return (k for k, ok in zip(product(*self._axes()), keep) if ok)
+
+    def __len__(self):
+        if self.layout._compact is not None:
+            return int((self.tensor(*self._axes()) >= 0).sum())
+        n = 1
+        for ax in self._axes():
+            n *= len(ax)
+        return n
+
+    def tensor(self, *axes: Sequence) -> np.ndarray:
+        """Index-Tensor über das Produkt der angegebenen Achsen (arithmetisch, -1 = fehlt)."""
+        L = self.layout
+        maps = [L._t, L._r] if self.kind == "x" else [L._t, L._z] if self.kind == "y" else [L._t, L._r, L._z]
+        if len(axes) != len(maps):
+            raise ValueError(f"{self.kind}: {len(maps)} Achsen erwartet, {len(axes)} erhalten.")
+        ords = np.ix_(*[np.array([m[k] for k in ax], dtype=np.int64) for m, ax in zip(maps, axes)])
+        fn = {"x": L.x_id, "y": L.y_id, "w": L.w_id}[self.kind]
+        return np.asarray(fn(*ords), dtype=np.int64)
+
+
+def gather(mapping, *axes: Sequence) -> np.ndarray:
+    """
+    Index-Tensor mapping[(a, b, ...)] über das Produkt der Achsen, Form (len(a), len(b), ...).
+    LayoutViews rechnen direkt, normale Dicts werden einmal pro Variable abgefragt.
+    Nicht registrierte Schlüssel (window_aware) erscheinen als -1; die Batch-Helfer
+    des QuboBuilders überspringen solche Einträge.
+    """
+    if isinstance(mapping, LayoutView):
+        return mapping.tensor(*axes)
+    shape = tuple(len(ax) for ax in axes)
+    flat = np.fromiter((mapping.get(k, -1) for k in product(*axes)), dtype=np.int64, count=int(np.prod(shape)))
+    return flat.reshape(shape)
+
 
 def load_amr_config(path: str):
     with open(path, "r", encoding="utf-8") as f:
@@ -36,70 +298,269 @@ def load_amr_config(path: str):
 
     return robots, slots, tasks, precedences
 
-def assign_ent_to_indexer(indexer, amr, slots, tasks):
+def feasible_start_mask(slots, tasks, windows: Optional[Dict[str, Tuple[int, int]]] = None) -> np.ndarray:
+    """
+    (T, Z)-Maske der Startslots, in denen die Task vor dem Horizont endet (z + p_t <= H)
+    und – falls windows gegeben – im Startfenster der Task liegt.
+    """
+    horizon = max(slots) + 1
+    p = np.array([int(t["p"]) for t in tasks], dtype=np.int64)
+    ok = np.asarray(slots)[None, :] + p[:, None] <= horizon
+    if windows is not None:
+        ok &= window_mask(tasks, slots, windows)
+    return ok
+
+
+def uses_occupancy(w) -> bool:
+    """True, wenn w eine LayoutView auf ein VariableLayout(occupancy=True) ist (w = Belegung)."""
+    return bool(getattr(getattr(w, "layout", None), "occupancy", False))
+
+
+def occupancy_cover(slots, tasks) -> np.ndarray:
+    """cover[t, s, k]: ein Start von Task t in Slot s belegt Slot k (s <= k < s + p_t)."""
+    z = np.asarray(slots)
+    p = np.array([int(t["p"]) for t in tasks], dtype=np.int64)
+    return (z[None, :, None] <= z[None, None, :]) & (z[None, None, :] < z[None, :, None] + p[:, None, None])
+
+
+def occupancy_mask(slots, tasks, start_ok: np.ndarray) -> np.ndarray:
+    """
+    (T, Z)-Maske der Slots, die eine Task bei einem zulässigen Start (start_ok) belegen
+    kann: z mit s <= z < s + p_t für ein erlaubtes s.
+    """
+    cover = occupancy_cover(slots, tasks)
+    return (np.asarray(start_ok, dtype=bool)[:, :, None] & cover).any(axis=1)
+
+
+def assign_ent_to_indexer(
+    indexer, amr, slots, tasks, window_aware: bool = False, windows=None, robot_mask=None, occupancy: bool = False
+):
+    """
+    window_aware=True registriert y_{t,z} und w_{t,r,z} nur für Startslots mit
+    z + p_t <= H; alle Constraints/Objectives überspringen die fehlenden Schlüssel.
+    windows: zusätzliche Startfenster pro Task (siehe model.precedence), impliziert window_aware.
+    robot_mask: (T, R)-Maske erlaubter Task-Roboter-Paare; verbotene x/w werden nicht registriert.
+    occupancy: w als Belegungsvariable (C3-Varianten in c3_) – w bleibt für alle Slots,
+    die ein zulässiger Start belegt (siehe VariableLayout).
+    """
     x: Dict[Tuple[str, str], int] = {}
     y: Dict[Tuple[str, int], int] = {}
     w: Dict[Tuple[str, str, int], int] = {}
+    sparse = window_aware or windows is not None
+    ok = feasible_start_mask(slots, tasks, windows) if sparse else None
+    w_ok = occupancy_mask(slots, tasks, ok) if sparse and occupancy else ok
 
     # 3) Variablen registrieren
-    for t in tasks:
+    for i, t in enumerate(tasks):
         tname = t["name"]
+        starts = list(slots) if ok is None else [z for z, keep in zip(slots, ok[i]) if keep]
+        busy = list(slots) if w_ok is None else [z for z, keep in zip(slots, w_ok[i]) if keep]
+        allowed = list(amr) if robot_mask is None else [r for r, keep in zip(amr, robot_mask[i]) if keep]
         # x: Task→Robot
-        for r in amr:
+        for r in allowed:
             x[(tname, r)] = indexer.get(("x", tname, r))
         # y: Task→Slot
-        for z in slots:
+        for z in starts:
             y[(tname, z)] = indexer.get(("y", tname, z))
         # w: (optional) Task→Robot→Slot
-        for r in amr:
-            for z in slots:
+        for r in allowed:
+            for z in busy:
                 w[(tname, r, z)] = indexer.get(("w", tname, r, z))
 
     return indexer, x, y, w
 
-def count_valid_variants(robots, slots, tasks):
+def assign_ent_to_layout(
+    amr, slots, tasks, window_aware: bool = False, windows=None, robot_mask=None, occupancy: bool = False
+):
+    """
+    Wie assign_ent_to_indexer, aber ohne Tupel-Dicts: liefert ein VariableLayout
+    und dessen x/y/w-Sichten (gleiche Indizes wie assign_ent_to_indexer).
+    """
+    layout = VariableLayout(amr, slots, tasks, window_aware, windows, robot_mask, occupancy)
+    return layout, layout.x, layout.y, layout.w
+
+def _task_options(slots, tasks):
+    """Pro Task alle gültigen Startslots und die Belegungsmaske (Bit z = Slot z belegt)."""
+    horizon = max(slots) + 1
+    options = []
+    for task in tasks:
+        duration = int(task["p"])
+        block = (1 << duration) - 1
+        options.append([(start, block << start) for start in slots if start + duration <= horizon])
+    return options
+
+
+def _single_robot_counts(slots, tasks) -> List[int]:
     """
+    f[S] = Anzahl überlappungsfreier Platzierungen der Task-Teilmenge S (Bitmaske)
+    auf EINEM Roboter, f = h_0 aus _single_robot_table.
+    """
+    return _single_robot_table(slots, tasks)[0]
+
+
+def _single_robot_table(slots, tasks) -> List[List[int]]:
+    r"""
+    h[t][S] = Anzahl überlappungsfreier Platzierungen von S auf einem Roboter, die
+    alle frühestens in Slot t starten.  DP rückwärts über die Zeit:
+        h_t(S) = h_{t+1}(S) + Σ_{k∈S, t Startslot, t+p_k<=H} h_{t+p_k}(S \ {k}),   h_t(∅) = 1
+    Jede Platzierung wird genau einmal gezählt (Slot t ist frei oder Start genau einer Task).
+    """
+    horizon = max(slots) + 1
+    starts = set(slots)
+    durations = [int(t["p"]) for t in tasks]
+    n_sub = 1 << len(tasks)
+    h = [[0] * n_sub for _ in range(horizon + 1)]
+    h[horizon][0] = 1
+    for t in range(horizon - 1, -1, -1):
+        row = list(h[t + 1])
+        if t in starts:
+            for k, p in enumerate(durations):
+                if t + p > horizon:
+                    continue
+                bit = 1 << k
+                nxt = h[t + p]
+                for S in range(n_sub):
+                    if S & bit:
+                        row[S] += nxt[S ^ bit]
+        h[t] = row
+    return h
+
+
+def count_valid_variants(robots, slots, tasks):
+    r"""
     Berechnet nur die Anzahl der gültigen Varianten.
     Gibt eine einzige Zahl zurück.
+
+    Statt des vollständigen Produkts (R·Z)^T:
+      1) f[S] = Platzierungen der Task-Teilmenge S auf einem Roboter (Zeit-DP über Bitmasken),
+      2) Teilmengen-Faltung über die Roboter:  g_r(S) = Σ_{A⊆S} f[A] · g_{r-1}(S \ A).
+    Aufwand O(2^T·Z·T + R·3^T) – exakt (Python-Ints) bis ca. 12–14 Tasks.
     """
-    from itertools import product
-    
-    # Generiere für jede Task alle (robot, start_slot) Kombinationen
-    task_options = []
-    for task in tasks:
-        duration = task["p"]
-        options = []
-        for robot in robots:
-            for start in slots:
-                if start + duration <= max(slots) + 1:
-                    options.append((robot, start, duration))
-        task_options.append(options)
-    
-    # Zähle gültige Kombinationen
-    count = 0
-    for combination in product(*task_options):
-        # Prüfe ob gültig (keine Überschneidungen pro Roboter)
-        robot_tasks = {}
-        for robot, start, duration in combination:
-            if robot not in robot_tasks:
-                robot_tasks[robot] = []
-            robot_tasks[robot].append((start, duration))
-        
-        # Check overlaps
-        valid = True
-        for task_list in robot_tasks.values():
-            for i in range(len(task_list)):
-                for j in range(i + 1, len(task_list)):
-                    s1, d1 = task_list[i]
-                    s2, d2 = task_list[j]
-                    # Overlap check
-                    if not (s1 + d1 <= s2 or s2 + d2 <= s1):
-                        valid = False
-                        break
-                if not valid:
+    f = _single_robot_counts(slots, tasks)
+    full = (1 << len(tasks)) - 1
+    g = f
+    for _ in range(len(robots) - 1):
+        new = [0] * len(f)
+        for S in range(len(f)):
+            total = 0
+            A = S
+            while True:
+                if f[A] and g[S ^ A]:
+                    total += f[A] * g[S ^ A]
+                if A == 0:
                     break
-        
-        if valid:
-            count += 1
-    
-    return count
\ No newline at end of file
+                A = (A - 1) & S
+            new[S] = total
+        g = new
+    return g[full]
+
+
+def iter_valid_variants(robots, slots, tasks):
+    """
+    Generator über alle gültigen Varianten (gleiches Format wie die Kombinationen
+    im alten Brute-Force: ein Tupel (robot, start, duration) pro Task, in Task-Reihenfolge).
+
+    Erst werden die Tasks den Robotern zugeordnet (Äste mit f[S_r] = 0 fallen weg; ob
+    die übrigen Tasks noch auf die anderen Roboter passen, wird nicht vorab geprüft),
+    dann die Platzierungen je Roboter entlang der Zeit-DP h: jeder Ast mit h_t(S) = 0
+    wird abgeschnitten, jede betretene Platzierungs-Rekursion liefert also mindestens
+    eine Platzierung.
+    """
+    horizon = max(slots) + 1
+    starts = set(slots)
+    durations = [int(t["p"]) for t in tasks]
+    h = _single_robot_table(slots, tasks)
+    f = h[0]
+    n_tasks = len(tasks)
+
+    def _placements(S, t):
+        """Alle Platzierungen von S ab Zeit t als Liste [(k, start), ...]."""
+        if S == 0:
+            yield []
+            return
+        if t >= horizon or not h[t][S]:
+            return
+        if t in starts:
+            for k in range(n_tasks):
+                bit = 1 << k
+                if S & bit and t + durations[k] <= horizon:
+                    for rest in _placements(S ^ bit, t + durations[k]):
+                        yield [(k, t)] + rest
+        yield from _placements(S, t + 1)
+
+    def _robot_products(r, subsets, chosen):
+        if r == len(robots):
+            out = [None] * n_tasks
+            for rr, placement in enumerate(chosen):
+                for k, start in placement:
+                    out[k] = (robots[rr], start, durations[k])
+            yield tuple(out)
+            return
+        for placement in _placements(subsets[r], 0):
+            yield from _robot_products(r + 1, subsets, chosen + [placement])
+
+    subsets = [0] * len(robots)
+
+    def _assign(k):
+        if k == n_tasks:
+            yield from _robot_products(0, list(subsets), [])
+            return
+        for r in range(len(robots)):
+            new = subsets[r] | (1 << k)
+            if not f[new]:
+                continue
+            old = subsets[r]
+            subsets[r] = new
+            yield from _assign(k + 1)
+            subsets[r] = old
+
+    yield from _assign(0)
+
+
+def optimal_variant(robots, slots, tasks, precedence=None):
+    """
+    Exakte Referenzlösung: gültige Variante mit minimalem Makespan (max. Endzeit),
+    unter Beachtung der Präzedenzen (b startet frühestens am Ende von a).
+    Branch & Bound über die Tasks; gibt (makespan, variante) oder (None, None) zurück.
+    """
+    options = _task_options(slots, tasks)
+    names = [t["name"] for t in tasks]
+    pos = {name: k for k, name in enumerate(names)}
+    durations = [int(t["p"]) for t in tasks]
+    preds = [[] for _ in tasks]
+    succs = [[] for _ in tasks]
+    for a, b in precedence or []:
+        preds[pos[b]].append(pos[a])
+        succs[pos[a]].append(pos[b])
+
+    n_robots = len(robots)
+    best = [float("inf"), None]
+    start_of = [None] * len(tasks)
+    robot_of = [None] * len(tasks)
+
+    def _walk(k, masks, current):
+        if current >= best[0]:
+            return
+        if k == len(tasks):
+            best[0] = current
+            best[1] = tuple((robots[robot_of[t]], start_of[t], durations[t]) for t in range(len(tasks)))
+            return
+        for start, m in options[k]:
+            if any(start_of[a] is not None and start < start_of[a] + durations[a] for a in preds[k]):
+                continue
+            if any(start_of[b] is not None and start_of[b] < start + durations[k] for b in succs[k]):
+                continue
+            end = start + durations[k]
+            seen = set()
+            for r in range(n_robots):
+                if masks[r] & m or masks[r] in seen:
+                    continue
+                seen.add(masks[r])      # identische Roboter-Belegung -> symmetrischer Ast
+                start_of[k], robot_of[k] = start, r
+                _walk(k + 1, masks[:r] + (masks[r] | m,) + masks[r + 1:], max(current, end))
+            start_of[k] = robot_of[k] = None
+
+    _walk(0, (0,) * n_robots, 0)
+    if best[1] is None:
+        return None, None
+    return best[0], best[1]
@@ -0,0 +1,249 @@
+import json
+from itertools import product
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model.precedence import start_windows, topological_order
+
+DURATIONS = ("uniform", "geometric", "lognormal", "bimodal")
+
+
+def sample_durations(rng, n: int, kind: str = "uniform", p_min: int = 1, p_max: int = 5) -> np.ndarray:
+    """
+    n ganzzahlige Dauern in [p_min, p_max]:
+        uniform    gleichverteilt
+        geometric  viele kurze, wenige lange Tasks: p_min + Geom(0.5) - 1, auf
+                   [p_min, p_max] abgeschnitten (normierte pmf statt Clipping)
+        lognormal  rechtsschief um die Mitte des Intervalls
+        bimodal    je zur Hälfte kurz (unteres Viertel) und lang (oberes Viertel)
+    """
+    if p_min < 1 or p_max < p_min:
+        raise ValueError(f"Ungültiges Dauer-Intervall [{p_min}, {p_max}].")
+    if kind == "uniform":
+        p = rng.integers(p_min, p_max + 1, size=n)
+    elif kind == "geometric":
+        k = np.arange(p_max - p_min + 1)
+        pmf = 0.5 ** k
+        p = p_min + rng.choice(k, size=n, p=pmf / pmf.sum())
+    elif kind == "lognormal":
+        p = np.rint(rng.lognormal(np.log((p_min + p_max) / 2.0), 0.5, size=n))
+    elif kind == "bimodal":
+        span = max((p_max - p_min) // 4, 0)
+        short = rng.integers(p_min, p_min + span + 1, size=n)
+        long = rng.integers(p_max - span, p_max + 1, size=n)
+        p = np.where(rng.random(n) < 0.5, short, long)
+    else:
+        raise ValueError(f"Unbekannte Dauerverteilung: {kind!r} (erlaubt: {DURATIONS})")
+    return np.clip(p, p_min, p_max).astype(np.int64)
+
+
+def random_dag(rng, names: Sequence[str], depth: int, density: float) -> List[Tuple[str, str]]:
+    """
+    Präzedenz-DAG mit genau depth Ebenen (längste Kette = depth Tasks).
+
+    Die Tasks werden zufällig auf depth nichtleere Ebenen verteilt; jede Task ab Ebene 2
+    bekommt einen zufälligen Vorgänger aus der Ebene davor, jedes weitere Paar
+    aufeinanderfolgender Ebenen wird mit Wahrscheinlichkeit density verbunden.
+    depth <= 1 liefert keine Kanten.
+    """
+    n = len(names)
+    if depth > 1 and depth > n:
+        raise ValueError(f"depth={depth} braucht mindestens {depth} Tasks (vorhanden: {n}).")
+    if depth <= 1:
+        return []
+    if not 0.0 <= density <= 1.0:
+        raise ValueError("density muss in [0, 1] liegen.")
+    perm = rng.permutation(n)
+    layer = np.empty(n, dtype=np.int64)
+    layer[perm[:depth]] = np.arange(depth)
+    layer[perm[depth:]] = rng.integers(0, depth, size=n - depth)
+    layers = [np.flatnonzero(layer == k) for k in range(depth)]
+
+    edges = set()
+    for prev, cur in zip(layers[:-1], layers[1:]):
+        for b, a in zip(cur.tolist(), rng.choice(prev, size=len(cur)).tolist()):
+            edges.add((a, b))
+        if density > 0.0:
+            a, b = np.nonzero(rng.random((len(prev), len(cur))) < density)
+            edges.update(zip(prev[a].tolist(), cur[b].tolist()))
+    return [(names[a], names[b]) for a, b in sorted(edges)]
+
+
+def generate_instance(
+    n_tasks: int,
+    n_robots: int,
+    seed=None,
+    durations: str = "uniform",
+    p_min: int = 1,
+    p_max: int = 5,
+    depth: int = 1,
+    density: float = 0.0,
+    horizon_slack: float = 1.2,
+    name: Optional[str] = None,
+) -> dict:
+    """
+    Eine synthetische Instanz im Format von data/*.json (robots, slots, tasks,
+    precedence) plus name, seed und params.
+
+    Horizont H = ⌈horizon_slack · max(⌈Σp / R⌉, kritischer Pfad)⌉, slots = 0 … H-1;
+    mit horizon_slack >= 1 passen alle Präzedenzketten in den Horizont.
+    Gleiche Parameter und gleicher seed liefern dieselbe Instanz.
+    """
+    if n_tasks < 1 or n_robots < 1:
+        raise ValueError("n_tasks und n_robots müssen >= 1 sein.")
+    rng = np.random.default_rng(seed)
+    names = [f"T{i + 1}" for i in range(n_tasks)]
+    p = sample_durations(rng, n_tasks, durations, p_min, p_max)
+    tasks = [{"name": n, "p": int(d)} for n, d in zip(names, p)]
+    precedence = random_dag(rng, names, depth, density)
+
+    # kritischer Pfad: früheste Endzeiten bei unbeschränktem Horizont
+    es = start_windows(tasks, [0, int(p.sum())], precedence)
+    critical = max(es[t["name"]][0] + t["p"] for t in tasks)
+    horizon = int(np.ceil(horizon_slack * max(-(-int(p.sum()) // n_robots), critical)))
+    horizon = max(horizon, int(p.max()))
+    robots = [f"R{r + 1}" for r in range(n_robots)]
+    params = {
+        "n_tasks": n_tasks, "n_robots": n_robots, "durations": durations, "p_min": p_min,
+        "p_max": p_max, "depth": depth, "density": density, "horizon_slack": horizon_slack,
+    }
+    return {
+        "name": name or f"amr{n_robots}_slots{horizon}_task{n_tasks}",
+        "seed": _seed_record(seed),
+        "params": params,
+        "robots": robots,
+        "slots": list(range(horizon)),
+        "tasks": tasks,
+        "precedence": [list(e) for e in precedence],
+    }
+
+
+def _seed_record(seed) -> Optional[int]:
+    """
+    seed für das Feld "seed": ganze Zahlen direkt, eine SeedSequence ohne spawn_key über
+    ihre (ganzzahlige) Entropie – beides reproduziert default_rng(seed).  Generatoren und
+    abgeleitete SeedSequences lassen sich nicht als Zahl speichern: None.
+    """
+    if isinstance(seed, (int, np.integer)):
+        return int(seed)
+    if isinstance(seed, np.random.SeedSequence) and not seed.spawn_key and isinstance(seed.entropy, int):
+        return seed.entropy
+    return None
+
+
+def instance_family(seed=None, replicates: int = 1, **grid) -> Iterator[dict]:
+    """
+    Instanzfamilie über das kartesische Produkt der Parameterlisten (Skalare zählen als
+    einelementige Liste), replicates Instanzen je Kombination:
+
+        instance_family(7, replicates=3, n_tasks=[100, 200], n_robots=[10, 50], depth=[1, 5])
+
+    Jede Instanz bekommt eine eigene, per SeedSequence aus seed abgeleitete Saat (im
+    Feld "seed" gespeichert, generate_instance(**params, seed=...) reproduziert sie).
+    Erzeugt wird lazy, Instanz für Instanz.
+    """
+    keys = sorted(grid)
+    values = [v if isinstance(v, (list, tuple, range)) else [v] for v in (grid[k] for k in keys)]
+    combos = list(product(*values))
+    children = np.random.SeedSequence(seed).spawn(len(combos) * replicates)
+    for c, combo in enumerate(combos):
+        params = dict(zip(keys, combo))
+        for k in range(replicates):
+            inst_seed = int(children[c * replicates + k].generate_state(1)[0])
+            inst = generate_instance(seed=inst_seed, **params)
+            inst["name"] = f"{inst['name']}_{c}_{k}"
+            yield inst
+
+
+def validate_instance(inst: dict, where: str = "") -> dict:
+    """
+    Schema-Prüfung einer Instanz (ValueError mit Fundstelle):
+        robots      nichtleere Liste eindeutiger Strings
+        slots       nichtleere, streng steigende Liste ganzer Zahlen
+        tasks       nichtleere Liste {"name": str (eindeutig), "p": int >= 1}
+        precedence  Liste von Paaren bekannter Tasks, ohne Schleifen und Zyklen
+    """
+    at = f" ({where})" if where else ""
+    if not isinstance(inst, dict):
+        raise ValueError(f"Instanz{at} ist kein JSON-Objekt.")
+    missing = [k for k in ("robots", "slots", "tasks", "precedence") if k not in inst]
+    if missing:
+        raise ValueError(f"Instanz{at}: fehlende Felder {missing}.")
+    robots, slots, tasks, precedence = inst["robots"], inst["slots"], inst["tasks"], inst["precedence"]
+
+    if not isinstance(robots, list) or not robots or not all(isinstance(r, str) for r in robots):
+        raise ValueError(f"Instanz{at}: robots muss eine nichtleere Liste von Strings sein.")
+    if len(set(robots)) != len(robots):
+        raise ValueError(f"Instanz{at}: doppelte Roboternamen.")
+    if not isinstance(slots, list) or not slots or not all(_is_int(z) for z in slots):
+        raise ValueError(f"Instanz{at}: slots muss eine nichtleere Liste ganzer Zahlen sein.")
+    if any(b <= a for a, b in zip(slots, slots[1:])):
+        raise ValueError(f"Instanz{at}: slots müssen streng steigend sein.")
+    if not isinstance(tasks, list) or not tasks:
+        raise ValueError(f"Instanz{at}: tasks muss eine nichtleere Liste sein.")
+    for k, t in enumerate(tasks):
+        if not isinstance(t, dict) or not isinstance(t.get("name"), str) or not _is_int(t.get("p")) or t["p"] < 1:
+            raise ValueError(f"Instanz{at}: Task #{k} braucht name (str) und p (int >= 1), erhalten {t!r}.")
+    names = [t["name"] for t in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Instanz{at}: doppelte Tasknamen.")
+    if not isinstance(precedence, list):
+        raise ValueError(f"Instanz{at}: precedence muss eine Liste sein.")
+    for e in precedence:
+        if not isinstance(e, (list, tuple)) or len(e) != 2 or e[0] == e[1]:
+            raise ValueError(f"Instanz{at}: ungültige Präzedenz {e!r}.")
+    try:
+        topological_order(tasks, [tuple(e) for e in precedence])
+    except (KeyError, ValueError) as err:
+        raise ValueError(f"Instanz{at}: {err}") from err
+    return inst
+
+
+def _is_int(v) -> bool:
+    return isinstance(v, (int, np.integer)) and not isinstance(v, bool)
+
+
+def write_jsonl(instances: Iterable[dict], path: str, append: bool = False) -> int:
+    """Schreibt Instanzen zeilenweise (eine JSON-Zeile je Instanz); Rückgabe: Anzahl."""
+    n = 0
+    with open(path, "a" if append else "w", encoding="utf-8") as f:
+        for inst in instances:
+            f.write(json.dumps(inst, separators=(",", ":")) + "\n")
+            n += 1
+    return n
+
+
+def iter_instances(path: str, validate: bool = True) -> Iterator[dict]:
+    """Liest eine JSONL-Datei lazy Zeile für Zeile (Leerzeilen werden übersprungen)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                inst = json.loads(line)
+            except json.JSONDecodeError as err:
+                raise ValueError(f"{path}:{lineno}: kein gültiges JSON ({err}).") from err
+            if validate:
+                validate_instance(inst, f"{path}:{lineno}")
+            yield inst
+
+
+def iter_batches(path: str, batch_size: int, validate: bool = True) -> Iterator[List[dict]]:
+    """Wie iter_instances, aber in Listen zu batch_size Instanzen (die letzte ggf. kürzer)."""
+    if batch_size < 1:
+        raise ValueError("batch_size muss >= 1 sein.")
+    batch: List[dict] = []
+    for inst in iter_instances(path, validate):
+        batch.append(inst)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def instance_config(inst: dict):
+    """(robots, slots, tasks, precedence) wie load_amr_config."""
+    return inst["robots"], inst["slots"], inst["tasks"], inst["precedence"]
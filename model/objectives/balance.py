@@ -1,4 +1,5 @@
 from typing import List, Dict
+from model.indexer import gather
 from model.qubo_builder import QuboBuilder
 
 def add_workload_balance_objective(
@@ -7,6 +8,7 @@ def add_workload_balance_objective(
     robots: List[str],            # ["R1","R2",...]
     x: Dict[tuple, int],          # (tname, rname) -> idx  für x_{t,r}
     w_balance: float,
+    factored: bool = False,
 ):
     """
     H2 = sum_r S_r^2 - (1/R) * S_tot^2
@@ -17,12 +19,23 @@ def add_workload_balance_objective(
       Quad (gleiches r):     2 * (1 - 1/R) * p_t * p_u
       Quad (versch. r):     -2 * (1/R)     * p_t * p_u
     Alle Terme werden mit w_balance gewichtet.
+
+    factored=True speichert H2 als R + 1 faktorisierte Quadrate (S_r² mit Gewicht
+    w_balance, S_tot² mit -w_balance/R) statt O(R²·T²) Kopplern.
+    Fehlende x-Schlüssel (z.B. durch Symmetriebrechung, model.symmetry) werden übersprungen.
     """
     if not w_balance:
         return qb
     if not tasks or not robots:
         return qb
 
+    if factored:
+        p = [float(t["p"]) for t in tasks]
+        X = gather(x, [t["name"] for t in tasks], robots).T          # (R, T), -1 = fehlt
+        qb.add_squared_linear_many(X, [p] * len(robots), 0.0, w_balance)
+        qb.add_squared_linear_many(X.reshape(1, -1), [p * len(robots)], 0.0, -w_balance / len(robots))
+        return qb
+
     R = float(len(robots))
     invR = 1.0 / R
     one_minus_invR = 1.0 - invR
@@ -33,6 +46,8 @@ def add_workload_balance_objective(
 
     for r in robots:
         for tname in task_names:
+            if (tname, r) not in x:
+                continue
             i = x[(tname, r)]
             qb.add_linear(i, w_balance * one_minus_invR * (p_by_t[tname] ** 2))
 
@@ -43,6 +58,8 @@ def add_workload_balance_objective(
             for idx2 in range(idx1 + 1, len(task_names)):
                 t2 = task_names[idx2]
                 p2 = p_by_t[t2]
+                if (t1, r) not in x or (t2, r) not in x:
+                    continue
                 i = x[(t1, r)]
                 j = x[(t2, r)]
                 qb.add_quad(i, j, 2.0 * w_balance * one_minus_invR * (p1 * p2))
@@ -55,6 +72,8 @@ def add_workload_balance_objective(
                 p1 = p_by_t[t1]
                 for t2 in task_names:
                     p2 = p_by_t[t2]
+                    if (t1, r1) not in x or (t2, r2) not in x:
+                        continue
                     i = x[(t1, r1)]
                     j = x[(t2, r2)]
                     qb.add_quad(i, j, -2.0 * w_balance * invR * (p1 * p2))
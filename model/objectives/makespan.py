@@ -1,6 +1,8 @@
 
 from typing import List, Dict
+import numpy as np
 from model.qubo_builder import QuboBuilder
+from model.indexer import gather
 
 def add_makespan_objective(
     qb: QuboBuilder,
@@ -27,18 +29,13 @@ def add_makespan_objective(
         return qb
     """    
     # Für jede Task: addiere (z + p_t) für jeden möglichen Slot
-    for t in tasks:
-        tname = t["name"]
-        p = int(t["p"])
-        
-        for z in slots:
-            completion_time = z + p
-            # Linear term: (z + p) * y_tz
-            # Da y² = y für binäre Variablen, ist das einfach ein linearer Term
-            qb.add_linear(
-                y[(tname, z)], 
-                w_makespan * (completion_time **2)
-            )
+    Y = gather(y, [t["name"] for t in tasks], slots)           # (T, Z)
+    p = np.array([int(t["p"]) for t in tasks])
+    completion_time = np.asarray(slots)[None, :] + p[:, None]  # (T, Z)
+    # Linear term: (z + p) * y_tz
+    # Da y² = y für binäre Variablen, ist das einfach ein linearer Term
+    keep = Y >= 0                                              # nicht registrierte Startslots überspringen
+    qb.add_terms(Y[keep], Y[keep], (w_makespan * completion_time ** 2)[keep])
     
     return qb
 
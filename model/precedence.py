@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class PrecedenceInfo:
+    """
+    Vorverarbeitete Präzedenzen einer Instanz.
+
+    order     Tasks in topologischer Reihenfolge
+    edges     transitiv reduzierte Kanten (a, b) mit a ≺ b
+    implied   entfernte (transitiv implizierte) Kanten
+    windows   pro Task das Startfenster (frühester, spätester Start) in Slot-Werten
+    """
+    order: List[str]
+    edges: List[Tuple[str, str]]
+    implied: List[Tuple[str, str]]
+    windows: Dict[str, Tuple[int, int]]
+
+    @property
+    def feasible(self) -> bool:
+        """False, wenn mindestens ein Startfenster leer ist (Kette passt nicht in den Horizont)."""
+        return all(lo <= hi for lo, hi in self.windows.values())
+
+
+def topological_order(tasks: List[dict], precedence: Sequence[Tuple[str, str]]) -> List[str]:
+    """Kahn-Algorithmus; ValueError bei Zyklen, KeyError bei unbekannten Tasks."""
+    names = [t["name"] for t in tasks]
+    succ: Dict[str, List[str]] = {n: [] for n in names}
+    indeg = {n: 0 for n in names}
+    for a, b in precedence:
+        if a not in succ or b not in succ:
+            raise KeyError(f"Präzedenz ({a}, {b}) verweist auf unbekannte Task.")
+        succ[a].append(b)
+        indeg[b] += 1
+    order = []
+    stack = [n for n in reversed(names) if indeg[n] == 0]
+    while stack:
+        n = stack.pop()
+        order.append(n)
+        for m in succ[n]:
+            indeg[m] -= 1
+            if indeg[m] == 0:
+                stack.append(m)
+    if len(order) != len(names):
+        cyclic = sorted(n for n in names if indeg[n] > 0)
+        raise ValueError(f"Präzedenzen enthalten einen Zyklus (beteiligt: {cyclic}).")
+    return order
+
+
+def transitive_reduction(
+    tasks: List[dict], precedence: Sequence[Tuple[str, str]]
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Entfernt Kanten (a, b), die über einen anderen Pfad a ≺ ... ≺ b bereits folgen.
+    Erreichbarkeit als Bitmasken in umgekehrter topologischer Reihenfolge.
+    Rückgabe: (behaltene Kanten, entfernte Kanten), Duplikate zählen als entfernt.
+    """
+    order = topological_order(tasks, precedence)
+    pos = {n: i for i, n in enumerate(order)}
+    succ: Dict[str, List[str]] = {n: [] for n in order}
+    for a, b in precedence:
+        if b not in succ[a]:
+            succ[a].append(b)
+
+    reach = {n: 0 for n in order}           # Bit pos[m]: m ist von n aus über ≥ 1 Kante erreichbar
+    for n in reversed(order):
+        for m in succ[n]:
+            reach[n] |= reach[m] | (1 << pos[m])
+
+    kept, implied, seen = [], [], set()
+    for a, b in precedence:
+        if (a, b) in seen:
+            implied.append((a, b))
+            continue
+        seen.add((a, b))
+        via_other = any(reach[m] >> pos[b] & 1 for m in succ[a] if m != b)
+        (implied if via_other else kept).append((a, b))
+    return kept, implied
+
+
+def start_windows(
+    tasks: List[dict],
+    slots: Sequence[int],
+    precedence: Sequence[Tuple[str, str]],
+    order: Optional[List[str]] = None,
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Früheste/späteste Startzeit je Task aus Dauern und Horizont H = max(slots) + 1:
+        es_b = max(min(slots), max_{a≺b} es_a + p_a)
+        ls_a = min(H - p_a,     min_{a≺b} ls_b - p_a)
+    Ein leeres Fenster (es > ls) heißt: die Instanz ist mit diesen Präzedenzen unlösbar.
+    """
+    order = order or topological_order(tasks, precedence)
+    p = {t["name"]: int(t["p"]) for t in tasks}
+    horizon = max(slots) + 1
+    preds: Dict[str, List[str]] = {n: [] for n in order}
+    succ: Dict[str, List[str]] = {n: [] for n in order}
+    for a, b in precedence:
+        preds[b].append(a)
+        succ[a].append(b)
+
+    es = {}
+    for n in order:
+        es[n] = max([min(slots)] + [es[a] + p[a] for a in preds[n]])
+    ls = {}
+    for n in reversed(order):
+        ls[n] = min([horizon - p[n]] + [ls[b] - p[n] for b in succ[n]])
+    return {n: (es[n], ls[n]) for n in (t["name"] for t in tasks)}
+
+
+def analyze_precedence(
+    tasks: List[dict], slots: Sequence[int], precedence: Optional[Sequence[Tuple[str, str]]]
+) -> PrecedenceInfo:
+    """DAG aufbauen, transitiv reduzieren und Startfenster propagieren."""
+    precedence = [tuple(e) for e in (precedence or [])]
+    order = topological_order(tasks, precedence)
+    kept, implied = transitive_reduction(tasks, precedence)
+    windows = start_windows(tasks, slots, kept, order)
+    return PrecedenceInfo(order=order, edges=kept, implied=implied, windows=windows)
+
+
+def window_mask(tasks: List[dict], slots: Sequence[int], windows: Dict[str, Tuple[int, int]]) -> np.ndarray:
+    """(T, Z)-Maske: Startslot z liegt im Fenster der Task (Tasks ohne Fenster: alle Slots)."""
+    z = np.asarray(slots)
+    lo = np.array([windows.get(t["name"], (z.min(), z.max()))[0] for t in tasks])
+    hi = np.array([windows.get(t["name"], (z.min(), z.max()))[1] for t in tasks])
+    return (z[None, :] >= lo[:, None]) & (z[None, :] <= hi[:, None])
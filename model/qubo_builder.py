@@ -1,6 +1,9 @@
 from collections import defaultdict
+from collections.abc import Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Dict, Tuple, List, Optional
+import numpy as np
 import pandas as pd
 
 @dataclass(frozen=True)
@@ -11,52 +14,521 @@ class QuboStats:
     n_quadratic: int
     density: float
 
+@dataclass(frozen=True)
+class CoefficientStats:
+    n_coefficients: int
+    min: float
+    max: float
+    abs_min: float
+    abs_max: float
+    dynamic_range: float
+    percentiles: Dict[float, float]
+
+@dataclass
+class SquaredTerms:
+    """
+    Faktorisierte Strafterme  Σ_t weight_t · ((A·s)_t + offset_t)²  ohne die Konstante
+    weight_t · offset_t² (wie die expandierte QUBO-Form).  A: scipy.sparse CSR (m, n).
+
+    Energie und ΔE eines Flips kosten O(k) pro Term statt O(k²) Kopplern; expand()
+    liefert die dichte obere Dreiecksform nur für den Export.
+    """
+    A: object
+    offset: np.ndarray
+    weight: np.ndarray
+
+    def __len__(self):
+        return self.A.shape[0]
+
+    def residuals(self, samples) -> np.ndarray:
+        """(n_samples, m): r_t = (A·s)_t + offset_t."""
+        S = np.asarray(samples, dtype=np.float64)
+        if S.ndim == 1:
+            S = S[None, :]
+        return (self.A @ S.T).T + self.offset[None, :]
+
+    def energies(self, samples) -> np.ndarray:
+        r = self.residuals(samples)
+        return (r * r - (self.offset * self.offset)[None, :]) @ self.weight
+
+    def expand(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Dichte Expansion: w·a_i² + 2·w·b·a_i auf der Diagonale, 2·w·a_i·a_j je Paar i<j.
+        Ergebnis kanonisch (obere Dreiecksform, ohne Duplikate).
+        """
+        from scipy.sparse import diags
+        P = (self.A.T @ diags(self.weight) @ self.A).tocoo()
+        lin = 2.0 * (self.A.T @ (self.weight * self.offset))
+        li = np.flatnonzero(lin)
+        up = P.row < P.col
+        on = P.row == P.col
+        return merge_triplets(
+            np.concatenate([P.row[on], li, P.row[up]]).astype(np.int64),
+            np.concatenate([P.col[on], li, P.col[up]]).astype(np.int64),
+            np.concatenate([P.data[on], lin[li], 2.0 * P.data[up]]),
+        )
+
+    def subset(self, mask) -> "SquaredTerms":
+        mask = np.asarray(mask, dtype=bool)
+        return SquaredTerms(self.A[mask], self.offset[mask], self.weight[mask])
+
+    def scaled(self, factor) -> "SquaredTerms":
+        return SquaredTerms(self.A, self.offset, self.weight * factor)
+
+    def resized(self, n: int) -> "SquaredTerms":
+        """Gleiche Terme auf n Variablen (n >= bisheriger Spaltenzahl)."""
+        A = self.A.tocsr(copy=True)
+        A.resize((A.shape[0], n))
+        return SquaredTerms(A, self.offset, self.weight)
+
+    def max_delta(self) -> np.ndarray:
+        """Obere Schranke für |ΔE_i| eines Flips je Variable (für β-Heuristiken)."""
+        absA = abs(self.A)
+        r_max = np.asarray(absA.sum(axis=1)).ravel() + np.abs(self.offset)
+        # |w·a·(2δr + a)| <= |w|·|a|·(2·r_max + |a|)
+        C = absA.multiply((np.abs(self.weight) * 2.0 * r_max)[:, None]) + absA.multiply(absA).multiply(
+            np.abs(self.weight)[:, None]
+        )
+        return np.asarray(C.sum(axis=0)).ravel()
+
+
+def _weighted_percentile(values: np.ndarray, counts: np.ndarray, q) -> np.ndarray:
+    """
+    np.percentile (method="linear") für ein Array, in dem values[k] genau counts[k]-mal
+    vorkommt – ohne es auszuschreiben. values muss aufsteigend sortiert sein.
+    """
+    q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+    cum = np.cumsum(counts)
+    total = int(cum[-1])
+    h = (total - 1) * q / 100.0
+    lo = np.floor(h).astype(np.int64)
+    hi = np.minimum(lo + 1, total - 1)
+    v_lo = values[np.searchsorted(cum, lo, side="right")]
+    v_hi = values[np.searchsorted(cum, hi, side="right")]
+    return v_lo + (h - lo) * (v_hi - v_lo)
+
 class QuboBuilder:
     def __init__(self, indexer):
         self.indexer = indexer
         self.Q: Dict[Tuple[int,int], float] = defaultdict(float)
+        self._components: Dict[str, "_CooBuffer"] = {}
+        self._group_buf: Optional["_CooBuffer"] = None
+        self._group_name: Optional[str] = None
+        self._squares: List[tuple] = []
+        self._sq_cache = None
+        self._basis = None
+        # Term-Gruppen, für die weighted()/reweighted() ein explizites Gewicht verlangen
+        self.required_groups: set = set()
 
     def add_linear(self, i: int, coeff: float) -> None:
         self.Q[(i, i)] += float(coeff)
+        if self._group_buf is not None:
+            self._group_buf.append(i, i, float(coeff))
+        self._basis = None
 
     def add_quad(self, i: int, j: int, val: float) -> None:
         if j < i:
             i, j = j, i
         self.Q[(i, j)] += float(val)
+        if self._group_buf is not None:
+            self._group_buf.append(i, j, float(val))
+        self._basis = None
+
+    def add_terms(self, rows, cols, vals) -> None:
+        """
+        Fügt viele Terme auf einmal hinzu (i == j -> linear, sonst quadratisch).
+        rows/cols/vals sind gleich lange Arrays bzw. Listen.  Doppelte (i, j) werden
+        vorab mit merge_triplets zusammengefasst; das Dict wird nur einmal je Schlüssel
+        angefasst.
+        """
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        vals = np.broadcast_to(np.asarray(vals, dtype=np.float64), rows.shape).ravel()
+        r, c, v = merge_triplets(np.minimum(rows, cols), np.maximum(rows, cols), vals)
+        for key, val in zip(zip(r.tolist(), c.tolist()), v.tolist()):
+            self.Q[key] += val
+        if self._group_buf is not None:
+            self._group_buf.extend(r, c, v)
+        self._basis = None
+
+    def coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Kanonische obere Dreiecksform als (rows, cols, vals), zeilenweise sortiert,
+        ohne Duplikate – inklusive der dicht expandierten faktorisierten Terme
+        (siehe add_squared_linear_many; ohne solche Terme identisch zu explicit_coo).
+        """
+        rows, cols, vals = self.explicit_coo()
+        if not self._squares:
+            return rows, cols, vals
+        r, c, v = self.squares().expand()
+        return merge_triplets(np.concatenate([rows, r]), np.concatenate([cols, c]), np.concatenate([vals, v]))
+
+    def explicit_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Nur die explizit gespeicherten Terme (ohne faktorisierte Quadrate)."""
+        if not self.Q:
+            return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        keys = sorted(self.Q.keys())
+        rows = np.fromiter((k[0] for k in keys), dtype=np.int64, count=len(keys))
+        cols = np.fromiter((k[1] for k in keys), dtype=np.int64, count=len(keys))
+        vals = np.fromiter((self.Q[k] for k in keys), dtype=np.float64, count=len(keys))
+        return rows, cols, vals
 
     def prune(self, eps: float = 1e-12) -> None:
         for k in list(self.Q.keys()):
             if abs(self.Q[k]) < eps:
                 del self.Q[k]
+        self._basis = None
 
     def scale(self, factor: float) -> None:
         if factor == 1.0: 
             return
         for k in list(self.Q.keys()):
             self.Q[k] *= factor
+        self._scale_components(factor)
 
     def as_dict(self) -> Dict[Tuple[int,int], float]:
+        if self._squares:
+            rows, cols, vals = self.coo()
+            return dict(zip(zip(rows.tolist(), cols.tolist()), vals.tolist()))
         return dict(self.Q)
 
+    ########
+    #Faktorisierte Quadrate  λ·(a·x + b)²
+    ########
+
+    def add_squared_linear(qb, idx, coef, offset: float = 0.0, weight: float = 1.0):
+        """
+        weight · (Σ_i coef_i · x_idx_i + offset)²  als ein faktorisierter Term
+        (Konstante weight · offset² ignoriert, wie bei der Expansion).
+        """
+        qb.add_squared_linear_many([list(idx)], [list(coef)], offset, weight)
+
+    def add_squared_linear_many(qb, groups, coefs, offsets=0.0, weight=1.0):
+        """
+        Σ_g weight_g · (Σ_k coefs[g, k] · x_groups[g, k] + offsets[g])²  (-1 = Variable fehlt).
+
+        Die Terme werden als (Koeffizientenvektor, Offset, Gewicht) gespeichert statt als
+        k² Paar-Koppler; coo()/to_scipy_sparse() expandieren sie erst beim Export,
+        energies() und der SimulatedAnnealer rechnen direkt auf der faktorisierten Form.
+        """
+        g = qb._groups(groups)
+        if g.size == 0:
+            return
+        c = np.broadcast_to(np.asarray(coefs, dtype=np.float64), g.shape)
+        b = np.broadcast_to(np.asarray(offsets, dtype=np.float64), (g.shape[0],)).copy()
+        w = np.broadcast_to(np.asarray(weight, dtype=np.float64), (g.shape[0],)).copy()
+        keep = (g >= 0) & (c != 0)
+        term = np.broadcast_to(np.arange(g.shape[0])[:, None], g.shape)[keep]
+        nz = w != 0
+        if not nz.any():
+            return
+        if not nz.all():
+            new_id = np.cumsum(nz) - 1
+            sel = nz[term]
+            term, idx, val = new_id[term[sel]], g[keep][sel], c[keep][sel]
+            b, w = b[nz], w[nz]
+        else:
+            idx, val = g[keep], c[keep]
+        qb._squares.append((term.astype(np.int64), idx.astype(np.int64), val.copy(), b, w, qb._group_name))
+        if qb._group_name is not None:
+            qb._components.setdefault(qb._group_name, _CooBuffer(1024))
+        qb._sq_cache = None
+        qb._basis = None
+
+    def _square_data(self):
+        """(SquaredTerms mit Rohgewichten, Gruppenname je Term) – zwischengespeichert."""
+        if self._sq_cache is None:
+            from scipy.sparse import csr_matrix
+            terms, idx, vals, offs, wts, groups, start = [], [], [], [], [], [], 0
+            for t, i, v, b, w, g in self._squares:
+                terms.append(t + start)
+                idx.append(i)
+                vals.append(v)
+                offs.append(b)
+                wts.append(w)
+                groups += [g] * len(b)
+                start += len(b)
+            idx = np.concatenate(idx)
+            n = max(len(self.indexer), int(idx.max()) + 1 if len(idx) else 0)
+            A = csr_matrix((np.concatenate(vals), (np.concatenate(terms), idx)), shape=(start, n))
+            A.sum_duplicates()
+            self._sq_cache = (SquaredTerms(A, np.concatenate(offs), np.concatenate(wts)), np.array(groups, dtype=object))
+        return self._sq_cache
+
+    @property
+    def n_squares(self) -> int:
+        return int(sum(len(part[3]) for part in self._squares))
+
+    def squares(self, weights: Optional[Dict[str, float]] = None) -> Optional[SquaredTerms]:
+        """
+        Alle faktorisierten Terme als SquaredTerms (None, wenn es keine gibt);
+        mit weights wird das Gewicht jedes Terms mit dem seiner Term-Gruppe multipliziert.
+        """
+        if not self._squares:
+            return None
+        sq, groups = self._square_data()
+        if weights:
+            sq = sq.scaled(np.array([float(weights.get(g, 1.0)) if g is not None else 1.0 for g in groups]))
+        return sq
+
+    ########
+    #Term-Gruppen (Lagrange-Gewichte ohne Neubau ändern)
+    ########
+
+    @contextmanager
+    def term_group(self, name: str):
+        """
+        Alle Terme innerhalb des with-Blocks werden zusätzlich als Komponente `name`
+        gespeichert. Baut man jede Gruppe mit Gewicht 1, ist
+            Q(weights) = Q + Σ_g (weights[g] - 1) · C_g
+        ohne erneuten Aufruf der Constraint-Builder (siehe weighted()).
+        """
+        if self._group_buf is not None:
+            raise RuntimeError("term_group kann nicht verschachtelt werden.")
+        self._group_buf = self._components.setdefault(name, _CooBuffer(1024))
+        self._group_name = name
+        try:
+            yield self
+        finally:
+            self._group_buf = None
+            self._group_name = None
+            self._basis = None
+
+    @property
+    def component_names(self) -> List[str]:
+        return list(self._components)
+
+    def _scale_components(self, factor: float) -> None:
+        for buf in self._components.values():
+            buf.vals[:buf.n] *= factor
+        self._squares = [(t, i, v, b, w * factor, g) for t, i, v, b, w, g in self._squares]
+        self._sq_cache = None
+        self._basis = None
+
+    def component_basis(self, expand: bool = True):
+        """
+        Gemeinsames Sparsity-Muster aller Komponenten:
+            rows, cols (nnz,), names, V (1 + G, nnz)
+        V[0] ist der Rest (Terme außerhalb jeder Gruppe), V[1 + g] die Komponente g.
+        expand=False lässt die faktorisierten Quadrate weg (siehe squares()).
+        Wird zwischengespeichert, bis neue Terme hinzukommen.
+        """
+        if self._basis is None:
+            self._basis = {}
+        if expand not in self._basis:
+            self._basis[expand] = self._build_basis(expand and bool(self._squares))
+        return self._basis[expand]
+
+    def _build_basis(self, expand: bool):
+        names = self.component_names
+        parts = [self.coo() if expand else self.explicit_coo()]
+        parts += [merge_triplets(*self._components[g].view()) for g in names]
+        if expand:
+            sq, groups = self._square_data()
+            for g, name in enumerate(names, start=1):
+                mask = groups == name
+                if mask.any():
+                    r, c, v = sq.subset(mask).expand()
+                    parts[g] = merge_triplets(*(np.concatenate([a, b]) for a, b in zip(parts[g], (r, c, v))))
+        n = max([len(self.indexer)] + [int(c.max()) + 1 for _, c, _ in parts if len(c)])
+        keys = [r * n + c for r, c, _ in parts]
+        union = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+        V = np.zeros((1 + len(names), len(union)))
+        for g, (k, (_, _, v)) in enumerate(zip(keys, parts)):
+            V[g, np.searchsorted(union, k)] = v
+        V[0] -= V[1:].sum(axis=0)
+        return (union // n, union % n, names, V)
+
+    def weighted_coo(self, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Q als gewichtete Summe der Komponenten (Gruppen ohne Eintrag in weights
+        behalten Gewicht 1, außer denen in required_groups – dann KeyError). Kostet ein (1+G)×nnz-Matrix-Vektor-Produkt.
+        """
+        rows, cols, names, V = self.component_basis()
+        self._check_weights(names, weights)
+        coef = np.array([1.0] + [float(weights.get(g, 1.0)) for g in names])
+        return rows, cols, coef @ V
+
+    def _check_weights(self, names: List[str], weights: Dict[str, float]) -> None:
+        unknown = set(weights) - set(names)
+        if unknown:
+            raise KeyError(f"Unbekannte Term-Gruppen: {sorted(unknown)}")
+        missing = set(self.required_groups) - set(weights)
+        if missing:
+            raise KeyError(f"Gewicht für Term-Gruppen ohne sinnvolles Standardgewicht fehlt: {sorted(missing)}")
+
+    def weighted(self, weights: Dict[str, float], fmt: str = "csr", size: Optional[int] = None):
+        """Wie weighted_coo, aber als scipy.sparse-Matrix."""
+        from scipy.sparse import coo_matrix
+        rows, cols, vals = self.weighted_coo(weights)
+        size = self._size(cols, size)
+        return coo_matrix((vals, (rows, cols)), shape=(size, size)).asformat(fmt)
+
+    def reweighted(self, weights: Dict[str, float]) -> "SparseQuboBuilder":
+        """
+        Neuer SparseQuboBuilder mit Q(weights) (ohne Komponenten).  Faktorisierte
+        Quadrate bleiben faktorisiert, ihr Gewicht wird mit dem der Gruppe multipliziert.
+        """
+        qb = SparseQuboBuilder(self.indexer, capacity=1)
+        if not self._squares:
+            qb._merged = self.weighted_coo(weights)
+            return qb
+        rows, cols, names, V = self.component_basis(expand=False)
+        self._check_weights(names, weights)
+        coef = np.array([1.0] + [float(weights.get(g, 1.0)) for g in names])
+        qb._merged = (rows, cols, coef @ V)
+        sq = self.squares(weights)
+        A = sq.A.tocoo()
+        qb._squares = [(A.row.astype(np.int64), A.col.astype(np.int64), A.data, sq.offset, sq.weight, None)]
+        return qb
+
+    ########
+    #Energie-Auswertung
+    ########
+
+    @staticmethod
+    def _upper_csr(rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, n: int):
+        from scipy.sparse import csr_matrix
+        return csr_matrix((vals, (rows, cols)), shape=(n, n))
+
+    def energies(self, samples, chunk_size: int = 4096, by_group: bool = False):
+        """
+        Energien E(s) = Σ_{i<=j} Q_ij s_i s_j für alle Zeilen von samples (n_samples, n_vars)
+        über Sparse-Matrixprodukte, in Blöcken zu chunk_size Zeilen.
+
+        by_group=True liefert zusätzlich {gruppe: energien} je Term-Gruppe
+        (siehe term_group); "rest" enthält die Terme außerhalb aller Gruppen.
+        """
+        S = np.asarray(samples)
+        if S.ndim == 1:
+            S = S[None, :]
+        n = S.shape[1]
+        rows, cols, vals = self.explicit_coo()
+        sq = groups = None
+        used = cols
+        if self._squares:
+            sq, groups = self._square_data()
+            used = np.concatenate([cols, sq.A.indices])
+        if len(used) and int(used.max()) >= n:
+            raise ValueError(f"samples haben {n} Spalten, Q braucht mindestens {int(used.max()) + 1}.")
+
+        mats = {"total": self._upper_csr(rows, cols, vals, n)}
+        sqs = {"total": sq.resized(n)} if sq is not None else {}
+        if by_group:
+            b_rows, b_cols, names, V = self.component_basis(expand=False)
+            for g, name in enumerate(["rest"] + names):
+                mats[name] = self._upper_csr(b_rows, b_cols, V[g], n)
+                if sq is not None:
+                    mask = groups == (name if g else None)
+                    if mask.any():
+                        sqs[name] = sq.subset(mask).resized(n)
+
+        out = {name: np.empty(S.shape[0]) for name in mats}
+        for start in range(0, S.shape[0], chunk_size):
+            block = S[start:start + chunk_size].astype(np.float64)
+            for name, U in mats.items():
+                e = np.einsum("ij,ij->i", (U.T @ block.T).T, block)
+                if name in sqs:
+                    e = e + sqs[name].energies(block)
+                out[name][start:start + chunk_size] = e
+
+        total = out.pop("total")
+        if by_group:
+            return total, out
+        return total
+
     def stats(self, size: Optional[int] = None) -> QuboStats:
         if size is None:
             size = len(self.indexer)
-        n_entries = len(self.Q)
-        n_linear = sum(1 for (i, j) in self.Q if i == j)
+        rows, cols, _ = self.coo()
+        n_entries = len(rows)
+        n_linear = int(np.count_nonzero(rows == cols))
         n_quadratic = n_entries - n_linear
         max_upper = size * (size + 1) / 2 if size > 0 else 1.0
         density = n_entries / max_upper
         return QuboStats(size, n_entries, n_linear, n_quadratic, density)
 
+    def _size(self, cols: np.ndarray, size: Optional[int] = None) -> int:
+        if size is not None:
+            return size
+        return max(len(self.indexer), int(cols.max()) + 1 if len(cols) else 0)
+
+    def to_scipy_sparse(self, fmt: str = "csr", size: Optional[int] = None, symmetric: bool = False):
+        """
+        Q als scipy.sparse-Matrix (obere Dreiecksform).
+        symmetric=True spiegelt die Off-Diagonalen (wie to_dataframe), ohne Halbierung.
+        """
+        from scipy.sparse import coo_matrix
+        rows, cols, vals = self.coo()
+        size = self._size(cols, size)
+        if symmetric:
+            off = rows != cols
+            rows, cols, vals = (
+                np.concatenate([rows, cols[off]]),
+                np.concatenate([cols, rows[off]]),
+                np.concatenate([vals, vals[off]]),
+            )
+        return coo_matrix((vals, (rows, cols)), shape=(size, size)).asformat(fmt)
+
+    def to_csr(self, size: Optional[int] = None):
+        return self.to_scipy_sparse("csr", size)
+
+    def to_numpy_triu(self, size: Optional[int] = None) -> np.ndarray:
+        """Dichte obere Dreiecksmatrix (nur für kleine Modelle / Export)."""
+        rows, cols, vals = self.coo()
+        mat = np.zeros((self._size(cols, size),) * 2)
+        mat[rows, cols] = vals
+        return mat
+
+    def coefficient_stats(
+        self,
+        percentiles=(5, 50, 95),
+        absolute: bool = True,
+        include_zeros: bool = False,
+        size: Optional[int] = None,
+    ) -> CoefficientStats:
+        """
+        Koeffizienten-Statistik direkt aus den Sparse-Daten (keine n×n-Matrix).
+
+        absolute=True arbeitet auf |Q_ij|. include_zeros=True liefert dieselben
+        Perzentile wie np.percentile(np.abs(qb.to_dataframe().values), ...),
+        d.h. über die gespiegelte n×n-Matrix inkl. Nullen.
+        """
+        rows, cols, vals = self.coo()
+        nz = vals != 0
+        rows, cols, vals = rows[nz], cols[nz], vals[nz]
+        v = np.abs(vals) if absolute else vals
+        counts = np.ones(len(v), dtype=np.int64)
+        if include_zeros:
+            n = self._size(cols, size)
+            counts = np.where(rows == cols, 1, 2)
+            n_zero = n * n - int(counts.sum())
+            if n_zero > 0:
+                v = np.append(v, 0.0)
+                counts = np.append(counts, n_zero)
+        if not len(v):
+            nan = float("nan")
+            return CoefficientStats(0, nan, nan, nan, nan, nan, {float(q): nan for q in percentiles})
+        order = np.argsort(v, kind="stable")
+        v, counts = v[order], counts[order]
+        pct = _weighted_percentile(v, counts, percentiles)
+        a = np.abs(vals)
+        abs_min = float(a.min()) if len(a) else float("nan")
+        abs_max = float(a.max()) if len(a) else float("nan")
+        return CoefficientStats(
+            n_coefficients=int(counts.sum()),
+            min=float(v[0]),
+            max=float(v[-1]),
+            abs_min=abs_min,
+            abs_max=abs_max,
+            dynamic_range=abs_max / abs_min if len(a) else float("nan"),
+            percentiles={float(q): float(x) for q, x in zip(percentiles, pct)},
+        )
+
     def to_dataframe(self, size: Optional[int] = None, use_labels: bool = True) -> pd.DataFrame:
         if size is None:
             size = len(self.indexer)
-        mat: List[List[float]] = [[0.0 for _ in range(size)] for _ in range(size)]
-        for (i, j), v in self.Q.items():
-            mat[i][j] += v
-        for i in range(size):
-            for j in range(i):
-                mat[i][j] = mat[j][i]
+        mat = self.to_scipy_sparse("coo", size, symmetric=True).toarray()
 
         if use_labels and len(self.indexer) == size:
             idx = [self.indexer.reverse(i) for i in range(size)]
@@ -76,36 +548,15 @@ class QuboBuilder:
         Expandiert: sum v_i^2  + 2*sum_{i<j} v_i v_j  - 2*sum v_i + 1
         (Konstante +lam ignorieren wir).
         """
-        vars_idx = list(vars_idx)
-        for i in vars_idx:
-            qb.add_linear(i, lam)       
-            qb.add_linear(i, -2*lam)    
-        for a in range(len(vars_idx)):
-            for b in range(a+1, len(vars_idx)):
-                qb.add_quad(vars_idx[a], vars_idx[b], 2*lam)
+        qb.one_hot_many([list(vars_idx)], lam)
 
     def sum_equal_sum(qb, A, B, lam: float):
         """
         (sum A - sum B)^2 = sum A^2 + sum B^2 - 2*sum_{a in A, b in B} a b + 2*sum_{i<j in A} a_i a_j + 2*sum_{i<j in B} b_i b_j - 2*sum A - 2*sum B
         (Konstante ignoriert).
         """
-        A = list(A); B = list(B)
-        for i in A:
-            qb.add_linear(i, 1*lam)
-            qb.add_linear(i, -2*lam)
-        for j in B:
-            qb.add_linear(j, 1*lam)
-            qb.add_linear(j, -2*lam) 
-        for u in range(len(A)):
-            for v in range(u+1, len(A)):
-                qb.add_quad(A[u], A[v], 2*lam)
-        for u in range(len(B)):
-            for v in range(u+1, len(B)):
-                qb.add_quad(B[u], B[v], 2*lam)
-        for i in A:
-            for j in B:
-                qb.add_quad(i, j, -2*lam)
-    
+        qb.sum_equal_sum_many([list(A)], [list(B)], lam)
+
     def and_link(qb, x_idx: int, y_idx: int, w_idx: int, lam: float):
         """
         W erzwingt w = x ∧ y:
@@ -113,20 +564,298 @@ class QuboBuilder:
         Führt zu charakteristischen -2*lam Kopplungen w/x, w/y und +2*lam x/y.
         (Es gibt mehrere äquivalente Dreiterm-Varianten; diese ist stabil.)
         """
-        qb.add_linear(w_idx, lam)
-        qb.add_linear(x_idx, lam)
-        qb.add_quad(w_idx, x_idx, -2*lam)
-
-        qb.add_linear(w_idx, lam)
-        qb.add_linear(y_idx, lam)
-        qb.add_quad(w_idx, y_idx, -2*lam)
-
-        qb.add_linear(x_idx, lam) 
-        qb.add_linear(y_idx, lam)        
-        qb.add_linear(w_idx, lam)      
-        qb.add_quad(x_idx, y_idx, 2*lam) 
-        qb.add_quad(x_idx, w_idx, -2*lam)
-        qb.add_quad(y_idx, w_idx, -2*lam)
-        qb.add_linear(x_idx, -2*lam)
-        qb.add_linear(y_idx, -2*lam)
-        qb.add_linear(w_idx,  2*lam)
\ No newline at end of file
+        qb.and_link_many([x_idx], [y_idx], [w_idx], lam)
+
+
+    ########
+    #Batch-Varianten
+    #   groups: 2D-Array (n_groups, k) von Variablenindizes, -1 = Variable fehlt.
+    #   Alle Paar-Terme werden als Arrays erzeugt und mit einem add_terms-Aufruf übergeben.
+    ########
+
+    @staticmethod
+    def _groups(groups) -> np.ndarray:
+        g = np.asarray(groups, dtype=np.int64)
+        if g.ndim == 1:
+            g = g[None, :]
+        return g
+
+    @staticmethod
+    def _group_pairs(g: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Alle Paare a<b innerhalb jeder Zeile von g (nur vorhandene Variablen)."""
+        ia, ib = np.triu_indices(g.shape[1], k=1)
+        rows = g[:, ia].ravel()
+        cols = g[:, ib].ravel()
+        keep = (rows >= 0) & (cols >= 0)
+        return rows[keep], cols[keep]
+
+    def one_hot_many(qb, groups, lam: float):
+        """
+        Σ_g (Σ_{v∈g} v - 1)^2 für alle Zeilen von groups auf einmal:
+        -lam linear je Variable (aus +lam - 2lam), +2lam je Paar.
+        """
+        g = qb._groups(groups)
+        if not lam or g.size == 0:
+            return
+        lin = g[g >= 0]
+        qb.add_terms(lin, lin, np.full(len(lin), -float(lam)))
+        rows, cols = qb._group_pairs(g)
+        qb.add_terms(rows, cols, np.full(len(rows), 2.0 * lam))
+
+    def at_most_one_many(qb, groups, lam: float):
+        """Σ_g Σ_{i<j∈g} 2*lam v_i v_j  (At-most-one, nur Paarstrafen)."""
+        g = qb._groups(groups)
+        if not lam or g.size == 0:
+            return
+        rows, cols = qb._group_pairs(g)
+        qb.add_terms(rows, cols, np.full(len(rows), 2.0 * lam))
+
+    def sum_equal_sum_many(qb, A, B, lam: float):
+        """Batch-Version von sum_equal_sum; Zeile g von A gehört zu Zeile g von B."""
+        A = qb._groups(A)
+        B = qb._groups(B)
+        if not lam or (A.size == 0 and B.size == 0):
+            return
+        for g in (A, B):
+            lin = g[g >= 0]
+            qb.add_terms(lin, lin, np.full(len(lin), -float(lam)))
+            rows, cols = qb._group_pairs(g)
+            qb.add_terms(rows, cols, np.full(len(rows), 2.0 * lam))
+        if A.shape[1] and B.shape[1]:
+            rows = np.repeat(A, B.shape[1], axis=1).ravel()
+            cols = np.tile(B, (1, A.shape[1])).ravel()
+            keep = (rows >= 0) & (cols >= 0)
+            qb.add_terms(rows[keep], cols[keep], np.full(int(keep.sum()), -2.0 * lam))
+
+    def and_link_many(qb, x_idx, y_idx, w_idx, lam: float):
+        """
+        Batch-Version von and_link für gleich lange (bzw. broadcastbare) Index-Arrays.
+        Netto: +5lam w, -4lam w·x, -4lam w·y, +2lam x·y (x, y linear heben sich auf).
+        """
+        if not lam:
+            return
+        xi, yi, wi = np.broadcast_arrays(
+            np.asarray(x_idx, dtype=np.int64),
+            np.asarray(y_idx, dtype=np.int64),
+            np.asarray(w_idx, dtype=np.int64),
+        )
+        keep = (xi >= 0) & (yi >= 0) & (wi >= 0)
+        xi, yi, wi = xi[keep], yi[keep], wi[keep]
+        n = len(wi)
+        if not n:
+            return
+        qb.add_terms(wi, wi, np.full(n, 5.0 * lam))
+        qb.add_terms(
+            np.concatenate([wi, wi, xi]),
+            np.concatenate([xi, yi, yi]),
+            np.concatenate([np.full(n, -4.0 * lam), np.full(n, -4.0 * lam), np.full(n, 2.0 * lam)]),
+        )
+
+class _CooBuffer:
+    """Wachsende NumPy-Puffer für (row, col, val)-Tripel (amortisiert O(1) pro Term)."""
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self.rows = np.empty(capacity, dtype=np.int64)
+        self.cols = np.empty(capacity, dtype=np.int64)
+        self.vals = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def _reserve(self, extra: int) -> None:
+        need = self.n + extra
+        cap = len(self.rows)
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        for name in ("rows", "cols", "vals"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def append(self, i: int, j: int, v: float) -> None:
+        if self.n == len(self.rows):
+            self._reserve(1)
+        self.rows[self.n] = i
+        self.cols[self.n] = j
+        self.vals[self.n] = v
+        self.n += 1
+
+    def extend(self, rows: np.ndarray, cols: np.ndarray, vals: np.ndarray) -> None:
+        k = len(rows)
+        if not k:
+            return
+        self._reserve(k)
+        self.rows[self.n:self.n + k] = rows
+        self.cols[self.n:self.n + k] = cols
+        self.vals[self.n:self.n + k] = vals
+        self.n += k
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.rows[:self.n], self.cols[:self.n], self.vals[:self.n]
+
+    def clear(self) -> None:
+        self.n = 0
+
+
+def bounded_coefficients(m: int) -> np.ndarray:
+    """
+    Koeffizienten c mit {Σ c_j b_j} = {0, ..., m} genau (wie IntegerToBinary in
+    qiskit-optimization): 1, 2, 4, ..., 2^(k-2), m - 2^(k-1) + 1.  ⌈log₂(m+1)⌉ Bits,
+    jede Bitbelegung ist gültig.
+    """
+    if m <= 0:
+        return np.zeros(0, dtype=np.int64)
+    k = int(m).bit_length()
+    coef = 1 << np.arange(k - 1, dtype=np.int64)
+    return np.append(coef, m - (1 << (k - 1)) + 1)
+
+
+def merge_triplets(rows: np.ndarray, cols: np.ndarray, vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fasst doppelte (i, j)-Einträge in einem Durchlauf zusammen.
+    Erwartet bereits i <= j; Ergebnis ist zeilenweise sortiert.
+    """
+    if not len(rows):
+        return rows.astype(np.int64), cols.astype(np.int64), vals.astype(np.float64)
+    n = int(max(rows.max(), cols.max())) + 1
+    keys = rows.astype(np.int64) * n + cols.astype(np.int64)
+    uniq, inv = np.unique(keys, return_inverse=True)
+    merged = np.bincount(inv, weights=vals, minlength=len(uniq))
+    return uniq // n, uniq % n, merged
+
+
+class _QView(Mapping):
+    """
+    Schreibgeschützte Sicht auf die zusammengeführten Terme; fehlende (i, j) liefern
+    0.0 wie beim defaultdict des QuboBuilder (ohne dabei Einträge anzulegen).
+    """
+
+    def __init__(self, terms: Dict[Tuple[int, int], float]):
+        self._terms = terms
+
+    def __getitem__(self, key) -> float:
+        return self._terms.get(key, 0.0)
+
+    def get(self, key, default=None):
+        return self._terms.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self._terms
+
+    def __iter__(self):
+        return iter(self._terms)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __repr__(self) -> str:
+        return f"_QView({self._terms!r})"
+
+
+class SparseQuboBuilder(QuboBuilder):
+    """
+    Array-Backend für den QuboBuilder.
+
+    Statt eines Dicts pro (i, j) werden alle Terme in wachsende NumPy-Puffer
+    angehängt und erst bei Bedarf (Zugriff auf Q, coo(), stats(), ...) in einem
+    Durchlauf zu einer kanonischen oberen Dreiecksmatrix zusammengeführt.
+
+    add_linear/add_quad/Q bleiben kompatibel; Q ist hier allerdings eine
+    schreibgeschützte Sicht (fehlende Einträge 0.0 wie beim defaultdict) –
+    Änderungen bitte nur über add_* oder durch Zuweisen eines ganzen Dicts an Q.
+    """
+
+    def __init__(self, indexer, capacity: int = 1 << 16):
+        self._buf = _CooBuffer(capacity)
+        self._Q_cache: Optional[Dict[Tuple[int, int], float]] = None
+        super().__init__(indexer)       # Q = defaultdict(float) läuft über den Q-Setter
+
+    # ---- Akkumulation ---------------------------------------------
+    def add_linear(self, i: int, coeff: float) -> None:
+        self._buf.append(i, i, float(coeff))
+        if self._group_buf is not None:
+            self._group_buf.append(i, i, float(coeff))
+        self._Q_cache = None
+        self._basis = None
+
+    def add_quad(self, i: int, j: int, val: float) -> None:
+        if j < i:
+            i, j = j, i
+        self._buf.append(i, j, float(val))
+        if self._group_buf is not None:
+            self._group_buf.append(i, j, float(val))
+        self._Q_cache = None
+        self._basis = None
+
+    def add_terms(self, rows, cols, vals) -> None:
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        vals = np.broadcast_to(np.asarray(vals, dtype=np.float64), rows.shape).ravel()
+        lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+        self._buf.extend(lo, hi, vals)
+        if self._group_buf is not None:
+            self._group_buf.extend(lo, hi, vals)
+        self._Q_cache = None
+        self._basis = None
+
+    def add_squared_linear_many(self, groups, coefs, offsets=0.0, weight=1.0):
+        super().add_squared_linear_many(groups, coefs, offsets, weight)
+        self._Q_cache = None
+
+    # ---- Zusammenführen -------------------------------------------
+    def _flush(self) -> None:
+        if not len(self._buf):
+            return
+        r, c, v = self._buf.view()
+        mr, mc, mv = self._merged
+        self._merged = merge_triplets(
+            np.concatenate([mr, r]), np.concatenate([mc, c]), np.concatenate([mv, v])
+        )
+        self._buf.clear()
+
+    def explicit_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._flush()
+        return self._merged
+
+    @property
+    def Q(self) -> "_QView":
+        if self._Q_cache is None:
+            rows, cols, vals = self.coo()
+            self._Q_cache = dict(zip(zip(rows.tolist(), cols.tolist()), vals.tolist()))
+        return _QView(self._Q_cache)
+
+    @Q.setter
+    def Q(self, terms) -> None:
+        """Ersetzt alle explizit gespeicherten Terme durch terms ({(i, j): Wert})."""
+        keys = list(terms)
+        rows = np.array([k[0] for k in keys], dtype=np.int64)
+        cols = np.array([k[1] for k in keys], dtype=np.int64)
+        vals = np.array([terms[k] for k in keys], dtype=np.float64)
+        self._buf.clear()
+        self._merged = merge_triplets(np.minimum(rows, cols), np.maximum(rows, cols), vals)
+        self._Q_cache = None
+        self._basis = None
+
+    # ---- Nachbearbeitung ------------------------------------------
+    def prune(self, eps: float = 1e-12) -> None:
+        rows, cols, vals = self.explicit_coo()
+        keep = np.abs(vals) >= eps
+        self._merged = (rows[keep], cols[keep], vals[keep])
+        self._Q_cache = None
+        self._basis = None
+
+    def scale(self, factor: float) -> None:
+        if factor == 1.0:
+            return
+        rows, cols, vals = self.explicit_coo()
+        self._merged = (rows, cols, vals * factor)
+        self._Q_cache = None
+        self._scale_components(factor)
+
+    def as_dict(self) -> Dict[Tuple[int,int], float]:
+        return dict(self.Q)
@@ -0,0 +1,250 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model.solvers.common import split_factored, qubo_energies
+
+
+@dataclass
+class AnnealResult:
+    """
+    Ergebnis von SimulatedAnnealer.sample.  Nach einem Abbruch über target_energy
+    (info["stopped_early"]) enthält es nur die Reads der Jobs, die gelaufen sind –
+    also ggf. weniger als num_reads Zeilen.
+    """
+    samples: np.ndarray            # (Reads, n) int8; Reads <= num_reads
+    energies: np.ndarray           # (Reads,)
+    sweeps_run: int                # max. Anzahl ausgeführter Sweeps über alle Jobs
+    runtime: float                 # Sekunden (Wall-Clock)
+    info: Dict = field(default_factory=dict)
+
+    def lowest(self) -> Tuple[np.ndarray, float]:
+        k = int(np.argmin(self.energies))
+        return self.samples[k], float(self.energies[k])
+
+    @property
+    def best_energy(self) -> float:
+        return float(self.energies.min())
+
+    def sample_dict(self, k: int = None) -> Dict[int, int]:
+        """Sample als {idx: 0/1} (wie sampleset.first.sample); Standard: bestes Sample."""
+        if k is None:
+            k = int(np.argmin(self.energies))
+        return {i: int(v) for i, v in enumerate(self.samples[k])}
+
+
+def default_beta_range(h: np.ndarray, J, squares=None) -> Tuple[float, float]:
+    """
+    Heuristik wie bei neal: heiß = ln 2 / max|ΔE| (fast alles wird akzeptiert),
+    kalt = ln 100 / min|ΔE| (kleinster Schritt wird kaum noch akzeptiert).
+    squares (SquaredTerms) gehen über SquaredTerms.max_delta bzw. |w·a²| ein.
+    """
+    abs_row = np.abs(h) + np.asarray(abs(J).sum(axis=1)).ravel()
+    parts = [np.abs(h[h != 0]), np.abs(J.data[J.data != 0])]
+    if squares is not None:
+        abs_row = abs_row + squares.max_delta()
+        sq = abs(squares.A).power(2).multiply(np.abs(squares.weight)[:, None]).tocsr()
+        parts.append(sq.data[sq.data != 0])
+    max_delta = float(abs_row.max()) if len(abs_row) else 1.0
+    nz = np.concatenate(parts)
+    min_delta = float(nz.min()) if len(nz) else 1.0
+    max_delta = max(max_delta, 1e-12)
+    return np.log(2) / max_delta, np.log(100) / max(min_delta, 1e-12)
+
+
+def make_beta_schedule(beta_range: Tuple[float, float], sweeps: int, kind: str = "geometric") -> np.ndarray:
+    """β pro Sweep: "geometric" (Standard, wie neal), "linear" oder ein eigenes Array."""
+    b0, b1 = float(beta_range[0]), float(beta_range[1])
+    if kind == "geometric":
+        return np.geomspace(b0, b1, sweeps)
+    if kind == "linear":
+        return np.linspace(b0, b1, sweeps)
+    raise ValueError(f"Unbekannter beta_schedule: {kind!r}")
+
+
+def anneal_batch(
+    h: np.ndarray,
+    J,
+    schedule: np.ndarray,
+    num_reads: int,
+    seed=None,
+    target_energy: Optional[float] = None,
+    initial_states: Optional[np.ndarray] = None,
+    squares=None,
+    stop=None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Simulated Annealing für num_reads unabhängige Reads gleichzeitig (vektorisiert über Reads).
+
+    Pro Sweep wird jede Variable einmal (Metropolis) angefasst. Das lokale Feld
+    f = s·J wird inkrementell aktualisiert: ein Flip von i kostet O(Grad(i)) pro Read.
+    Bricht ab, sobald ein Read target_energy erreicht; stop (Event, z.B. aus
+    multiprocessing.Manager) wird dann gesetzt und nach jedem Sweep abgefragt, so dass
+    parallel laufende Jobs ebenfalls anhalten.
+
+    squares (SquaredTerms, siehe split_factored): pro Term wird das Residuum
+    r_t = (A·s)_t + b_t mitgeführt; ein Flip von i (δ = ±1) ändert die Energie um
+    Σ_t w_t·a_ti·(2δ·r_t + a_ti) und kostet O(#Terme mit i) statt O(k) Koppler je Term.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(h)
+    if initial_states is None:
+        s = rng.integers(0, 2, size=(num_reads, n)).astype(np.float64)
+    else:
+        s = np.array(initial_states, dtype=np.float64, copy=True).reshape(num_reads, n)
+    field = (J @ s.T).T
+    energy = s @ h + 0.5 * np.einsum("ij,ij->i", field, s)
+    indptr, indices, data = J.indptr, J.indices, J.data
+    if squares is not None:
+        A = squares.A.tocsc()
+        sq_ptr, sq_terms, sq_coef = A.indptr, A.indices, A.data
+        sq_wa = squares.weight[sq_terms] * sq_coef          # w_t · a_ti je Eintrag
+        resid = squares.residuals(s)
+        energy += squares.energies(s)
+
+    sweeps_run = 0
+    for beta in schedule:
+        for i in range(n):
+            delta = 1.0 - 2.0 * s[:, i]
+            dE = delta * (h[i] + field[:, i])
+            if squares is not None:
+                sa, sb = sq_ptr[i], sq_ptr[i + 1]
+                if sb > sa:
+                    t = sq_terms[sa:sb]
+                    dE = dE + (2.0 * delta[:, None] * resid[:, t] + sq_coef[None, sa:sb]) @ sq_wa[sa:sb]
+            accept = rng.random(num_reads) < np.exp(-beta * np.maximum(dE, 0.0))
+            idx = np.flatnonzero(accept)
+            if not len(idx):
+                continue
+            d = delta[idx]
+            s[idx, i] += d
+            energy[idx] += dE[idx]
+            lo, hi = indptr[i], indptr[i + 1]
+            if hi > lo:
+                field[idx[:, None], indices[None, lo:hi]] += d[:, None] * data[None, lo:hi]
+            if squares is not None and sb > sa:
+                resid[idx[:, None], t[None, :]] += d[:, None] * sq_coef[None, sa:sb]
+        sweeps_run += 1
+        if target_energy is not None and energy.min() <= target_energy:
+            if stop is not None:
+                stop.set()
+            break
+        if stop is not None and stop.is_set():
+            break
+
+    # Rundungsfehler der inkrementellen Summe vermeiden
+    energy = qubo_energies(h, J, s)
+    if squares is not None:
+        energy += squares.energies(s)
+    return s.astype(np.int8), energy, sweeps_run
+
+
+class SimulatedAnnealer:
+    """
+    In-Repo Simulated Annealer für QuboBuilder-Modelle (arbeitet direkt auf der CSR-Form).
+
+    Die Reads werden in Jobs zu reads_per_job aufgeteilt und über einen Prozess-Pool
+    verteilt (num_workers=1 -> alles im aktuellen Prozess).
+
+        sampler = SimulatedAnnealer(num_workers=4)
+        res = sampler.sample(qb, num_reads=5000, sweeps=2000, beta_range=(0.1, 10.0), seed=123)
+        best, E = res.lowest()
+    """
+
+    _kernel = staticmethod(anneal_batch)
+
+    def __init__(self, num_workers: Optional[int] = None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+
+    def _split(self, model):
+        """(h, J, squares) – faktorisierte Quadrate bleiben für den Kernel faktorisiert."""
+        return split_factored(model)
+
+    def _job_args(self, h, J, schedule, num_reads, seed, target_energy, initial_states, squares=None) -> tuple:
+        return (h, J, schedule, num_reads, seed, target_energy, initial_states, squares)
+
+    def sample(
+        self,
+        model,
+        num_reads: int = 100,
+        sweeps: int = 1000,
+        beta_range: Optional[Tuple[float, float]] = None,
+        beta_schedule="geometric",
+        seed=None,
+        target_energy: Optional[float] = None,
+        initial_states: Optional[np.ndarray] = None,
+        reads_per_job: Optional[int] = None,
+    ) -> AnnealResult:
+        """
+        model: QuboBuilder oder scipy.sparse-Matrix.
+        beta_schedule: "geometric", "linear" oder explizites Array (ersetzt sweeps/beta_range).
+        target_energy: früher Abbruch, sobald ein Read diese Energie erreicht.  Laufende
+            Jobs im Pool halten nach ihrem aktuellen Sweep an (gemeinsames Stop-Event),
+            noch nicht gestartete entfallen – das Ergebnis enthält alle Reads der
+            gelaufenen Jobs, ggf. also weniger als num_reads (info["stopped_early"]).
+        initial_states: (num_reads, n) Startzustände (z.B. für Warm-Starts).
+        """
+        t0 = time.perf_counter()
+        h, J, squares = self._split(model)
+        if isinstance(beta_schedule, str):
+            if beta_range is None:
+                beta_range = default_beta_range(h, J, squares)
+            schedule = make_beta_schedule(beta_range, sweeps, beta_schedule)
+        else:
+            schedule = np.asarray(beta_schedule, dtype=np.float64)
+
+        if reads_per_job is None:
+            reads_per_job = max(1, -(-num_reads // self.num_workers))
+        bounds = list(range(0, num_reads, reads_per_job)) + [num_reads]
+        seeds = np.random.SeedSequence(seed).spawn(len(bounds) - 1)
+        jobs = []
+        for k, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+            init = None if initial_states is None else np.asarray(initial_states)[a:b]
+            jobs.append(self._job_args(h, J, schedule, b - a, seeds[k], target_energy, init, squares))
+
+        results: List = [None] * len(jobs)
+        stopped = False
+        if self.num_workers == 1 or len(jobs) == 1:
+            for k, job in enumerate(jobs):
+                results[k] = self._kernel(*job)
+                if target_energy is not None and results[k][1].min() <= target_energy:
+                    stopped = True
+                    break
+        else:
+            with ExitStack() as stack:
+                stop = None
+                if target_energy is not None:
+                    stop = stack.enter_context(multiprocessing.Manager()).Event()
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=self.num_workers))
+                futures = {pool.submit(self._kernel, *job, stop=stop): k for k, job in enumerate(jobs)}
+                for fut in as_completed(futures):
+                    if fut.cancelled():
+                        continue
+                    results[futures[fut]] = fut.result()
+                    if stop is not None and stop.is_set() and not stopped:
+                        # noch wartende Jobs entfallen, laufende halten am Sweep-Ende an
+                        stopped = True
+                        for other in futures:
+                            other.cancel()
+        results = [r for r in results if r is not None]
+
+        samples = np.concatenate([r[0] for r in results])
+        energies = np.concatenate([r[1] for r in results])
+        return AnnealResult(
+            samples=samples,
+            energies=energies,
+            sweeps_run=max(r[2] for r in results),
+            runtime=time.perf_counter() - t0,
+            info={
+                "beta_first": float(schedule[0]),
+                "beta_last": float(schedule[-1]),
+                "jobs": len(results),
+                "stopped_early": stopped,
+            },
+        )
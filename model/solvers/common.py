@@ -0,0 +1,57 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def as_upper_csr(model):
+    """
+    QuboBuilder (bzw. alles mit coo()) oder scipy.sparse-Matrix -> obere Dreiecks-CSR.
+    Bei einer vollen (symmetrischen) Matrix werden die unteren Einträge nach oben addiert.
+    """
+    from scipy.sparse import csr_matrix, triu, tril
+    if hasattr(model, "coo"):
+        rows, cols, vals = model.coo()
+        n = model._size(cols)
+        return csr_matrix((vals, (rows, cols)), shape=(n, n))
+    Q = csr_matrix(model)
+    return (triu(Q) + tril(Q, -1).T).tocsr()
+
+
+def split_qubo(model) -> Tuple[np.ndarray, "object"]:
+    """
+    Zerlegt Q in lineare Terme h (Diagonale) und symmetrische Kopplungen J (CSR, Diagonale 0),
+    so dass E(s) = h·s + ½ sᵀJs.  Lokales Feld: f_i = Σ_j J_ij s_j, ΔE_i = (1 - 2 s_i)(h_i + f_i).
+    """
+    from scipy.sparse import csr_matrix
+    U = as_upper_csr(model).tocoo()
+    n = U.shape[0]
+    h = np.zeros(n)
+    diag = U.row == U.col
+    np.add.at(h, U.row[diag], U.data[diag])
+    r, c, v = U.row[~diag], U.col[~diag], U.data[~diag]
+    J = csr_matrix((np.concatenate([v, v]), (np.concatenate([r, c]), np.concatenate([c, r]))), shape=(n, n))
+    J.eliminate_zeros()
+    J.sort_indices()
+    return h, J
+
+
+def split_factored(model):
+    """
+    Wie split_qubo, aber faktorisierte Quadrate (QuboBuilder.squares()) werden nicht
+    expandiert:  E(s) = h·s + ½ sᵀJs + squares.energies(s).
+    Rückgabe (h, J, squares); squares ist None bei Modellen ohne solche Terme.
+    """
+    squares = model.squares() if hasattr(model, "squares") else None
+    if squares is None:
+        return split_qubo(model) + (None,)
+    from scipy.sparse import csr_matrix
+    rows, cols, vals = model.explicit_coo()
+    n = max(model._size(cols), squares.A.shape[1])
+    h, J = split_qubo(csr_matrix((vals, (rows, cols)), shape=(n, n)))
+    return h, J, squares.resized(n)
+
+
+def qubo_energies(h: np.ndarray, J, S: np.ndarray) -> np.ndarray:
+    """E(s) = h·s + ½ sᵀJs für alle Zeilen von S."""
+    S = np.asarray(S, dtype=np.float64)
+    return S @ h + 0.5 * np.einsum("ij,ij->i", (J @ S.T).T, S)
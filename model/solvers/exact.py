@@ -0,0 +1,194 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model.solvers.common import split_qubo
+
+MAX_EXACT_VARIABLES = 40
+
+
+@dataclass
+class ExactResult:
+    energy: float                    # globales Minimum
+    ground_states: np.ndarray        # (k, n) int8, alle (bis max_ground_states) Zustände mit E = Minimum
+    n_ground_states: int             # tatsächliche Entartung (auch wenn ground_states gekappt ist)
+    spectrum_energies: np.ndarray    # Bin-Mitten bzw. exakte Energiewerte (bins=None)
+    spectrum_counts: np.ndarray      # Anzahl Zustände pro Bin / Energiewert
+    n_states: int
+    runtime: float
+    info: Dict = field(default_factory=dict)
+
+    def sample_dict(self, k: int = 0) -> Dict[int, int]:
+        return {i: int(v) for i, v in enumerate(self.ground_states[k])}
+
+
+def _bits_table(m: int) -> np.ndarray:
+    """(2^m, m) uint8: Zeile k = Binärdarstellung von k (Bit i -> Spalte i)."""
+    k = np.arange(1 << m, dtype=np.int64)
+    return ((k[:, None] >> np.arange(m)[None, :]) & 1).astype(np.uint8)
+
+
+def _energy_bounds(h: np.ndarray, J) -> Tuple[float, float]:
+    upper_vals = J.data / 2.0   # jede Kopplung steht in J zweimal
+    lb = h[h < 0].sum() + upper_vals[upper_vals < 0].sum()
+    ub = h[h > 0].sum() + upper_vals[upper_vals > 0].sum()
+    return float(lb), float(ub)
+
+
+def _enumerate_chunk(args):
+    """
+    Ein Prozess-Job: die obersten c Bits sind durch `prefix` fest, die mittleren Bits
+    werden in Gray-Code-Reihenfolge durchlaufen, die unteren m Bits als Block vektorisiert.
+    Ein Gray-Schritt (Flip von Variable g) ändert alle Block-Energien um
+        ΔE = (1 - 2 s_g) · (h_g + Σ_{j hoch} J_gj s_j + Σ_{j tief} J_gj bits_j)
+    also O(Grad(g)) Operationen pro Zustand.
+    """
+    (h, J, m, c, prefix, edges, tol, max_ground) = args
+    n = len(h)
+    H = n - m
+    mid = H - c
+    bits = _bits_table(m)
+    bits_f = bits.astype(np.float64)
+    Jl = J[:m][:, :m].toarray()
+    e_low = bits_f @ h[:m] + 0.5 * np.einsum("ij,ij->i", bits_f @ Jl, bits_f)
+
+    s_high = np.zeros(H)
+    for b in range(c):
+        s_high[mid + b] = (prefix >> b) & 1
+    Jhh = J[m:][:, m:]
+    Jlh = J[:m][:, m:]
+    E = e_low + (h[m:] @ s_high + 0.5 * s_high @ (Jhh @ s_high)) + bits_f @ (Jlh @ s_high)
+
+    # spaltenweise Nachbarn jeder hohen Variable im tiefen Block
+    Jc = J.tocsc()
+    low_nbrs = []
+    for g in range(m, n):
+        lo, hi = Jc.indptr[g], Jc.indptr[g + 1]
+        rows, vals = Jc.indices[lo:hi], Jc.data[lo:hi]
+        keep = rows < m
+        low_nbrs.append((rows[keep], vals[keep]))
+    Jhh = Jhh.tocsr()
+
+    best = np.inf
+    ground: List[np.ndarray] = []
+    n_ground = 0
+    exact = edges is None
+    spec: Dict[float, int] = {}
+    counts = None if exact else np.zeros(len(edges) - 1, dtype=np.int64)
+    inv_width = None if exact else (len(edges) - 1) / (edges[-1] - edges[0])
+
+    def _visit(E, s_high):
+        nonlocal best, n_ground, ground
+        if exact:
+            vals, cnt = np.unique(np.round(E, 9), return_counts=True)
+            for v, k in zip(vals.tolist(), cnt.tolist()):
+                spec[v] = spec.get(v, 0) + k
+        else:
+            idx = np.clip(((E - edges[0]) * inv_width).astype(np.int64), 0, len(counts) - 1)
+            counts[:] += np.bincount(idx, minlength=len(counts))
+        e_min = float(E.min())
+        if e_min < best - tol:
+            best = e_min
+            ground, n_ground = [], 0
+        if e_min <= best + tol:
+            hit = np.flatnonzero(E <= best + tol)
+            n_ground += len(hit)
+            room = max_ground - sum(len(g) for g in ground)
+            if room > 0:
+                hit = hit[:room]
+                states = np.empty((len(hit), n), dtype=np.int8)
+                states[:, :m] = bits[hit]
+                states[:, m:] = s_high[None, :]
+                ground.append(states)
+
+    _visit(E, s_high)
+    for step in range(1, 1 << mid):
+        i = (step & -step).bit_length() - 1        # Gray-Code: Bit, das sich ändert
+        g = m + i
+        delta = 1.0 - 2.0 * s_high[i]
+        lo, hi = Jhh.indptr[i], Jhh.indptr[i + 1]
+        f_high = float(Jhh.data[lo:hi] @ s_high[Jhh.indices[lo:hi]])
+        rows, vals = low_nbrs[i]
+        f_low = bits_f[:, rows] @ vals if len(rows) else 0.0
+        E = E + delta * (h[g] + f_high + f_low)
+        s_high[i] += delta
+        _visit(E, s_high)
+
+    ground_arr = np.concatenate(ground) if ground else np.empty((0, n), dtype=np.int8)
+    return best, ground_arr, n_ground, (spec if exact else counts)
+
+
+def solve_exact(
+    model,
+    num_workers: Optional[int] = None,
+    block_bits: int = 20,
+    bins: Optional[int] = 1000,
+    tol: float = 1e-9,
+    max_ground_states: int = 10000,
+) -> ExactResult:
+    """
+    Exakter Löser durch vollständige Enumeration (sinnvoll bis ca. 30–35 Variablen).
+
+    - die unteren block_bits Variablen werden als Block von 2^m Zuständen vektorisiert,
+    - die übrigen Bits im Gray-Code durchlaufen (inkrementelle O(Grad)-Updates),
+    - die obersten Bits werden als feste Präfixe auf Prozesse verteilt.
+
+    bins: Anzahl gleich breiter Bins des Energiespektrums zwischen unterer und oberer
+    Schranke; bins=None liefert das exakte Spektrum (auf 9 Nachkommastellen gerundet).
+    """
+    t0 = time.perf_counter()
+    h, J = split_qubo(model)
+    n = len(h)
+    if n > MAX_EXACT_VARIABLES:
+        raise ValueError(f"{n} Variablen – exakte Enumeration nur bis {MAX_EXACT_VARIABLES}.")
+    num_workers = num_workers or os.cpu_count() or 1
+    m = min(n, block_bits)
+    H = n - m
+    c = min(H, max(0, int(np.ceil(np.log2(num_workers * 4)))) if num_workers > 1 else 0)
+
+    if bins is None:
+        edges = None
+    else:
+        lb, ub = _energy_bounds(h, J)
+        edges = np.linspace(lb, ub if ub > lb else lb + 1.0, int(bins) + 1)
+
+    jobs = [(h, J, m, c, prefix, edges, tol, max_ground_states) for prefix in range(1 << c)]
+    if num_workers == 1 or len(jobs) == 1:
+        results = [_enumerate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            results = list(pool.map(_enumerate_chunk, jobs))
+
+    best = min(r[0] for r in results)
+    ground, n_ground = [], 0
+    for e, states, k, _ in results:
+        if e <= best + tol:
+            ground.append(states)
+            n_ground += k
+    ground_arr = np.concatenate(ground)[:max_ground_states] if ground else np.empty((0, n), dtype=np.int8)
+
+    if edges is None:
+        spec: Dict[float, int] = {}
+        for r in results:
+            for v, k in r[3].items():
+                spec[v] = spec.get(v, 0) + k
+        energies = np.array(sorted(spec))
+        counts = np.array([spec[v] for v in energies], dtype=np.int64)
+    else:
+        counts = np.sum([r[3] for r in results], axis=0)
+        energies = 0.5 * (edges[:-1] + edges[1:])
+
+    return ExactResult(
+        energy=best,
+        ground_states=ground_arr,
+        n_ground_states=n_ground,
+        spectrum_energies=energies,
+        spectrum_counts=counts,
+        n_states=1 << n,
+        runtime=time.perf_counter() - t0,
+        info={"block_bits": m, "prefix_bits": c, "jobs": len(jobs)},
+    )
@@ -0,0 +1,114 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from model.solvers.common import as_upper_csr
+
+
+def qubo_to_ising(model) -> Tuple[np.ndarray, "object", float]:
+    """
+    QUBO -> Ising mit x_i = (1 - z_i) / 2  (Bit 0 ↔ z = +1, wie |0⟩ bei Qiskit):
+
+        E(x) = Σ_i a_i x_i + Σ_{i<j} b_ij x_i x_j
+             = offset + Σ_i h_i z_i + Σ_{i<j} J_ij z_i z_j
+        h_i    = -a_i/2 - Σ_j b_ij/4      (j über alle Nachbarn von i)
+        J_ij   =  b_ij/4
+        offset =  Σ_i a_i/2 + Σ_{i<j} b_ij/4
+
+    model: QuboBuilder oder scipy.sparse-Matrix.  Rückgabe: (h, J, offset) mit J als
+    obere Dreiecks-CSR (Diagonale 0) – es wird keine dichte n×n-Matrix angelegt.
+    """
+    from scipy.sparse import csr_matrix
+    U = as_upper_csr(model).tocoo()
+    n = U.shape[0]
+    diag = U.row == U.col
+    a = np.zeros(n)
+    np.add.at(a, U.row[diag], U.data[diag])
+    r, c, b = U.row[~diag], U.col[~diag], U.data[~diag]
+
+    h = -0.5 * a
+    np.add.at(h, r, -0.25 * b)
+    np.add.at(h, c, -0.25 * b)
+    J = csr_matrix((0.25 * b, (r, c)), shape=(n, n))
+    J.sum_duplicates()
+    offset = 0.5 * float(a.sum()) + 0.25 * float(b.sum())
+    return h, J, offset
+
+
+def ising_energies(h: np.ndarray, J, offset: float, Z: np.ndarray) -> np.ndarray:
+    """E(z) = offset + h·z + Σ_{i<j} J_ij z_i z_j für alle Zeilen von Z (Einträge ±1)."""
+    Z = np.asarray(Z, dtype=np.float64)
+    if Z.ndim == 1:
+        Z = Z[None, :]
+    return offset + Z @ h + np.einsum("ij,ij->i", (J @ Z.T).T, Z)
+
+
+def _pauli_terms(h: np.ndarray, J, tol: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(i, j, coeff) aller Z- (j = -1) und ZZ-Terme mit |coeff| > tol."""
+    U = J.tocoo()
+    keep_h = np.flatnonzero(np.abs(h) > tol)
+    keep_j = np.abs(U.data) > tol
+    i = np.concatenate([U.row[keep_j], keep_h]).astype(np.int64)
+    j = np.concatenate([U.col[keep_j], np.full(len(keep_h), -1)]).astype(np.int64)
+    coeff = np.concatenate([U.data[keep_j], h[keep_h]])
+    return i, j, coeff
+
+
+def ising_to_sparse_list(h: np.ndarray, J, offset: float = 0.0, tol: float = 0.0) -> List[tuple]:
+    """
+    Terme im Format von SparsePauliOp.from_sparse_list: [("ZZ", [i, j], c), ("Z", [i], c), ...]
+    (Qubit i = Variable i); offset != 0 kommt als Identitätsterm ("", [], offset) dazu.
+    """
+    i, j, coeff = _pauli_terms(h, J, tol)
+    quad = j >= 0
+    out = [("ZZ", [a, b], c) for a, b, c in zip(i[quad].tolist(), j[quad].tolist(), coeff[quad].tolist())]
+    out += [("Z", [a], c) for a, c in zip(i[~quad].tolist(), coeff[~quad].tolist())]
+    if offset:
+        out.append(("", [], float(offset)))
+    return out
+
+
+def ising_to_pauli_list(h: np.ndarray, J, offset: float = 0.0, tol: float = 0.0) -> List[Tuple[str, float]]:
+    """
+    Volle Pauli-Strings wie SparsePauliOp.from_list: [("IIZIZ", c), ...] in Qiskit-Reihenfolge
+    (Qubit 0 ganz rechts).  Die Strings werden als (Terme × n)-Byte-Array in einem Schritt gebaut.
+    """
+    n = len(h)
+    i, j, coeff = _pauli_terms(h, J, tol)
+    chars = np.full((len(i), n), ord("I"), dtype=np.uint8)
+    rows = np.arange(len(i))
+    chars[rows, n - 1 - i] = ord("Z")
+    quad = j >= 0
+    chars[rows[quad], n - 1 - j[quad]] = ord("Z")
+    labels = chars.view(f"S{n}").ravel().astype(str) if n else np.full(len(i), "")
+    out = list(zip(labels.tolist(), coeff.tolist()))
+    if offset:
+        out.append(("I" * n, float(offset)))
+    return out
+
+
+def to_sparse_pauli_op(model, include_offset: bool = True, tol: float = 0.0):
+    """
+    Kosten-Hamiltonian als qiskit SparsePauliOp (optionale Abhängigkeit), direkt aus der
+    symplektischen Darstellung gebaut – ohne Strings und ohne dichte Matrix.
+    Rückgabe: (op, offset); ist include_offset=True, steckt offset bereits als I-Term in op.
+    """
+    try:
+        from qiskit.quantum_info import PauliList, SparsePauliOp
+    except ImportError as e:
+        raise ImportError("to_sparse_pauli_op benötigt qiskit (pip install qiskit).") from e
+    h, J, offset = qubo_to_ising(model)
+    n = len(h)
+    i, j, coeff = _pauli_terms(h, J, tol)
+    m = len(i) + (1 if include_offset else 0)
+    z = np.zeros((m, n), dtype=bool)
+    rows = np.arange(len(i))
+    z[rows, i] = True
+    quad = j >= 0
+    z[rows[quad], j[quad]] = True
+    if include_offset:
+        coeff = np.append(coeff, offset)
+    if not len(coeff):
+        return SparsePauliOp("I" * n, [0.0]), offset
+    op = SparsePauliOp(PauliList.from_symplectic(z, np.zeros_like(z)), coeff)
+    return op, offset
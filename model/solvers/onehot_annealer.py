@@ -0,0 +1,157 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model.solvers.annealer import SimulatedAnnealer
+from model.solvers.common import qubo_energies, split_qubo
+
+
+def _normalize_groups(groups: Sequence, n: int) -> List[np.ndarray]:
+    """Liste von 2D-Gruppen-Arrays (-1 = fehlt) -> Liste disjunkter 1D-Index-Arrays."""
+    out: List[np.ndarray] = []
+    seen = np.zeros(n, dtype=bool)
+    for G in groups:
+        G = np.asarray(G, dtype=np.int64)
+        if G.ndim == 1:
+            G = G[None, :]
+        for row in G:
+            row = row[row >= 0]
+            if not len(row):
+                continue
+            if seen[row].any():
+                raise ValueError("One-Hot-Gruppen müssen disjunkt sein.")
+            seen[row] = True
+            out.append(row)
+    return out
+
+
+def onehot_initial_states(groups: List[np.ndarray], n: int, num_reads: int, rng, initial_states=None) -> np.ndarray:
+    """
+    Startzustände auf der One-Hot-Mannigfaltigkeit: je Gruppe genau ein Bit.
+    Übergebene initial_states werden übernommen; Gruppen, die dort nicht one-hot
+    sind, werden zufällig neu gesetzt.
+    """
+    if initial_states is None:
+        s = rng.integers(0, 2, size=(num_reads, n)).astype(np.float64)
+    else:
+        s = np.array(initial_states, dtype=np.float64, copy=True).reshape(num_reads, n)
+    for g in groups:
+        bad = s[:, g].sum(axis=1) != 1
+        if bad.any():
+            idx = np.flatnonzero(bad)
+            s[np.ix_(idx, g)] = 0.0
+            s[idx, g[rng.integers(0, len(g), size=len(idx))]] = 1.0
+    return s
+
+
+def anneal_onehot_batch(
+    h: np.ndarray,
+    J,
+    groups: List[np.ndarray],
+    schedule: np.ndarray,
+    num_reads: int,
+    seed=None,
+    target_energy: Optional[float] = None,
+    initial_states: Optional[np.ndarray] = None,
+    stop=None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Simulated Annealing mit Swap-Moves innerhalb der One-Hot-Gruppen.
+
+    Pro Gruppe wird das gesetzte Bit i auf ein zufälliges anderes Mitglied j
+    verschoben:  ΔE = -(h_i + f_i) + (h_j + f_j) - J_ij.
+    Die Gruppen bleiben so in jedem Schritt exakt one-hot; nur die übrigen
+    Variablen (z.B. w) werden einzeln geflippt.  target_energy/stop wie in anneal_batch.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(h)
+    s = onehot_initial_states(groups, n, num_reads, rng, initial_states)
+    field = (J @ s.T).T
+    energy = s @ h + 0.5 * np.einsum("ij,ij->i", field, s)
+    indptr, indices, data = J.indptr, J.indices, J.data
+
+    in_group = np.zeros(n, dtype=bool)
+    for g in groups:
+        in_group[g] = True
+    free = np.flatnonzero(~in_group)
+    blocks = [J[g][:, g].toarray() for g in groups]
+    reads = np.arange(num_reads)
+
+    def _update_field(rows, var, d):
+        lo, hi = indptr[var], indptr[var + 1]
+        if hi > lo and len(rows):
+            field[rows[:, None], indices[None, lo:hi]] += d * data[None, lo:hi]
+
+    sweeps_run = 0
+    for beta in schedule:
+        # ---- Swap-Moves in den One-Hot-Gruppen --------------------
+        for g, Jg in zip(groups, blocks):
+            k = len(g)
+            if k < 2:
+                continue
+            cur = s[:, g].argmax(axis=1)
+            new = (cur + rng.integers(1, k, size=num_reads)) % k
+            i, j = g[cur], g[new]
+            dE = -(h[i] + field[reads, i]) + (h[j] + field[reads, j]) - Jg[cur, new]
+            accept = rng.random(num_reads) < np.exp(-beta * np.maximum(dE, 0.0))
+            idx = np.flatnonzero(accept)
+            if not len(idx):
+                continue
+            s[idx, i[idx]] = 0.0
+            s[idx, j[idx]] = 1.0
+            energy[idx] += dE[idx]
+            for pos in range(k):
+                _update_field(idx[cur[idx] == pos], g[pos], -1.0)
+                _update_field(idx[new[idx] == pos], g[pos], 1.0)
+
+        # ---- Einzel-Flips für alle übrigen Variablen --------------
+        for v in free:
+            delta = 1.0 - 2.0 * s[:, v]
+            dE = delta * (h[v] + field[:, v])
+            accept = rng.random(num_reads) < np.exp(-beta * np.maximum(dE, 0.0))
+            idx = np.flatnonzero(accept)
+            if not len(idx):
+                continue
+            d = delta[idx]
+            s[idx, v] += d
+            energy[idx] += dE[idx]
+            lo, hi = indptr[v], indptr[v + 1]
+            if hi > lo:
+                field[idx[:, None], indices[None, lo:hi]] += d[:, None] * data[None, lo:hi]
+
+        sweeps_run += 1
+        if target_energy is not None and energy.min() <= target_energy:
+            if stop is not None:
+                stop.set()
+            break
+        if stop is not None and stop.is_set():
+            break
+
+    energy = qubo_energies(h, J, s)
+    return s.astype(np.int8), energy, sweeps_run
+
+
+class OneHotAnnealer(SimulatedAnnealer):
+    """
+    Simulated Annealer, der die One-Hot-Gruppen (C1: y_{t,·}, C2: x_{t,·}) nie verlässt.
+
+        groups = [c1.startslot_groups(tasks, slots, y), c2.assignment_groups(tasks, robots, x)]
+        res = OneHotAnnealer(groups, num_workers=4).sample(qb, num_reads=1000, sweeps=500)
+
+    Auf der Mannigfaltigkeit sind die C1/C2-Strafterme konstant; angenähert werden nur
+    noch die übrigen Terme (C3-Kapazität, C5-Präzedenz, Makespan, ...). Das Modell darf
+    C1/C2 weiterhin enthalten – die Energien bleiben mit QuboBuilder.energies vergleichbar.
+    """
+
+    _kernel = staticmethod(anneal_onehot_batch)
+
+    def __init__(self, groups: Sequence, num_workers: Optional[int] = None):
+        super().__init__(num_workers)
+        self.groups = groups
+
+    def _split(self, model):
+        """Swap-Moves brauchen die volle Kopplungsmatrix: faktorisierte Quadrate expandieren."""
+        return split_qubo(model) + (None,)
+
+    def _job_args(self, h, J, schedule, num_reads, seed, target_energy, initial_states, squares=None) -> tuple:
+        return (h, J, _normalize_groups(self.groups, len(h)), schedule, num_reads, seed, target_energy, initial_states)
@@ -0,0 +1,261 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model.indexer import gather, uses_occupancy
+from model.solvers.annealer import AnnealResult, SimulatedAnnealer, default_beta_range
+from model.solvers.common import split_factored, split_qubo
+
+
+def schedule_assignment(schedule) -> Dict[str, Tuple[str, int]]:
+    """
+    Vorherigen Plan vereinheitlichen -> {task: (robot, start)}.
+    Akzeptiert das DataFrame aus decode_sample / ViolationReport.schedule (Spalten task,
+    robot, start; bei mehreren Reads zählt der erste) oder ein Dict {task: (robot, start)}.
+    Nicht dekodierbare Einträge (None) werden ausgelassen.
+    """
+    if hasattr(schedule, "itertuples"):
+        if "read" in schedule.columns:
+            schedule = schedule[schedule["read"] == schedule["read"].iloc[0]]
+        schedule = {row.task: (row.robot, row.start) for row in schedule.itertuples(index=False)}
+    return {
+        t: (r, int(z)) for t, (r, z) in schedule.items()
+        if r is not None and z is not None and z == z
+    }
+
+
+def map_schedule(
+    schedule,
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    x,
+    y,
+    w=None,
+    n: Optional[int] = None,
+    occupancy: Optional[bool] = None,
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Überträgt einen Plan auf ein (neues) Variablen-Layout: x_{t,r} = y_{t,z} = w_{t,r,z} = 1
+    für jede bekannte Task.  Tasks, die im Plan fehlen, deren Roboter/Slot es nicht mehr gibt
+    oder deren Startslot im neuen Layout nicht registriert ist, bleiben leer.
+    occupancy: w als Belegung (c3_) – dann w_{t,r,k} = 1 für alle belegten Slots
+    z <= k < z + p_t; None übernimmt es aus dem Layout von w.
+    Rückgabe: (Zustand (n,) int8, Liste der offenen Tasks).
+    """
+    plan = schedule_assignment(schedule)
+    names = [t["name"] for t in tasks]
+    X = gather(x, names, robots)
+    Y = gather(y, names, slots)
+    W = gather(w, names, robots, slots) if w is not None else None
+    if n is None:
+        n = int(max(X.max(), Y.max(), W.max() if W is not None else -1)) + 1
+    r_ord = {r: i for i, r in enumerate(robots)}
+    z_ord = {z: i for i, z in enumerate(slots)}
+    span = _w_span(tasks, slots, w, occupancy)
+
+    state = np.zeros(n, dtype=np.int8)
+    open_tasks = []
+    for t, name in enumerate(names):
+        r, z = plan.get(name, (None, None))
+        if r not in r_ord or z not in z_ord or Y[t, z_ord[z]] < 0:
+            open_tasks.append(name)
+            continue
+        ids = [X[t, r_ord[r]], Y[t, z_ord[z]]]
+        if W is not None:
+            k = z_ord[z]
+            ids += W[t, r_ord[r], k:k + span[t, k]].tolist()
+        state[[i for i in ids if i >= 0]] = 1
+    return state, open_tasks
+
+
+def _w_span(tasks, slots, w, occupancy: Optional[bool]) -> np.ndarray:
+    """
+    (T, Z): Anzahl der w-Slots (ab dem Startslot-Index), die ein Start setzt – 1 bei
+    Start-w, bei Belegungs-w die belegten Slots z <= k < z + p_t (Slots aufsteigend).
+    """
+    z = np.asarray(slots, dtype=np.int64)
+    if occupancy is None:
+        occupancy = uses_occupancy(w)
+    if not occupancy:
+        return np.ones((len(tasks), len(z)), dtype=np.int64)
+    p = np.array([int(t["p"]) for t in tasks], dtype=np.int64)
+    return np.searchsorted(z, z[None, :] + p[:, None], side="left") - np.arange(len(z))[None, :]
+
+
+def complete_greedy(
+    model,
+    state: np.ndarray,
+    open_tasks: List[str],
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    x,
+    y,
+    w=None,
+    occupancy: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    Setzt jede offene Task (in Reihenfolge) auf das (Roboter, Startslot)-Paar mit dem
+    kleinsten Energiezuwachs im QUBO – Kapazität, Präzedenz und Makespan gehen also
+    genau so ein wie beim Solver.  Pro Task ein vektorisierter Schritt über R·Z Kandidaten.
+    Ein Kandidat setzt x, y und w wie map_schedule (bei Belegungs-w alle belegten Slots);
+    Kandidaten, deren Variablen im Layout fehlen, scheiden aus.
+    """
+    h, J = split_qubo(model)
+    s = np.zeros(len(h))
+    s[:len(state)] = state
+    field = J @ s
+    t_ord = {t["name"]: i for i, t in enumerate(tasks)}
+    names = [t["name"] for t in tasks]
+    X = gather(x, names, robots)
+    Y = gather(y, names, slots)
+    W = gather(w, names, robots, slots) if w is not None else None
+    span = _w_span(tasks, slots, w, occupancy)
+    R, Z = len(robots), len(slots)
+
+    for name in open_tasks:
+        t = t_ord[name]
+        # Spalten je Kandidat (r, z); -2 = vom Kandidaten nicht benötigt, -1 = fehlt im Layout
+        cand = [np.broadcast_to(X[t][:, None], (R, Z)), np.broadcast_to(Y[t][None, :], (R, Z))]
+        if W is not None:
+            for d in range(int(span[t].max())):
+                k = np.arange(Z) + d
+                col = np.full((R, Z), -2, dtype=np.int64)
+                used = (d < span[t]) & (k < Z)
+                col[:, used] = W[t][:, k[used]]
+                cand.append(col)
+        valid = np.all([c != -1 for c in cand], axis=0)
+        if not valid.any():
+            continue
+        need = [valid & (c >= 0) for c in cand]
+        cand = [np.where(m, c, 0) for c, m in zip(cand, need)]
+        dE = sum(np.where(m, h[c] + field[c], 0.0) for c, m in zip(cand, need))
+        for a in range(len(cand)):
+            for b in range(a + 1, len(cand)):
+                both = need[a] & need[b]
+                pair = np.asarray(J[cand[a].ravel(), cand[b].ravel()]).reshape(valid.shape)
+                dE = dE + np.where(both, pair, 0.0)
+        dE = np.where(valid, dE, np.inf)
+        r, z = np.unravel_index(int(np.argmin(dE)), dE.shape)
+        for c, m in zip(cand, need):
+            i = int(c[r, z])
+            if m[r, z] and not s[i]:
+                s[i] = 1.0
+                field += J[:, i].toarray().ravel()
+    return s.astype(np.int8)
+
+
+def reverse_anneal_schedule(
+    beta_range: Tuple[float, float],
+    sweeps: int,
+    reheat: float = 0.3,
+    pause: float = 0.0,
+) -> np.ndarray:
+    """
+    β-Verlauf für "Reverse Annealing" mit Simulated Annealing: kalt starten (β_kalt),
+    geometrisch bis β_wende = β_kalt · (β_heiß/β_kalt)^reheat aufheizen, pause·sweeps
+    Sweeps halten, dann wieder auf β_kalt abkühlen.  reheat=0 bleibt kalt (reine lokale
+    Suche), reheat=1 heizt voll auf (entspricht einem Neustart).
+    β_wende und β_kalt (letzter Sweep) werden immer erreicht; die Pause wird dafür ggf.
+    gekürzt.
+    """
+    if not 0.0 <= reheat <= 1.0:
+        raise ValueError("reheat muss in [0, 1] liegen.")
+    if sweeps < 2:
+        raise ValueError("reverse_anneal_schedule braucht sweeps >= 2 (aufheizen und abkühlen).")
+    b_hot, b_cold = float(beta_range[0]), float(beta_range[1])
+    b_turn = b_cold * (b_hot / b_cold) ** reheat
+    n_pause = min(int(round(pause * sweeps)), sweeps - 2)
+    n_down = (sweeps - n_pause) // 2
+    n_up = sweeps - n_pause - n_down
+    return np.concatenate([
+        np.geomspace(b_cold, b_turn, n_down + 1)[1:],
+        np.full(n_pause, b_turn),
+        np.geomspace(b_turn, b_cold, n_up + 1)[1:],
+    ])
+
+
+def replan(
+    model,
+    previous,
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    x,
+    y,
+    w=None,
+    num_reads: int = 100,
+    sweeps: int = 200,
+    reheat: float = 0.3,
+    pause: float = 0.0,
+    beta_range: Optional[Tuple[float, float]] = None,
+    sampler: Optional[SimulatedAnnealer] = None,
+    seed=None,
+    occupancy: Optional[bool] = None,
+) -> AnnealResult:
+    """
+    Warmstart-Neuplanung: vorherigen Plan auf das neue Layout übertragen, neue Tasks
+    gierig einfügen und alle Reads von diesem Zustand aus mit reverse_anneal_schedule
+    laufen lassen (statt von Zufallszuständen mit vollem Abkühlplan).
+
+    previous: Plan wie in schedule_assignment; sampler: SimulatedAnnealer oder
+    OneHotAnnealer (Standard: SimulatedAnnealer()); occupancy wie in map_schedule.
+    info enthält zusätzlich "incumbent" (der Warmstart-Zustand), dessen Energie und die
+    Liste der neu eingefügten Tasks.
+    """
+    n = len(model.indexer) if hasattr(model, "indexer") else model.shape[0]
+    state, open_tasks = map_schedule(previous, tasks, robots, slots, x, y, w, n, occupancy)
+    state = complete_greedy(model, state, open_tasks, tasks, robots, slots, x, y, w, occupancy)
+    h, J, squares = split_factored(model)
+    if beta_range is None:
+        beta_range = default_beta_range(h, J, squares)
+    schedule = reverse_anneal_schedule(beta_range, sweeps, reheat, pause)
+
+    sampler = sampler or SimulatedAnnealer()
+    res = sampler.sample(
+        model,
+        num_reads=num_reads,
+        beta_schedule=schedule,
+        seed=seed,
+        initial_states=np.repeat(state[None, :], num_reads, axis=0),
+    )
+    s = np.zeros(len(h))
+    s[:len(state)] = state
+    energy = s @ h + 0.5 * s @ (J @ s) + (squares.energies(s[None, :])[0] if squares is not None else 0.0)
+    res.info.update({
+        "incumbent": state,
+        "incumbent_energy": float(energy),
+        "inserted_tasks": open_tasks,
+        "reheat": reheat,
+    })
+    return res
+
+
+def mip_start(state, prefix: str = "x") -> Dict[str, int]:
+    """
+    Zustand als {Variablenname: 0/1} für einen MIP-Start; Namen wie bei
+    QuadraticProgram.binary_var_list(n) (x0, x1, ...).
+    """
+    return {f"{prefix}{i}": int(v) for i, v in enumerate(np.asarray(state).tolist())}
+
+
+def add_mip_start(mdl, state, prefix: str = "x"):
+    """
+    Warmstart-Zustand als Inkumbente an ein docplex-Modell hängen (optionale Abhängigkeit).
+    Aus einem qiskit QuadraticProgram z.B. über
+        mdl = qiskit_optimization.translators.to_docplex_mp(qp)
+        add_mip_start(mdl, res.info["incumbent"]); mdl.solve()
+    Variablen, die im Modell fehlen, werden übersprungen.
+    """
+    try:
+        from docplex.mp.solution import SolveSolution
+    except ImportError as e:
+        raise ImportError("add_mip_start benötigt docplex (pip install docplex).") from e
+    values = {}
+    for name, v in mip_start(state, prefix).items():
+        var = mdl.get_var_by_name(name)
+        if var is not None:
+            values[var] = v
+    mdl.add_mip_start(SolveSolution(mdl, values))
+    return mdl
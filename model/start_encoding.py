@@ -0,0 +1,350 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model.analyzer.qubo_builder_helper import create_component_qubo, prepare_layout
+from model.constraints import c2, c3
+from model.indexer import Indexer, gather
+from model.qubo_builder import SparseQuboBuilder, bounded_coefficients
+
+ENCODINGS = ("one_hot", "domain_wall", "binary")
+
+
+def n_register_bits(encoding: str, K: int) -> int:
+    """Qubits für ein Startslot-Register mit K möglichen Werten."""
+    if encoding == "one_hot":
+        return K
+    if encoding == "domain_wall":
+        return max(K - 1, 0)
+    if encoding == "binary":
+        return len(bounded_coefficients(K - 1))
+    raise ValueError(f"Unbekannte Kodierung: {encoding!r} (erlaubt: {ENCODINGS})")
+
+
+def indicator_map(encoding: str, K: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Slot-Indikatoren als affine Funktion der Registerbits: y = A·b + c  (A: (K, bits)).
+        one_hot       y_k = b_k
+        domain_wall   y_0 = 1 - d_1,  y_k = d_k - d_{k+1},  y_{K-1} = d_{K-1}
+    (gültige Domain-Wall-Belegungen: 1…10…0, Position der Wand = Startslot).
+    Binär ist nicht affin – ValueError.
+    """
+    if encoding == "one_hot":
+        return np.eye(K), np.zeros(K)
+    if encoding == "domain_wall":
+        A = np.zeros((K, max(K - 1, 0)))
+        c = np.zeros(K)
+        c[0] = 1.0
+        if K > 1:
+            A[0, 0] = -1.0
+            A[np.arange(1, K), np.arange(K - 1)] = 1.0
+            A[np.arange(1, K - 1), np.arange(1, K - 1)] = -1.0
+        return A, c
+    raise ValueError(f"Kodierung {encoding!r} hat keine affinen Slot-Indikatoren.")
+
+
+def decode_register(encoding: str, bits: np.ndarray, K: int) -> np.ndarray:
+    """(n, bits) Registerbelegungen -> Slot-Ordinal 0..K-1, -1 bei ungültiger Belegung."""
+    B = np.asarray(bits, dtype=np.int64)
+    if encoding == "one_hot":
+        return np.where(B.sum(axis=1) == 1, B.argmax(axis=1), -1)
+    if encoding == "domain_wall":
+        if K == 1:
+            return np.zeros(len(B), dtype=np.int64)
+        monotone = (np.diff(B, axis=1) <= 0).all(axis=1)
+        return np.where(monotone, B.sum(axis=1), -1)
+    if encoding == "binary":
+        k = B @ bounded_coefficients(K - 1)
+        return np.where(k < K, k, -1)
+    raise ValueError(f"Unbekannte Kodierung: {encoding!r} (erlaubt: {ENCODINGS})")
+
+
+def substitute_affine(
+    rows, cols, vals, M, c, square=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Setzt u = M·n + c in E(u) = Σ_i Q_ii u_i + Σ_{i<j} Q_ij u_i u_j ein (M: scipy.sparse
+    (n_alt, n_neu)).  Quadratisch bleibt quadratisch, n_a² = n_a wird linear.
+
+    square (bool je alter Variable): dort wird ein positives Q_ii als Q_ii·u_i² eingesetzt
+    (gleich auf u ∈ {0, 1}, aber nie kleiner) – so kann ein ungültiges Register mit
+    u = -1 die Diagonalterme nicht ausnutzen.
+    Rückgabe: (rows, cols, vals, const) mit E(M·n + c) = Σ ... + const.
+    """
+    from scipy.sparse import csr_matrix, diags
+    rows, cols, vals = np.asarray(rows), np.asarray(cols), np.asarray(vals)
+    n_old = M.shape[0]
+    diag = rows == cols
+    L = np.zeros(n_old)
+    np.add.at(L, rows[diag], vals[diag])
+    D = np.zeros(n_old)
+    if square is not None:
+        sq = np.asarray(square, dtype=bool) & (L > 0)
+        D[sq], L[sq] = L[sq], 0.0
+    U = csr_matrix((vals[~diag], (rows[~diag], cols[~diag])), shape=(n_old, n_old)) + diags(D)
+
+    P = (M.T @ U @ M).tocoo()
+    lin = M.T @ L + M.T @ (U @ c) + M.T @ (U.T @ c)
+    on = P.row == P.col
+    np.add.at(lin, P.row[on], P.data[on])
+    const = float(L @ c + c @ (U @ c))
+    idx = np.flatnonzero(lin)
+    out_r = np.concatenate([idx, np.minimum(P.row[~on], P.col[~on])])
+    out_c = np.concatenate([idx, np.maximum(P.row[~on], P.col[~on])])
+    out_v = np.concatenate([lin[idx], P.data[~on]])
+    return out_r, out_c, out_v, const
+
+
+class EncodedLayout:
+    """
+    Variablen eines Modells mit kodiertem Startslot-Register.
+
+    indexer    Indexer mit Schlüsseln ("x", t, r), ("s", t, j) (Registerbit j) und
+               ("w", t, r, z) bzw. ("slack", a, b, j) für binäre Präzedenz-Slacks
+    starts     pro Task die möglichen Startslots (Ordinal k des Registers -> Slotwert)
+    bits       pro Task die Indizes der Registerbits
+    offsets    Konstante je Term-Gruppe ("rest" = außerhalb aller Gruppen), die beim
+               Einsetzen bzw. bei faktorisierten Quadraten wegfällt: qb.energies(S) +
+               offset(weights) ist bei one_hot/domain_wall auf gültigen Registern die
+               Energie des x/y/w-Modells, bei binary enthält sie die vollen Quadrate
+    """
+
+    def __init__(self, encoding: str, tasks: List[dict], robots: Sequence[str], starts: Dict[str, List[int]]):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unbekannte Kodierung: {encoding!r} (erlaubt: {ENCODINGS})")
+        self.encoding = encoding
+        self.task_names = [t["name"] for t in tasks]
+        self.robots = list(robots)
+        self.starts = starts
+        self.indexer = Indexer()
+        self.x: Dict[Tuple[str, str], int] = {}
+        self.w: Dict[Tuple[str, str, int], int] = {}
+        self.bits: Dict[str, np.ndarray] = {}
+        self.offsets: Dict[str, float] = {}
+        for name in self.task_names:
+            for r in self.robots:
+                self.x[(name, r)] = self.indexer.get(("x", name, r))
+            nb = n_register_bits(encoding, len(starts[name]))
+            self.bits[name] = np.array([self.indexer.get(("s", name, j)) for j in range(nb)], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.indexer)
+
+    def n_register_qubits(self) -> int:
+        return int(sum(len(b) for b in self.bits.values()))
+
+    def variable_counts(self) -> Dict[str, int]:
+        """Variablen je Art (x, Register, w, Slack) und gesamt."""
+        counts = {"x": len(self.x), "register": self.n_register_qubits(), "w": len(self.w)}
+        counts["slack"] = len(self) - sum(counts.values())
+        counts["total"] = len(self)
+        return counts
+
+    def offset(self, weights: Optional[Dict[str, float]] = None) -> float:
+        """Σ_g weights[g] · offsets[g] (fehlende Gruppen und "rest" mit Gewicht 1)."""
+        weights = weights or {}
+        return float(sum(float(weights.get(g, 1.0)) * v for g, v in self.offsets.items()))
+
+    def decode_starts(self, samples) -> np.ndarray:
+        """(n, len) Samples -> (n, T) Startslot-Werte, -1 bei ungültigem Register."""
+        S = np.asarray(samples)
+        if S.ndim == 1:
+            S = S[None, :]
+        out = np.full((S.shape[0], len(self.task_names)), -1, dtype=np.int64)
+        for t, name in enumerate(self.task_names):
+            z = np.asarray(self.starts[name], dtype=np.int64)
+            k = decode_register(self.encoding, S[:, self.bits[name]], len(z))
+            out[:, t] = np.where(k >= 0, z[np.maximum(k, 0)], -1)
+        return out
+
+    def to_xyw(self, samples, x, y, w=None, n: Optional[int] = None) -> np.ndarray:
+        """
+        Samples in das x/y/w-Layout übersetzen (für check_samples/decode_sample):
+        x und w werden kopiert, y_{t,z} = 1 für den dekodierten Startslot.
+        """
+        S = np.asarray(samples)
+        if S.ndim == 1:
+            S = S[None, :]
+        slots = sorted({z for zs in self.starts.values() for z in zs})
+        X = gather(x, self.task_names, self.robots)
+        Y = gather(y, self.task_names, slots)
+        W = gather(w, self.task_names, self.robots, slots) if w is not None else None
+        if n is None:
+            n = int(max(X.max(), Y.max(), W.max() if W is not None else -1)) + 1
+        out = np.zeros((S.shape[0], n), dtype=np.int8)
+        Xn = gather(self.x, self.task_names, self.robots)
+        keep = X >= 0
+        out[:, X[keep]] = S[:, Xn[keep]]
+        if W is not None and self.w:
+            Wn = gather(self.w, self.task_names, self.robots, slots)
+            keep = (W >= 0) & (Wn >= 0)
+            out[:, W[keep]] = S[:, Wn[keep]]
+        z_pos = {z: k for k, z in enumerate(slots)}
+        start = self.decode_starts(S)
+        for t in range(len(self.task_names)):
+            for z in np.unique(start[:, t]).tolist():
+                if z >= 0 and Y[t, z_pos[z]] >= 0:
+                    out[start[:, t] == z, Y[t, z_pos[z]]] = 1
+        return out
+
+
+def _feasible_starts(layout, tasks, slots) -> Dict[str, List[int]]:
+    Y = layout.y.tensor([t["name"] for t in tasks], slots)
+    return {t["name"]: [z for z, i in zip(slots, Y[k]) if i >= 0] for k, t in enumerate(tasks)}
+
+
+def create_encoded_qubo(
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    encoding: str = "domain_wall",
+    c3_func: Callable = c3.add_c3_capacity_no_overlap_inline,
+    propagate_precedence: bool = False,
+    relax_capacity: bool = False,
+):
+    """
+    Komponenten-QUBO mit kodiertem Startslot-Register (Gewicht 1 je Gruppe, dann
+    qb.reweighted({...}) wie bei create_component_qubo).  Startslots sind immer
+    window_aware (z + p_t <= H, ggf. Präzedenzfenster).
+
+    one_hot / domain_wall: das window_aware x/y/w-Modell wird gebaut und jedes y über
+    y = A·b + c (indicator_map) durch die Registerbits ersetzt – alle Gruppen (c1–c5,
+    Makespan) bleiben erhalten.  Bei domain_wall gilt Σ_k y_k = 1 per Konstruktion: c1
+    bleibt leer, c4 wird zu (Σ_r x_{t,r} - 1)².  Die neue Gruppe "start" hält das
+    Register gültig:
+        λ Σ_k d_{k+1} (1 - d_k)      (nur Kettenkoppler, K-1 Qubits statt K)
+    Ungültige Wände erzeugen y = -1; λ_start muss die Kopplungen der übrigen Gruppen an
+    y dominieren (deutlich größer als die anderen Strafgewichte wählen).  Deshalb steht
+    "start" in qb.required_groups: reweighted() ohne "start"-Gewicht wirft KeyError.
+    Die w-Variablen (R·Z je Task) bleiben unverändert und machen den Großteil des Modells
+    aus – layout.variable_counts() zeigt die Gesamtzahl, nicht nur die Register-Qubits.
+    binary (nur mit relax_capacity=True): Startwert z_t = lo_t + Σ_j c_j b_j
+    (bounded_coefficients, ⌈log₂K⌉ Qubits, jede Belegung gültig).  Slot-Indikatoren sind hier nicht quadratisch darstellbar,
+    deshalb nur die Gruppen
+        c2         Robot-One-Hot (x wie bisher)
+        c5         λ (z_b - z_a - p_a - s_ab)², Slack s_ab ∈ [0, hi_b - lo_a - p_a] binär
+        makespan   (z_t + p_t)² als quadratische Form im Register
+    Die Roboter-Kapazität (c3) braucht Slot-Indikatoren und fehlt bei binary – der
+    Grundzustand darf alle Tasks gleichzeitig auf einem Roboter starten.  Das Modell ist
+    also eine Relaxierung und muss mit relax_capacity=True ausdrücklich angefordert
+    werden.  c5 und makespan liegen als faktorisierte Quadrate vor (qb.add_squared_linear).
+
+    Die beim Einsetzen bzw. Faktorisieren wegfallenden Konstanten stehen in
+    layout.offsets (siehe EncodedLayout.offset).
+
+    Rückgabe: (qb, layout: EncodedLayout).
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unbekannte Kodierung: {encoding!r} (erlaubt: {ENCODINGS})")
+    if encoding == "binary":
+        if not relax_capacity:
+            raise ValueError(
+                "binary hat keine Roboter-Kapazität (c3) – nur als Relaxierung mit relax_capacity=True."
+            )
+        return _create_binary_qubo(tasks, robots, slots, precedence, propagate_precedence)
+    from scipy.sparse import csr_matrix
+
+    base, x, y, w = create_component_qubo(
+        tasks, robots, slots, precedence, c3_func, window_aware=True, propagate_precedence=propagate_precedence
+    )
+    starts = _feasible_starts(base.indexer, tasks, slots)
+    enc = EncodedLayout(encoding, tasks, robots, starts)
+    for (name, r, z), _ in sorted(w.items(), key=lambda kv: kv[1]):
+        enc.w[(name, r, z)] = enc.indexer.get(("w", name, r, z))
+
+    # Abbildung alte Variable -> Kombination neuer Variablen
+    n_old, n_new = len(base.indexer), len(enc)
+    m_rows, m_cols, m_vals = [], [], []
+    c = np.zeros(n_old)
+    for mapping, new in ((x, enc.x), (w, enc.w)):
+        for key, i in mapping.items():
+            m_rows.append(i)
+            m_cols.append(new[key])
+            m_vals.append(1.0)
+    for name in enc.task_names:
+        A, c_t = indicator_map(encoding, len(starts[name]))
+        old = np.array([y[(name, z)] for z in starts[name]], dtype=np.int64)
+        c[old] = c_t
+        k, j = np.nonzero(A)
+        m_rows += old[k].tolist()
+        m_cols += enc.bits[name][j].tolist()
+        m_vals += A[k, j].tolist()
+    M = csr_matrix((m_vals, (m_rows, m_cols)), shape=(n_old, n_new))
+
+    square = np.zeros(n_old, dtype=bool)
+    square[[i for i in y.values()]] = True
+
+    qb = SparseQuboBuilder(enc.indexer)
+    rows, cols, names, V = base.component_basis()
+    r, cc, v, enc.offsets["rest"] = substitute_affine(rows, cols, V[0], M, c, square)
+    qb.add_terms(r, cc, v)
+    dw = encoding == "domain_wall"
+    for g, name in enumerate(names, start=1):
+        with qb.term_group(name):
+            if dw and name == "c1":
+                # Σ_k y_k = 1: Σ_t ((Σy - 1)² - 1) ist auf gültigen Registern konstant -T
+                enc.offsets[name] = -float(len(enc.task_names))
+                continue
+            if dw and name == "c4":
+                # (Σx - Σy)² = (Σx - 1)², one_hot_many lässt die +1 je Task weg
+                X = gather(enc.x, enc.task_names, enc.robots)
+                qb.one_hot_many(X, 1.0)
+                enc.offsets[name] = float(len(enc.task_names))
+                continue
+            r, cc, v, enc.offsets[name] = substitute_affine(rows, cols, V[g], M, c, square)
+            qb.add_terms(r, cc, v)
+    if dw:
+        qb.required_groups.add("start")
+    with qb.term_group("start"):
+        if dw:
+            for bits in enc.bits.values():
+                if len(bits) > 1:
+                    qb.add_terms(bits[1:], bits[1:], 1.0)
+                    qb.add_terms(bits[:-1], bits[1:], -1.0)
+    return qb, enc
+
+
+def _create_binary_qubo(tasks, robots, slots, precedence, propagate_precedence):
+    layout, _, _, _, precedence, _ = prepare_layout(
+        tasks, robots, slots, precedence, True, propagate_precedence
+    )
+    starts = _feasible_starts(layout, tasks, slots)
+    for name, zs in starts.items():
+        if not zs:
+            raise ValueError(f"Task {name} hat keinen zulässigen Startslot.")
+        if zs != list(range(zs[0], zs[-1] + 1)):
+            raise ValueError(f"binary braucht zusammenhängende Startslots (Task {name}: {zs}).")
+    enc = EncodedLayout("binary", tasks, robots, starts)
+    p = {t["name"]: int(t["p"]) for t in tasks}
+    coef = {n: bounded_coefficients(len(zs) - 1) for n, zs in starts.items()}
+    lo = {n: zs[0] for n, zs in starts.items()}
+    hi = {n: zs[-1] for n, zs in starts.items()}
+
+    # Slack-Bits je Präzedenzkante zuerst registrieren (feste Nummerierung)
+    slack = {}
+    for a, b in precedence or []:
+        s_max = hi[b] - lo[a] - p[a]
+        if s_max < 0:
+            raise ValueError(f"Präzedenz ({a}, {b}) ist im Horizont nicht erfüllbar.")
+        s_coef = bounded_coefficients(s_max)
+        s_idx = np.array([enc.indexer.get(("slack", a, b, j)) for j in range(len(s_coef))], dtype=np.int64)
+        slack[(a, b)] = (s_idx, s_coef)
+
+    qb = SparseQuboBuilder(enc.indexer)
+    with qb.term_group("c2"):
+        c2.add_assignment_exactly_one_constraints(qb, tasks, robots, enc.x, 1.0)
+    # Konstanten der faktorisierten Quadrate (weight · offset²) als Offsets
+    enc.offsets["c5"] = 0.0
+    with qb.term_group("c5"):
+        for (a, b), (s_idx, s_coef) in slack.items():
+            # z_b - z_a - p_a - s = 0
+            idx = np.concatenate([enc.bits[b], enc.bits[a], s_idx])
+            a_i = np.concatenate([coef[b], -coef[a], -s_coef]).astype(np.float64)
+            qb.add_squared_linear(idx, a_i, float(lo[b] - lo[a] - p[a]), 1.0)
+            enc.offsets["c5"] += float(lo[b] - lo[a] - p[a]) ** 2
+    with qb.term_group("makespan"):
+        for name in enc.task_names:
+            qb.add_squared_linear(enc.bits[name], coef[name].astype(np.float64), float(lo[name] + p[name]), 1.0)
+    enc.offsets["makespan"] = float(sum((lo[n] + p[n]) ** 2 for n in enc.task_names))
+    return qb, enc
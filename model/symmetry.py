@@ -0,0 +1,68 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from model.indexer import Indexer, gather
+from model.qubo_builder import bounded_coefficients
+
+SYMMETRY_MODES = ("first_task", "load")
+
+
+def first_task_mask(tasks: List[dict], robots: Sequence[str]) -> np.ndarray:
+    """
+    (T, R)-Maske für identische Roboter: die k-te Task (Listenreihenfolge, ab 0) darf nur
+    auf R_1 … R_{k+1}, die erste Task also nur auf R_1.
+
+    Exakt: nummeriert man die Roboter eines beliebigen Plans in der Reihenfolge ihrer
+    ersten Task um, liegt Task k auf einem der ersten k+1 Roboter – jede Lösung behält
+    mindestens einen Vertreter.  Entfernt Σ_k max(R-1-k, 0) x-Variablen samt ihrer w.
+    """
+    return np.arange(len(robots))[None, :] <= np.arange(len(tasks))[:, None]
+
+
+class AuxIndexer:
+    """
+    Indexer-Hülle um ein Layout: Schlüssel der Arten in kinds (z.B. Slack-Bits) werden
+    hinter den Variablen des Layouts angehängt, alle anderen gehen an das Layout.
+    """
+
+    def __init__(self, base, kinds: Tuple[str, ...] = ("slack_load",)):
+        self.base = base
+        self.kinds = tuple(kinds)
+        self._extra = Indexer()
+
+    def get(self, key: Tuple) -> int:
+        if key[0] in self.kinds:
+            return len(self.base) + self._extra.get(key)
+        return self.base.get(key)
+
+    def reverse(self, i: int) -> Tuple:
+        n = len(self.base)
+        return self.base.reverse(i) if i < n else self._extra.reverse(i - n)
+
+    def __len__(self):
+        return len(self.base) + len(self._extra)
+
+
+def add_load_ordering(qb, tasks: List[dict], robots: Sequence[str], x, lam: float):
+    """
+    Lasten nicht-steigend, L_r >= L_{r+1} mit L_r = Σ_t p_t x_{t,r}:
+        λ Σ_r (L_r - L_{r+1} - s_r)²,   s_r = Σ_j c_j b_{r,j} ∈ [0, Σ_t p_t]
+    (bounded_coefficients, ⌈log₂(Σp + 1)⌉ Slack-Bits je Roboterpaar, als faktorisierte
+    Quadrate).  Die Slack-Bits ("slack_load", r, j) registriert qb.indexer – dafür das
+    Layout in einen AuxIndexer hüllen.  Exakt wie first_task_mask (Roboter nach Last
+    sortieren), aber nicht mit ihr kombinierbar: die erste Task muss nicht auf dem
+    Roboter mit der größten Last liegen.
+    """
+    if not lam or len(robots) < 2:
+        return qb
+    p = np.array([float(t["p"]) for t in tasks])
+    X = gather(x, [t["name"] for t in tasks], robots)                  # (T, R)
+    coef = bounded_coefficients(int(p.sum())).astype(np.float64)
+    for r in range(len(robots) - 1):
+        bits = [qb.indexer.get(("slack_load", robots[r], j)) for j in range(len(coef))]
+        a, b = X[:, r], X[:, r + 1]
+        idx = np.concatenate([a[a >= 0], b[b >= 0], bits])
+        val = np.concatenate([p[a >= 0], -p[b >= 0], -coef])
+        qb.add_squared_linear(idx, val, 0.0, lam)
+    return qb
@@ -0,0 +1,249 @@
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model.indexer import feasible_start_mask
+from model.precedence import analyze_precedence
+from model.qubo_builder import SparseQuboBuilder
+from model.symmetry import first_task_mask
+
+
+class TripleLayout:
+    """
+    Eine Variable v_{t,r,z} pro zulässigem Tripel (Task, Roboter, Startslot) – ersetzt
+    x_{t,r}, y_{t,z} und w_{t,r,z} samt AND-Verknüpfung.  Zulässig heißt z + p_t <= H
+    und (falls windows gegeben) z im Startfenster der Task.
+
+    Nummerierung task-major wie beim VariableLayout: für jede Task alle (r, z) mit
+    gültigem z, Roboter außen.  index[t, r, z] ist -1 für unzulässige Tripel.
+    robot_mask: (T, R)-Maske erlaubter Task-Roboter-Paare (z.B. first_task_mask).
+    """
+
+    def __init__(
+        self,
+        robots: Sequence[str],
+        slots: Sequence[int],
+        tasks: List[dict],
+        windows: Optional[Dict[str, Tuple[int, int]]] = None,
+        robot_mask: Optional[np.ndarray] = None,
+    ):
+        self.robots = list(robots)
+        self.slots = list(slots)
+        self.task_names = [t["name"] for t in tasks]
+        self.durations = np.array([int(t["p"]) for t in tasks], dtype=np.int64)
+        self._t = {name: i for i, name in enumerate(self.task_names)}
+        self._r = {r: i for i, r in enumerate(self.robots)}
+        self._z = {z: i for i, z in enumerate(self.slots)}
+        T, R, Z = len(self.task_names), len(self.robots), len(self.slots)
+
+        ok = np.broadcast_to(feasible_start_mask(slots, tasks, windows)[:, None, :], (T, R, Z))
+        if robot_mask is not None:
+            ok = ok & np.asarray(robot_mask, dtype=bool)[:, :, None]
+        self.index = np.full((T, R, Z), -1, dtype=np.int64)
+        self.index[ok] = np.arange(int(ok.sum()))
+        # pro Variable: Ordinal von Task, Roboter, Slot
+        self.task, self.robot, self.slot = (a.astype(np.int64) for a in np.nonzero(ok))
+
+    def get(self, key: Tuple) -> int:
+        if key[0] != "v":
+            raise KeyError(key)
+        idx = self.index[self._t[key[1]], self._r[key[2]], self._z[key[3]]]
+        if idx < 0:
+            raise KeyError(key)
+        return int(idx)
+
+    def reverse(self, i: int) -> Tuple:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return ("v", self.task_names[self.task[i]], self.robots[self.robot[i]], self.slots[self.slot[i]])
+
+    def __len__(self):
+        return len(self.task)
+
+    @property
+    def v(self) -> "TripleView":
+        return TripleView(self)
+
+    # ---- Dekodierung -------------------------------------------------
+    def decode(self, samples) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (n, len) Samples -> (robot, start), je (n, T): Roboter-Ordinal und Startslot-Wert
+        der gesetzten Variable; -1, wenn die Task nicht genau eine gesetzte Variable hat.
+        """
+        S = np.asarray(samples)
+        if S.ndim == 1:
+            S = S[None, :]
+        S = S.astype(np.int64, copy=False)
+        T = len(self.task_names)
+        count = np.zeros((S.shape[0], T), dtype=np.int64)
+        np.add.at(count.T, self.task, S.T)
+        # bei genau einer Eins liefert die gewichtete Summe deren Position
+        pos = np.zeros_like(count)
+        np.add.at(pos.T, self.task, (S * np.arange(len(self))[None, :]).T)
+        one = count == 1
+        pos = np.where(one, pos, 0)
+        z_vals = np.asarray(self.slots, dtype=np.int64)
+        robot = np.where(one, self.robot[pos], -1)
+        start = np.where(one, z_vals[self.slot[pos]], -1)
+        return robot, start
+
+    def to_xyw(self, samples, x, y, w=None, n: Optional[int] = None) -> np.ndarray:
+        """
+        Übersetzt Samples in das x/y/w-Layout (z.B. für check_samples/decode_sample):
+        x_{t,r} = Σ_z v, y_{t,z} = Σ_r v, w_{t,r,z} = v.
+        """
+        from model.indexer import gather
+        S = np.asarray(samples)
+        if S.ndim == 1:
+            S = S[None, :]
+        X = gather(x, self.task_names, self.robots)
+        Y = gather(y, self.task_names, self.slots)
+        W = gather(w, self.task_names, self.robots, self.slots) if w is not None else None
+        if n is None:
+            n = int(max(X.max(), Y.max(), W.max() if W is not None else -1)) + 1
+        out = np.zeros((S.shape[0], n), dtype=np.int8)
+        for i, (t, r, z) in enumerate(zip(self.task.tolist(), self.robot.tolist(), self.slot.tolist())):
+            on = S[:, i].astype(bool)
+            for idx in (X[t, r], Y[t, z], W[t, r, z] if W is not None else -1):
+                if idx >= 0:
+                    out[on, idx] = 1
+        return out
+
+
+class TripleView(Mapping):
+    """Dict-artige Sicht (tname, r, z) -> idx auf ein TripleLayout (nur zulässige Tripel)."""
+
+    def __init__(self, layout: TripleLayout):
+        self.layout = layout
+
+    def __getitem__(self, key: Tuple) -> int:
+        return self.layout.get(("v",) + tuple(key))
+
+    def __iter__(self):
+        L = self.layout
+        return (
+            (L.task_names[t], L.robots[r], L.slots[z])
+            for t, r, z in zip(L.task.tolist(), L.robot.tolist(), L.slot.tolist())
+        )
+
+    def __len__(self):
+        return len(self.layout)
+
+
+def add_assignment_one_hot(qb: SparseQuboBuilder, layout: TripleLayout, lam: float):
+    """
+    Genau ein Tripel pro Task:  Σ_t (Σ_{r,z} v_{t,r,z} - 1)²
+    (ersetzt C1, C2, C4 und die AND-Verknüpfung von C3).
+    """
+    T = len(layout.task_names)
+    qb.one_hot_many(layout.index.reshape(T, -1), lam)
+    return qb
+
+
+def add_robot_no_overlap(qb: SparseQuboBuilder, layout: TripleLayout, lam: float, mode: str = "interval"):
+    """
+    Kein Überlapp auf demselben Roboter:  λ · v_{t,r,z} · v_{u,r,z'}  für t < u, wenn sich
+    [z, z + p_t) und [z', z' + p_u) schneiden.  Reine Paarstrafen, keine Hilfsvariablen.
+
+    mode="start" bestraft nur gleiche Startslots (z = z') – dieselbe Semantik wie die
+    Kapazitätsgruppe c3_cap des x/y/w-Modells und deutlich weniger Koppler.
+    """
+    if not lam:
+        return qb
+    if mode not in ("interval", "start"):
+        raise ValueError(f"Unbekannter mode: {mode!r}")
+    z = np.asarray(layout.slots)
+    p = layout.durations
+    T = len(p)
+    rows, cols = [], []
+    for t in range(T):
+        for u in range(t + 1, T):
+            if mode == "start":
+                za = zb = np.arange(len(z))
+            else:
+                za, zb = np.nonzero((z[None, :] < z[:, None] + p[t]) & (z[:, None] < z[None, :] + p[u]))
+            a = layout.index[t][:, za].ravel()            # (R · Paare)
+            b = layout.index[u][:, zb].ravel()
+            keep = (a >= 0) & (b >= 0)
+            rows.append(a[keep])
+            cols.append(b[keep])
+    if rows:
+        qb.add_terms(np.concatenate(rows), np.concatenate(cols), float(lam))
+    return qb
+
+
+def add_precedence(
+    qb: SparseQuboBuilder,
+    layout: TripleLayout,
+    precedence: Sequence[Tuple[str, str]],
+    lam: float,
+):
+    """
+    C5 auf Tripeln:  λ · v_{a,r,z_a} · v_{b,r',z_b}  für z_b < z_a + p_a, alle r, r'.
+    """
+    if not lam or not precedence:
+        return qb
+    z = np.asarray(layout.slots)
+    for a, b in precedence:
+        ia, ib = layout._t[a], layout._t[b]
+        za, zb = np.nonzero(z[None, :] < z[:, None] + layout.durations[ia])
+        A = layout.index[ia][:, za]                           # (R, Paare)
+        B = layout.index[ib][:, zb]
+        rows = np.broadcast_to(A[:, None, :], (A.shape[0], B.shape[0], A.shape[1])).ravel()
+        cols = np.broadcast_to(B[None, :, :], (A.shape[0], B.shape[0], B.shape[1])).ravel()
+        keep = (rows >= 0) & (cols >= 0)
+        qb.add_terms(rows[keep], cols[keep], float(lam))
+    return qb
+
+
+def add_makespan(qb: SparseQuboBuilder, layout: TripleLayout, w_makespan: float):
+    """Makespan-Objective wie add_makespan_objective: (z + p_t)² · v_{t,r,z}."""
+    if not w_makespan or not len(layout):
+        return qb
+    completion = np.asarray(layout.slots)[layout.slot] + layout.durations[layout.task]
+    idx = np.arange(len(layout))
+    qb.add_terms(idx, idx, w_makespan * completion ** 2)
+    return qb
+
+
+def create_triple_qubo(
+    tasks: List[dict],
+    robots: List[str],
+    slots: List[int],
+    precedence: Optional[List[Tuple[str, str]]] = None,
+    propagate_precedence: bool = False,
+    overlap: str = "interval",
+    symmetry: Optional[str] = None,
+):
+    """
+    Komponenten-QUBO der Tripel-Formulierung (jede Gruppe mit Gewicht 1, dann
+    qb.reweighted({...}) wie bei create_component_qubo):
+        assign     genau ein Tripel pro Task
+        overlap    kein Überlapp auf einem Roboter (über die ganze Dauer bzw. mit
+                   overlap="start" nur gleiche Startslots, siehe add_robot_no_overlap)
+        c5         Präzedenz
+        makespan   (z + p)²
+    symmetry="first_task": Task k nur auf R_1 … R_{k+1} (siehe model.symmetry).
+    Rückgabe: (qb, layout, v).
+    """
+    if symmetry not in (None, "first_task"):
+        raise ValueError(f"Tripel-Formulierung unterstützt nur symmetry='first_task', nicht {symmetry!r}.")
+    windows = None
+    if propagate_precedence:
+        info = analyze_precedence(tasks, slots, precedence)
+        if not info.feasible:
+            raise ValueError(f"Präzedenzketten passen nicht in den Horizont: {info.windows}")
+        precedence, windows = info.edges, info.windows
+    robot_mask = first_task_mask(tasks, robots) if symmetry == "first_task" else None
+    layout = TripleLayout(robots, slots, tasks, windows, robot_mask)
+    qb = SparseQuboBuilder(layout)
+    with qb.term_group("assign"):
+        add_assignment_one_hot(qb, layout, 1.0)
+    with qb.term_group("overlap"):
+        add_robot_no_overlap(qb, layout, 1.0, overlap)
+    with qb.term_group("c5"):
+        add_precedence(qb, layout, precedence or [], 1.0)
+    with qb.term_group("makespan"):
+        add_makespan(qb, layout, 1.0)
+    return qb, layout, layout.v
@@ -0,0 +1,76 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo, prepare_layout
+from model.constraints import c3_
+from model.qubo_builder import QuboBuilder, SparseQuboBuilder
+
+from tests.utils import load_instance, max_coo_diff
+
+PENALTIES = {"c1": 1.0, "c2": 1.0, "c3_and": 1.0, "c3_cap": 1.0, "c4": 1.0, "c5": 1.0, "makespan": 0.0}
+
+
+def _min_energy_late_start(c3_func, window_aware):
+    # A (p=2) startet in Slot 2 bei H=4 – zulässig, belegt die Slots 2 und 3
+    tasks, robots, slots = [{"name": "A", "p": 2}], ["R1"], [0, 1, 2, 3]
+    qb, x, y, w = create_component_qubo(tasks, robots, slots, None, c3_func, window_aware=window_aware)
+    model = qb.reweighted(PENALTIES)
+    n = len(qb.indexer)
+    fixed = {x[("A", "R1")]: 1, **{y[("A", z)]: int(z == 2) for z in slots if ("A", z) in y}}
+    free = [i for i in range(n) if i not in fixed]
+    S = np.zeros((2 ** len(free), n), dtype=np.int8)
+    S[:, list(fixed)] = list(fixed.values())
+    S[:, free] = list(itertools.product((0, 1), repeat=len(free)))
+    everything = np.array(list(itertools.product((0, 1), repeat=n)), dtype=np.int8)
+    # QUBO ohne Konstanten: "Strafe 0" heißt Energie gleich dem globalen Minimum
+    return model.energies(S).min() - model.energies(everything).min(), w
+
+
+@pytest.mark.parametrize("c3_func", [c3_.add_c3_capacity_no_overlap, c3_.add_c3_simplified])
+def test_window_aware_keeps_occupied_late_slots(c3_func):
+    full, _ = _min_energy_late_start(c3_func, False)
+    compact, w = _min_energy_late_start(c3_func, True)
+    assert full == pytest.approx(0.0)
+    assert compact == pytest.approx(0.0)
+    assert ("A", "R1", 3) in w                  # belegt, obwohl kein zulässiger Start
+
+
+def _reference_c3_linking(qb, tasks, robots, slots, x, y, w, lam, duration):
+    """Die frühere Schleifenform: ein Term nach dem anderen."""
+    for t in tasks:
+        name, p = t["name"], int(t["p"])
+        for r in robots:
+            if (name, r) not in x:
+                continue
+            xi = x[(name, r)]
+            ws = [w[(name, r, z)] for z in slots if (name, r, z) in w]
+            for z in slots:
+                if (name, r, z) not in w:
+                    continue
+                wi = w[(name, r, z)]
+                qb.add_linear(wi, 2 * lam)
+                qb.add_quad(wi, xi, -lam)
+                for s in slots:
+                    if z - p + 1 <= s <= z and (name, s) in y:
+                        qb.add_quad(wi, y[(name, s)], -lam)
+            if duration and ws:
+                for i, wi in enumerate(ws):
+                    qb.add_linear(wi, lam)
+                    qb.add_quad(wi, xi, -2 * p * lam)
+                    for wj in ws[i + 1:]:
+                        qb.add_quad(wi, wj, 2 * lam)
+                qb.add_linear(xi, p * p * lam)
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(window_aware=True, occupancy=True)])
+@pytest.mark.parametrize("c3_func, duration", [(c3_.add_c3_simplified, False), (c3_.add_c3_capacity_no_overlap, True)])
+def test_batched_linking_matches_loop_reference(c3_func, duration, kwargs):
+    robots, slots, tasks, prec = load_instance("amr5_slots11_task12")
+    layout, x, y, w, _, _ = prepare_layout(tasks, robots, slots, prec, **kwargs)
+    qb = SparseQuboBuilder(layout)
+    c3_func(qb, tasks, robots, slots, x, y, w, 1.5, 0.0)
+    ref = QuboBuilder(layout)
+    _reference_c3_linking(ref, tasks, robots, slots, x, y, w, 1.5, duration)
+    assert max_coo_diff(qb.coo(), ref.coo()) < 1e-9
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.incremental import IncrementalQuboBuilder
+
+from tests.utils import WEIGHTS, keyed_coo
+
+
+def _assert_matches_rebuild(inc, window_aware):
+    base, *_ = create_component_qubo(
+        inc.task_list(), inc.robots, inc.slots, inc.precedence, window_aware=window_aware
+    )
+    want = keyed_coo(base.reweighted(WEIGHTS))
+    got = keyed_coo(inc)
+    assert got.keys() == want.keys()
+    assert max(abs(got[k] - want[k]) for k in want) < 1e-9
+
+
+@pytest.mark.parametrize("window_aware", [False, True])
+def test_incremental_operations_match_full_rebuild(window_aware):
+    rng = np.random.default_rng(0)
+    robots, slots = ["R1", "R2", "R3"], list(range(8))
+    tasks = [{"name": f"T{i}", "p": int(rng.integers(1, 4))} for i in range(5)]
+    inc = IncrementalQuboBuilder(
+        robots, slots, WEIGHTS, tasks, [("T0", "T1"), ("T1", "T3")], window_aware=window_aware
+    )
+    _assert_matches_rebuild(inc, window_aware)
+
+    delta = inc.add_task({"name": "T9", "p": 2}, after=["T2"], before=["T4"])
+    assert delta.added
+    _assert_matches_rebuild(inc, window_aware)
+
+    delta = inc.remove_task("T1")
+    assert delta.removed
+    _assert_matches_rebuild(inc, window_aware)
+
+    # freigegebene Indizes werden wiederverwendet
+    delta = inc.add_task({"name": "T10", "p": 3}, after=["T0"])
+    assert min(delta.added) < len(inc.indexer) - len(delta.added)
+    _assert_matches_rebuild(inc, window_aware)
+
+    for p in (3, 1):
+        inc.change_duration("T9", p)
+        _assert_matches_rebuild(inc, window_aware)
+
+    inc.add_precedence("T10", "T4")
+    _assert_matches_rebuild(inc, window_aware)
+
+
+def test_cyclic_precedence_is_rejected():
+    robots, slots = ["R1", "R2"], list(range(5))
+    tasks = [{"name": "A", "p": 2}, {"name": "B", "p": 1}]
+    inc = IncrementalQuboBuilder(robots, slots, WEIGHTS, tasks, [("A", "B")])
+    before = keyed_coo(inc)
+    with pytest.raises(ValueError, match="Zyklus"):
+        inc.add_precedence("B", "A")
+    with pytest.raises(ValueError, match="Zyklus"):
+        inc.add_task({"name": "C", "p": 1}, after=["B"], before=["A"])
+    assert inc.precedence == [("A", "B")]
+    assert sorted(inc.tasks) == ["A", "B"]
+    assert keyed_coo(inc) == before
+
+
+def test_delta_applied_to_matrix_gives_new_qubo():
+    robots, slots = ["R1", "R2"], list(range(5))
+    tasks = [{"name": "A", "p": 2}, {"name": "B", "p": 1}]
+    inc = IncrementalQuboBuilder(robots, slots, WEIGHTS, tasks)
+    n = 64
+    before = inc.to_sparse().to_scipy_sparse(size=n)
+    delta = inc.add_task({"name": "C", "p": 2}, after=["A"])
+    assert delta.size <= n
+    after = before + delta.to_scipy_sparse(size=n)
+    want = inc.to_sparse().to_scipy_sparse(size=n)
+    assert abs(after - want).max() < 1e-9
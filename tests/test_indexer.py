@@ -0,0 +1,126 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from model.indexer import (
+    Indexer,
+    VariableLayout,
+    assign_ent_to_indexer,
+    count_valid_variants,
+    gather,
+    iter_valid_variants,
+    optimal_variant,
+)
+from model.precedence import analyze_precedence
+from model.symmetry import first_task_mask
+
+from tests.utils import load_instance
+
+SMALL = ["amr2_slots2_task2", "amr3_slots3_task3", "amr3_slots4_task4"]
+
+
+def _tasks_only(tasks, precedence):
+    names = {t["name"] for t in tasks}
+    return [(a, b) for a, b in precedence if a in names and b in names]
+
+
+def _brute_force_variants(robots, slots, tasks):
+    """Alle überlappungsfreien (robot, start, p)-Tupel über das volle Produkt (R·Z)^T."""
+    horizon = max(slots) + 1
+    options = [
+        [(r, z, int(t["p"])) for r in robots for z in slots if z + int(t["p"]) <= horizon]
+        for t in tasks
+    ]
+    out = set()
+    for combo in itertools.product(*options):
+        busy = set()
+        ok = True
+        for r, z, p in combo:
+            cells = {(r, k) for k in range(z, z + p)}
+            if busy & cells:
+                ok = False
+                break
+            busy |= cells
+        if ok:
+            out.add(combo)
+    return out
+
+
+@pytest.mark.parametrize("name", SMALL)
+def test_count_valid_variants_matches_brute_force(name):
+    robots, slots, tasks, _ = load_instance(name)
+    ref = _brute_force_variants(robots, slots, tasks)
+    assert count_valid_variants(robots, slots, tasks) == len(ref)
+    got = list(iter_valid_variants(robots, slots, tasks))
+    assert len(got) == len(set(got))
+    assert set(got) == ref
+
+
+@pytest.mark.parametrize("name", SMALL)
+def test_optimal_variant_matches_brute_force(name):
+    robots, slots, tasks, prec = load_instance(name)
+    prec = _tasks_only(tasks, prec)
+    names = [t["name"] for t in tasks]
+    best = None
+    for combo in _brute_force_variants(robots, slots, tasks):
+        start = {n: z for n, (_, z, _) in zip(names, combo)}
+        p = {t["name"]: int(t["p"]) for t in tasks}
+        if all(start[b] >= start[a] + p[a] for a, b in prec):
+            ms = max(z + d for _, z, d in combo)
+            best = ms if best is None else min(best, ms)
+    ms, variant = optimal_variant(robots, slots, tasks, prec)
+    assert ms == best
+    if variant is not None:
+        assert max(z + d for _, z, d in variant) == ms
+
+
+def _layout_cases():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    info = analyze_precedence(tasks, slots, prec)
+    mask = first_task_mask(tasks, robots)
+    return [
+        dict(),
+        dict(window_aware=True),
+        dict(windows=info.windows),
+        dict(robot_mask=mask),
+        dict(window_aware=True, robot_mask=mask),
+        dict(window_aware=True, occupancy=True),
+        dict(windows=info.windows, robot_mask=mask, occupancy=True),
+    ]
+
+
+@pytest.mark.parametrize("kwargs", _layout_cases())
+def test_layout_matches_dict_indexer(kwargs):
+    robots, slots, tasks, _ = load_instance("amr3_slots5_task5")
+    ix, x, y, w = assign_ent_to_indexer(Indexer(), robots, slots, tasks, **kwargs)
+    layout = VariableLayout(robots, slots, tasks, **kwargs)
+    assert len(layout) == len(ix)
+    names = [t["name"] for t in tasks]
+    for view, mapping, axes in (
+        (layout.x, x, (names, robots)),
+        (layout.y, y, (names, slots)),
+        (layout.w, w, (names, robots, slots)),
+    ):
+        assert np.array_equal(gather(view, *axes), gather(mapping, *axes))
+        assert dict(view.items()) == mapping
+    for i in range(len(ix)):
+        assert layout.reverse(i) == ix.reverse(i)
+
+
+def test_single_robot_table_counts_placements_from_each_slot():
+    from model.indexer import _single_robot_table
+    tasks = [{"name": "A", "p": 2}, {"name": "B", "p": 1}, {"name": "C", "p": 3}]
+    slots = list(range(6))
+    h = _single_robot_table(slots, tasks)
+    for S in range(1 << len(tasks)):
+        variants = _brute_force_variants(["R1"], slots, [t for k, t in enumerate(tasks) if S >> k & 1])
+        for t in range(len(slots) + 1):
+            assert h[t][S] == sum(all(z >= t for _, z, _ in v) for v in variants)
+
+
+def test_tasks_that_cannot_share_a_robot_are_split():
+    # A (p=4) und B (p=3) passen bei H=6 nicht auf einen Roboter, wohl aber auf zwei
+    tasks = [{"name": "A", "p": 4}, {"name": "B", "p": 3}]
+    variants = list(iter_valid_variants(["R1", "R2"], list(range(6)), tasks))
+    assert len(variants) == count_valid_variants(["R1", "R2"], list(range(6)), tasks) == 2 * 3 * 4
@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+import pytest
+
+from model.instances import (
+    DURATIONS,
+    generate_instance,
+    instance_config,
+    instance_family,
+    iter_batches,
+    iter_instances,
+    sample_durations,
+    validate_instance,
+    write_jsonl,
+)
+from model.precedence import analyze_precedence, topological_order
+
+
+def _depth(inst):
+    order = topological_order(inst["tasks"], inst["precedence"])
+    level = {n: 1 for n in order}
+    succ = {n: [] for n in order}
+    for a, b in inst["precedence"]:
+        succ[a].append(b)
+    for n in order:
+        for m in succ[n]:
+            level[m] = max(level[m], level[n] + 1)
+    return max(level.values())
+
+
+def test_generation_is_deterministic_per_seed():
+    a = generate_instance(60, 8, seed=5, durations="lognormal", depth=4, density=0.1)
+    b = generate_instance(60, 8, seed=5, durations="lognormal", depth=4, density=0.1)
+    c = generate_instance(60, 8, seed=6, durations="lognormal", depth=4, density=0.1)
+    assert a == b
+    assert a != c
+
+
+@pytest.mark.parametrize("depth", [1, 2, 6])
+def test_dag_has_requested_depth_and_fits_horizon(depth):
+    inst = generate_instance(200, 20, seed=1, depth=depth, density=0.05)
+    assert _depth(inst) == depth
+    info = analyze_precedence(inst["tasks"], inst["slots"], [tuple(e) for e in inst["precedence"]])
+    assert info.feasible
+
+
+@pytest.mark.parametrize("kind", DURATIONS)
+def test_durations_stay_in_range(kind):
+    p = sample_durations(np.random.default_rng(0), 2000, kind, 2, 9)
+    assert p.min() >= 2 and p.max() <= 9
+
+
+def test_geometric_durations_are_truncated_not_clipped():
+    p = sample_durations(np.random.default_rng(0), 20000, "geometric", 1, 3)
+    freq = np.bincount(p, minlength=4)[1:] / len(p)
+    assert np.allclose(freq, np.array([4, 2, 1]) / 7, atol=0.02)     # Geom(0.5) auf {1, 2, 3} normiert
+
+
+@pytest.mark.parametrize("seed, stored", [
+    (np.random.default_rng(3), None),
+    (np.random.SeedSequence(11), 11),
+    (np.random.SeedSequence(11).spawn(1)[0], None),
+    (np.int64(4), 4),
+])
+def test_non_integer_seeds_are_recorded_safely(seed, stored):
+    inst = generate_instance(10, 2, seed=seed)
+    assert inst["seed"] == stored
+    if stored is not None:
+        assert generate_instance(10, 2, seed=stored) == inst
+
+
+def test_depth_larger_than_task_count_is_rejected():
+    with pytest.raises(ValueError, match="depth"):
+        generate_instance(1, 1, seed=0, depth=3)
+
+
+def test_family_round_trips_through_jsonl(tmp_path):
+    path = str(tmp_path / "family.jsonl")
+    grid = dict(n_tasks=[20, 40], n_robots=[3, 5], depth=[1, 3], density=0.1)
+    n = write_jsonl(instance_family(7, replicates=2, **grid), path)
+    assert n == 16
+    family = list(instance_family(7, replicates=2, **grid))
+    assert list(iter_instances(path)) == family
+    assert [len(b) for b in iter_batches(path, 5)] == [5, 5, 5, 1]
+    first = family[0]
+    assert generate_instance(seed=first["seed"], **first["params"])["tasks"] == first["tasks"]
+    robots, slots, tasks, precedence = instance_config(first)
+    assert robots == first["robots"] and tasks == first["tasks"]
+
+
+@pytest.mark.parametrize("change", [
+    dict(precedence=[["T1", "T1"]]),
+    dict(precedence=[["T1", "T2"], ["T2", "T1"]]),
+    dict(precedence=[["T1", "X"]]),
+    dict(slots=[0, 0]),
+    dict(robots=[]),
+    dict(tasks=[{"name": "T1", "p": 0}]),
+])
+def test_validation_rejects_broken_records(change):
+    inst = generate_instance(3, 2, seed=0)
+    with pytest.raises(ValueError):
+        validate_instance({**inst, **change})
+
+
+def test_reader_reports_line_numbers(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text(json.dumps(generate_instance(3, 2, seed=0)) + "\n\n{oops\n")
+    with pytest.raises(ValueError, match=":3:"):
+        list(iter_instances(str(path)))
@@ -0,0 +1,38 @@
+import pytest
+
+from model.precedence import analyze_precedence, start_windows, topological_order, transitive_reduction
+
+TASKS = [{"name": n, "p": p} for n, p in (("A", 1), ("B", 2), ("C", 1), ("D", 3))]
+
+
+def test_topological_order_respects_edges():
+    edges = [("C", "D"), ("A", "B"), ("B", "C")]
+    order = topological_order(TASKS, edges)
+    assert all(order.index(a) < order.index(b) for a, b in edges)
+
+
+def test_topological_order_errors():
+    with pytest.raises(ValueError):
+        topological_order(TASKS, [("A", "B"), ("B", "A")])
+    with pytest.raises(KeyError):
+        topological_order(TASKS, [("A", "X")])
+
+
+def test_transitive_reduction_drops_implied_and_duplicate_edges():
+    kept, implied = transitive_reduction(TASKS, [("A", "B"), ("B", "C"), ("A", "C"), ("A", "B")])
+    assert sorted(kept) == [("A", "B"), ("B", "C")]
+    assert sorted(implied) == [("A", "B"), ("A", "C")]
+
+
+def test_start_windows_follow_chains():
+    slots = list(range(8))
+    windows = start_windows(TASKS, slots, [("A", "B"), ("B", "D")])
+    assert windows["A"] == (0, 2)          # A(1) B(2) D(3) müssen bis 8 fertig sein
+    assert windows["B"] == (1, 3)
+    assert windows["D"] == (3, 5)
+    assert windows["C"] == (0, 7)
+
+
+def test_infeasible_chain_is_reported():
+    info = analyze_precedence(TASKS, list(range(4)), [("A", "B"), ("B", "D")])
+    assert not info.feasible
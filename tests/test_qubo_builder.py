@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.constraints import c1, c2, c3, c3_, c4, c5
+from model.indexer import Indexer, assign_ent_to_indexer
+from model.objectives import balance, makespan
+from model.qubo_builder import QuboBuilder, SparseQuboBuilder, bounded_coefficients
+
+from tests.utils import WEIGHTS, dense_energies, keyed_coo, load_instance, max_coo_diff
+
+
+def _build(cls, name="amr3_slots5_task5"):
+    robots, slots, tasks, prec = load_instance(name)
+    ix, x, y, w = assign_ent_to_indexer(Indexer(), robots, slots, tasks)
+    qb = cls(ix)
+    c1.add_startslot_exactly_one_constraints(qb, tasks, slots, y, 50)
+    c2.add_assignment_exactly_one_constraints(qb, tasks, robots, x, 50)
+    c3.add_c3_capacity_no_overlap_inline(qb, tasks, robots, slots, x, y, w, 15, 15)
+    c3_.add_c3_simplified(qb, tasks, robots, slots, x, y, w, 7, 9)
+    c3_.add_c3_capacity_no_overlap(qb, tasks, robots, slots, x, y, w, 3, 4)
+    c4.add_c4_consistency_inline(qb, tasks, robots, slots, x, y, 2)
+    c5.add_c5_precedence_inline(qb, tasks, slots, y, prec, 4)
+    makespan.add_makespan_objective(qb, tasks, slots, y, 1.0)
+    balance.add_workload_balance_objective(qb, tasks, robots, x, 0.5)
+    return qb
+
+
+def test_sparse_builder_matches_dict_builder():
+    a, b = _build(QuboBuilder), _build(SparseQuboBuilder)
+    assert max_coo_diff(a.coo(), b.coo()) < 1e-9
+    sa, sb = a.stats(), b.stats()
+    assert (sa.n_entries, sa.n_linear, sa.n_quadratic) == (sb.n_entries, sb.n_linear, sb.n_quadratic)
+    a.prune()
+    b.prune()
+    assert max_coo_diff(a.coo(), b.coo()) < 1e-9
+
+
+def test_energies_match_dense_evaluation():
+    qb = _build(SparseQuboBuilder)
+    S = np.random.default_rng(0).integers(0, 2, (64, len(qb.indexer)))
+    assert np.allclose(qb.energies(S), dense_energies(qb.coo(), S))
+
+
+def test_reweighted_components_match_direct_build():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    base, *_ = create_component_qubo(tasks, robots, slots, prec)
+    ix, x, y, w = assign_ent_to_indexer(Indexer(), robots, slots, tasks)
+    ref = QuboBuilder(ix)
+    c1.add_startslot_exactly_one_constraints(ref, tasks, slots, y, WEIGHTS["c1"])
+    c2.add_assignment_exactly_one_constraints(ref, tasks, robots, x, WEIGHTS["c2"])
+    c3.add_c3_capacity_no_overlap_inline(ref, tasks, robots, slots, x, y, w, WEIGHTS["c3_and"], WEIGHTS["c3_cap"])
+    c4.add_c4_consistency_inline(ref, tasks, robots, slots, x, y, WEIGHTS["c4"])
+    c5.add_c5_precedence_inline(ref, tasks, slots, y, prec, WEIGHTS["c5"])
+    makespan.add_makespan_objective(ref, tasks, slots, y, WEIGHTS["makespan"])
+
+    got = keyed_coo(base.reweighted(WEIGHTS))
+    want = keyed_coo(ref)
+    assert got.keys() == want.keys()
+    assert max(abs(got[k] - want[k]) for k in want) < 1e-9
+
+
+def test_energies_by_group_sum_to_weighted_energy():
+    robots, slots, tasks, prec = load_instance("amr3_slots4_task4")
+    base, *_ = create_component_qubo(tasks, robots, slots, prec)
+    S = np.random.default_rng(1).integers(0, 2, (32, len(base.indexer)))
+    _, groups = base.energies(S, by_group=True)
+    E = base.reweighted(WEIGHTS).energies(S)
+    assert np.allclose(sum(WEIGHTS[g] * groups[g] for g in WEIGHTS), E)
+
+
+@pytest.mark.parametrize("name", ["amr3_slots5_task5", "amr5_slots11_task12"])
+def test_factored_squares_equal_dense_expansion(name):
+    robots, slots, tasks, prec = load_instance(name)
+    dense, *_ = create_component_qubo(tasks, robots, slots, prec)
+    fact, *_ = create_component_qubo(tasks, robots, slots, prec, factored=True)
+    assert fact.n_squares > 0
+    assert max_coo_diff(dense.coo(), fact.coo()) < 1e-9
+    assert max_coo_diff(dense.weighted_coo(WEIGHTS), fact.weighted_coo(WEIGHTS)) < 1e-9
+
+    rd, rf = dense.reweighted(WEIGHTS), fact.reweighted(WEIGHTS)
+    assert rf.n_squares == fact.n_squares
+    S = np.random.default_rng(0).integers(0, 2, (40, len(dense.indexer)))
+    assert np.allclose(rd.energies(S), rf.energies(S))
+    _, gd = dense.energies(S, by_group=True)
+    _, gf = fact.energies(S, by_group=True)
+    for g in gd:
+        assert np.allclose(gd[g], gf[g])
+
+
+@pytest.mark.parametrize("cls", [QuboBuilder, SparseQuboBuilder])
+def test_factored_balance_and_c4_match_dense(cls):
+    robots, slots, tasks, _ = load_instance("amr3_slots5_task5")
+    ix, x, y, w = assign_ent_to_indexer(Indexer(), robots, slots, tasks)
+    a, b = cls(ix), cls(ix)
+    for qb, factored in ((a, False), (b, True)):
+        balance.add_workload_balance_objective(qb, tasks, robots, x, 0.7, factored=factored)
+        c4.add_c4_consistency_inline(qb, tasks, robots, slots, x, y, 1.3, factored)
+    assert max_coo_diff(a.coo(), b.coo()) < 1e-9
+    assert b.stats().n_entries == a.stats().n_entries
+    S = np.random.default_rng(2).integers(0, 2, (50, len(ix)))
+    assert np.allclose(a.energies(S), b.energies(S))
+
+
+def test_batch_kernels_skip_missing_entries():
+    qb = SparseQuboBuilder(Indexer())
+    qb.one_hot_many(np.array([[0, 1, -1], [2, -1, -1]]), 1.0)
+    ref = SparseQuboBuilder(Indexer())
+    ref.one_hot([0, 1], 1.0)
+    ref.one_hot([2], 1.0)
+    assert max_coo_diff(qb.coo(), ref.coo()) < 1e-12
+
+
+@pytest.mark.parametrize("m", range(0, 40))
+def test_bounded_coefficients_cover_exact_range(m):
+    import itertools
+    coef = bounded_coefficients(m)
+    values = {int(np.dot(bits, coef)) for bits in itertools.product([0, 1], repeat=len(coef))}
+    assert values == set(range(m + 1))
+
+
+@pytest.mark.parametrize("cls", [QuboBuilder, SparseQuboBuilder])
+def test_q_returns_zero_for_missing_entries(cls):
+    qb = cls(Indexer())
+    qb.add_linear(0, 1.5)
+    qb.add_quad(2, 1, -2.0)
+    assert qb.Q[(0, 0)] == 1.5 and qb.Q[(1, 2)] == -2.0
+    assert (0, 1) not in qb.Q and len(qb.Q) == 2
+    assert qb.Q.get((0, 1), "leer") == "leer"
+    assert qb.Q[(0, 1)] == 0.0
+
+
+@pytest.mark.parametrize("cls", [QuboBuilder, SparseQuboBuilder])
+def test_add_terms_merges_duplicates_like_add_quad(cls):
+    rng = np.random.default_rng(2)
+    rows, cols = rng.integers(0, 6, 200), rng.integers(0, 6, 200)
+    vals = rng.normal(size=200)
+    ref, qb = QuboBuilder(Indexer()), cls(Indexer())
+    with ref.term_group("g"):
+        for i, j, v in zip(rows.tolist(), cols.tolist(), vals.tolist()):
+            ref.add_quad(i, j, v)
+    with qb.term_group("g"):
+        qb.add_terms(rows, cols, vals)
+    assert max_coo_diff(ref.coo(), qb.coo()) < 1e-9
+    S = rng.integers(0, 2, (16, 6))
+    _, want = ref.energies(S, by_group=True)
+    _, got = qb.energies(S, by_group=True)
+    assert np.allclose(got["g"], want["g"])
+
+
+def test_sparse_q_assignment_replaces_terms():
+    qb = SparseQuboBuilder(Indexer())
+    qb.add_linear(0, 1.0)
+    qb.Q = {(1, 0): 2.0, (2, 2): -1.0}
+    assert dict(qb.Q) == {(0, 1): 2.0, (2, 2): -1.0}
+    with pytest.raises(TypeError):
+        qb.Q[(0, 0)] = 1.0
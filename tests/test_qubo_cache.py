@@ -0,0 +1,35 @@
+import os
+
+from model.analyzer.config import WeightConfig
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.analyzer.qubo_cache import QuboCache, cache_key
+
+from tests.utils import DATA, WEIGHTS, load_instance, max_coo_diff
+
+
+def test_cached_qubo_matches_fresh_build(tmp_path):
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    cache = QuboCache(str(tmp_path))
+    ref, *_ = create_component_qubo(tasks, robots, slots, prec)
+    for _ in range(2):                      # erst bauen, dann aus dem Cache lesen
+        qb, *_ = cache.qubo(tasks, robots, slots, prec, WEIGHTS)
+        assert max_coo_diff(qb.coo(), ref.reweighted(WEIGHTS).coo()) < 1e-9
+        base, *_ = cache.components(tasks, robots, slots, prec)
+        assert max_coo_diff(base.reweighted(WEIGHTS).coo(), ref.reweighted(WEIGHTS).coo()) < 1e-9
+
+
+def test_cache_key_depends_on_content():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    key = cache_key(robots, slots, tasks, prec, WEIGHTS)
+    assert key == cache_key(robots, slots, [dict(t) for t in tasks], prec, dict(WEIGHTS))
+    assert key != cache_key(robots, slots, tasks, prec, {**WEIGHTS, "c1": 3.5})
+    assert key != cache_key(robots, slots[:-1], tasks, prec, WEIGHTS)
+
+
+def test_qubo_from_file_accepts_weight_config(tmp_path):
+    config = WeightConfig("w", 3.0, 2.5, 1.5, 2.0, 1.2, 0.1, 4.0)
+    cache = QuboCache(str(tmp_path))
+    qb, *_ = cache.qubo_from_file(os.path.join(DATA, "amr3_slots5_task5.json"), config)
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    ref, *_ = create_component_qubo(tasks, robots, slots, prec)
+    assert max_coo_diff(qb.coo(), ref.reweighted(WEIGHTS).coo()) < 1e-9
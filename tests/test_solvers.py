@@ -0,0 +1,127 @@
+import threading
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.constraints import c1, c2
+from model.solvers.annealer import SimulatedAnnealer, anneal_batch
+from model.solvers.common import qubo_energies, split_qubo
+from model.solvers.exact import solve_exact
+from model.solvers.ising import ising_energies, qubo_to_ising
+from model.solvers.onehot_annealer import OneHotAnnealer
+from model.solvers.presolve import presolve
+from model.solvers.qaoa import QAOASimulator, cost_vector
+
+from tests.utils import WEIGHTS, all_states, load_instance
+
+
+def _random_qubo(n, seed=0, density=0.5):
+    rng = np.random.default_rng(seed)
+    Q = np.triu(rng.normal(size=(n, n)) * (rng.random((n, n)) < density))
+    return csr_matrix(Q)
+
+
+def _brute_force(model):
+    h, J = split_qubo(model)
+    S = all_states(len(h))
+    return S, qubo_energies(h, J, S)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_exact_solver_matches_brute_force(seed):
+    Q = _random_qubo(12, seed)
+    S, E = _brute_force(Q)
+    res = solve_exact(Q, num_workers=1, block_bits=6, bins=None)
+    assert res.energy == pytest.approx(E.min())
+    assert res.n_ground_states == int(np.sum(E <= E.min() + 1e-9))
+    assert res.spectrum_counts.sum() == len(E)
+    h, J = split_qubo(Q)
+    assert np.allclose(qubo_energies(h, J, res.ground_states), E.min())
+
+
+def test_annealer_reaches_ground_state():
+    Q = _random_qubo(14, seed=5)
+    _, E = _brute_force(Q)
+    res = SimulatedAnnealer(num_workers=1).sample(Q, num_reads=20, sweeps=300, seed=1)
+    h, J = split_qubo(Q)
+    assert np.allclose(res.energies, qubo_energies(h, J, res.samples))
+    assert res.best_energy == pytest.approx(E.min())
+
+
+def test_anneal_batch_honours_stop_event():
+    h, J = split_qubo(_random_qubo(10, seed=2))
+    stop = threading.Event()
+    stop.set()
+    _, _, sweeps_run = anneal_batch(h, J, np.geomspace(0.1, 10.0, 500), 4, seed=0, stop=stop)
+    assert sweeps_run == 1
+    # wer target_energy erreicht, setzt das Event für die übrigen Jobs
+    stop = threading.Event()
+    anneal_batch(h, J, np.geomspace(0.1, 10.0, 500), 4, seed=0, target_energy=np.inf, stop=stop)
+    assert stop.is_set()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_annealer_early_stop_keeps_finished_reads(num_workers):
+    Q = _random_qubo(10, seed=3)
+    sampler = SimulatedAnnealer(num_workers=num_workers)
+    res = sampler.sample(Q, num_reads=12, sweeps=50, seed=0, target_energy=np.inf, reads_per_job=3)
+    assert len(res.samples) == len(res.energies) == 3 * res.info["jobs"]
+    assert res.info["stopped_early"] and 1 <= res.info["jobs"] <= 4
+    assert res.sweeps_run == 1
+    h, J = split_qubo(Q)
+    assert np.allclose(res.energies, qubo_energies(h, J, res.samples))
+
+
+def test_annealer_energies_include_factored_squares():
+    robots, slots, tasks, prec = load_instance("amr3_slots4_task4")
+    base, *_ = create_component_qubo(tasks, robots, slots, prec, factored=True)
+    model = base.reweighted(WEIGHTS)
+    res = SimulatedAnnealer(num_workers=1).sample(model, num_reads=8, sweeps=50, seed=0)
+    assert np.allclose(res.energies, model.energies(res.samples))
+
+
+def test_onehot_annealer_stays_on_one_hot_manifold():
+    robots, slots, tasks, prec = load_instance("amr3_slots4_task4")
+    base, x, y, w = create_component_qubo(tasks, robots, slots, prec)
+    model = base.reweighted(WEIGHTS)
+    groups = [c1.startslot_groups(tasks, slots, y), c2.assignment_groups(tasks, robots, x)]
+    res = OneHotAnnealer(groups, num_workers=1).sample(model, num_reads=10, sweeps=50, seed=0)
+    for group in groups:
+        G = np.asarray(group)
+        assert (res.samples[:, G].sum(axis=2) == 1).all()
+    assert np.allclose(res.energies, model.energies(res.samples))
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_presolve_keeps_optimum(strict):
+    Q = _random_qubo(12, seed=3, density=0.3)
+    _, E = _brute_force(Q)
+    pre = presolve(Q, strict=strict)
+    if len(pre.keep):
+        _, E_red = _brute_force(pre.model)
+        best = pre.energies(E_red.min())
+    else:
+        best = pre.offset
+    assert best == pytest.approx(E.min())
+
+
+def test_ising_energies_match_qubo():
+    Q = _random_qubo(10, seed=7)
+    S, E = _brute_force(Q)
+    h, J, offset = qubo_to_ising(Q)
+    assert np.allclose(ising_energies(h, J, offset, 1 - 2 * S), E)
+
+
+def test_qaoa_cost_vector_matches_energies():
+    Q = _random_qubo(8, seed=9)
+    h, J = split_qubo(Q)
+    k = np.arange(1 << 8)
+    S = (k[:, None] >> np.arange(8)[None, :]) & 1         # Bit i = x_i
+    assert np.allclose(cost_vector(Q), qubo_energies(h, J, S))
+    sim = QAOASimulator(Q)
+    assert sim.ground_energy() == pytest.approx(cost_vector(Q).min())
+    probs = sim.probabilities(np.array([[0.3]]), np.array([[0.7]]))
+    assert probs.shape == (1, 1 << 8)
+    assert probs.sum() == pytest.approx(1.0)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.start_encoding import (
+    create_encoded_qubo,
+    decode_register,
+    indicator_map,
+    n_register_bits,
+)
+
+from tests.utils import WEIGHTS, load_instance
+
+
+@pytest.mark.parametrize("encoding", ["one_hot", "domain_wall"])
+@pytest.mark.parametrize("K", range(1, 7))
+def test_indicator_map_round_trip(encoding, K):
+    A, c = indicator_map(encoding, K)
+    assert A.shape == (K, n_register_bits(encoding, K))
+    for k in range(K):
+        b = np.eye(K)[k] if encoding == "one_hot" else np.array([1] * k + [0] * (K - 1 - k))
+        assert np.allclose(A @ b + c, np.eye(K)[k])
+        assert decode_register(encoding, b[None, :], K)[0] == k
+
+
+def _valid_register_states(enc, n, seed=0):
+    """Zufällige x/w, aber gültige Register (eine Wand bzw. genau eine Eins) je Task."""
+    rng = np.random.default_rng(seed)
+    S = (rng.random((n, len(enc))) < 0.3).astype(np.int8)
+    for name in enc.task_names:
+        K, bits = len(enc.starts[name]), enc.bits[name]
+        k = rng.integers(K, size=n)
+        S[:, bits] = 0
+        for j in range(len(bits)):
+            S[:, bits[j]] = (k == j) if enc.encoding == "one_hot" else (j < k)
+    return S
+
+
+@pytest.mark.parametrize("encoding", ["one_hot", "domain_wall"])
+@pytest.mark.parametrize("name", ["amr3_slots5_task5", "amr4_slots10_task10"])
+def test_encoded_energies_match_xyw_model(encoding, name):
+    robots, slots, tasks, prec = load_instance(name)
+    base, x, y, w = create_component_qubo(tasks, robots, slots, prec, window_aware=True)
+    ref = base.reweighted(WEIGHTS)
+    qb, enc = create_encoded_qubo(tasks, robots, slots, prec, encoding)
+    weights = {**WEIGHTS, "start": 20.0}
+    model = qb.reweighted(weights)
+
+    S = _valid_register_states(enc, 30)
+    X = enc.to_xyw(S, x, y, w, len(base.indexer))
+    assert np.allclose(model.energies(S) + enc.offset(weights), ref.energies(X), atol=1e-9)
+
+
+def test_domain_wall_requires_start_weight():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    qb, _ = create_encoded_qubo(tasks, robots, slots, prec, "domain_wall")
+    with pytest.raises(KeyError, match="start"):
+        qb.reweighted(WEIGHTS)
+    with pytest.raises(KeyError, match="start"):
+        qb.weighted_coo(WEIGHTS)
+
+
+def test_domain_wall_saves_register_qubits():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    _, one_hot = create_encoded_qubo(tasks, robots, slots, prec, "one_hot")
+    _, dw = create_encoded_qubo(tasks, robots, slots, prec, "domain_wall")
+    _, binary = create_encoded_qubo(tasks, robots, slots, prec, "binary", relax_capacity=True)
+    assert one_hot.n_register_qubits() > dw.n_register_qubits() > binary.n_register_qubits()
+    assert len(one_hot) - len(dw) == one_hot.n_register_qubits() - dw.n_register_qubits()
+    counts = dw.variable_counts()
+    assert counts["total"] == len(dw) == counts["x"] + counts["register"] + counts["w"]
+
+
+def test_binary_requires_explicit_relaxation():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    with pytest.raises(ValueError, match="relax_capacity"):
+        create_encoded_qubo(tasks, robots, slots, prec, "binary")
+
+
+def test_binary_makespan_is_exact():
+    robots, slots, tasks, prec = load_instance("amr4_slots10_task10")
+    qb, enc = create_encoded_qubo(tasks, robots, slots, prec, "binary", relax_capacity=True)
+    S = np.random.default_rng(0).integers(0, 2, (100, len(enc)))
+    _, groups = qb.energies(S, by_group=True)
+    z = enc.decode_starts(S)
+    p = np.array([t["p"] for t in tasks])
+    valid = (z >= 0).all(axis=1)
+    assert valid.any()
+    makespan = groups["makespan"] + enc.offsets["makespan"]
+    assert np.allclose(makespan[valid], ((z + p[None, :]) ** 2).sum(axis=1)[valid])
@@ -0,0 +1,77 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from model.analyzer.config import WeightConfig
+from model.analyzer.sweep_runner import _receive, load_results, run_weight_sweep_parallel
+from model.constraints import c3_
+from model.indexer import optimal_variant
+
+from tests.utils import load_instance
+
+CONFIGS = [WeightConfig("a", 3.0, 2.5, 1.5, 2.0, 1.2, 0.1, 4.0), WeightConfig("b", 5.0, 5.0, 2.0, 2.0, 2.0, 0.1, 4.0)]
+SA = {"num_reads": 4, "sweeps": 20}
+
+
+def _sweep(name, store, sa_params=SA):
+    robots, slots, tasks, prec = load_instance(name)
+    return run_weight_sweep_parallel(
+        CONFIGS, tasks, robots, slots, prec, store_path=store, num_trials=2, max_workers=2,
+        sa_params=sa_params, verbose=False,
+    )
+
+
+def test_shared_store_resumes_only_matching_jobs(tmp_path):
+    store = str(tmp_path / "sweep.jsonl")
+    first = _sweep("amr3_slots5_task5", store)
+    assert len(first) == 4 and (first["status"] == "ok").all()
+    assert len(_sweep("amr3_slots5_task5", store)) == 4            # alles bereits erledigt
+    _sweep("amr5_slots11_task12", store)                           # andere Instanz: neu rechnen
+    _sweep("amr3_slots5_task5", store, sa_params={**SA, "sweeps": 30})   # andere Solver-Parameter
+    df = load_results(store)
+    assert len(df) == 12 and df["job_id"].is_unique
+    assert df["fingerprint"].nunique() == 6
+
+
+def _send_and_exit(conn):
+    conn.send({"status": "ok"})
+    conn.close()
+
+
+def test_receive_drains_pipe_of_finished_worker():
+    ctx = mp.get_context()
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_send_and_exit, args=(send,))
+    proc.start()
+    send.close()
+    proc.join()                          # Worker ist schon weg, Ergebnis liegt in der Pipe
+    assert _receive(recv, proc) == {"status": "ok"}
+    recv2, send2 = ctx.Pipe(duplex=False)
+    proc2 = ctx.Process(target=send2.close)
+    proc2.start()
+    send2.close()
+    proc2.join()
+    assert _receive(recv2, proc2)["status"] == "error"
+
+
+def _optimal_occupancy_solver(qb, seed, sa_params):
+    """Liefert den optimalen Plan von amr3_slots5_task5 in Belegungs-Kodierung."""
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    _, variant = optimal_variant(robots, slots, tasks, prec)
+    s = np.zeros((1, len(qb.indexer)), dtype=np.int8)
+    for t, (r, z, p) in zip(tasks, variant):
+        name = t["name"]
+        s[0, [qb.indexer.get(("x", name, r)), qb.indexer.get(("y", name, z))]] = 1
+        s[0, [qb.indexer.get(("w", name, r, k)) for k in range(z, z + p)]] = 1
+    return s, qb.energies(s)
+
+
+def test_sweep_checks_c3_occupancy_models(tmp_path):
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    df = run_weight_sweep_parallel(
+        CONFIGS[:1], tasks, robots, slots, prec, store_path=str(tmp_path / "s.jsonl"),
+        solver=_optimal_occupancy_solver, c3_func=c3_.add_c3_simplified, verbose=False,
+    )
+    row = df.iloc[0]
+    assert row["status"] == "ok"
+    assert row["violations"] == 0 and row["feasible"] and row["feasible_ratio"] == 1.0
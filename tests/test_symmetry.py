@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.indexer import Indexer, iter_valid_variants
+from model.qubo_builder import SparseQuboBuilder
+from model.symmetry import add_load_ordering, first_task_mask
+
+ROBOTS = ["R1", "R2", "R3"]
+SLOTS = [0, 1]
+TASKS = [{"name": "A", "p": 1}, {"name": "B", "p": 1}]
+
+
+def test_first_task_mask_is_lower_staircase():
+    mask = first_task_mask([{"name": f"T{k}", "p": 1} for k in range(4)], ROBOTS)
+    assert mask.tolist() == [
+        [True, False, False],
+        [True, True, False],
+        [True, True, True],
+        [True, True, True],
+    ]
+
+
+def test_first_task_mask_keeps_a_representative_of_every_schedule():
+    robots, slots = ROBOTS, [0, 1, 2]
+    tasks = [{"name": "A", "p": 1}, {"name": "B", "p": 2}, {"name": "C", "p": 1}]
+    mask = first_task_mask(tasks, robots)
+    r_ord = {r: i for i, r in enumerate(robots)}
+    variants = set(iter_valid_variants(robots, slots, tasks))
+    allowed = {v for v in variants if all(mask[k, r_ord[r]] for k, (r, _, _) in enumerate(v))}
+    assert len(allowed) < len(variants)
+    for v in variants:
+        # Roboter in der Reihenfolge ihrer ersten Task umbenennen
+        first = list(dict.fromkeys(r for r, _, _ in v))
+        rename = dict(zip(first + [r for r in robots if r not in first], robots))
+        assert tuple((rename[r], z, p) for r, z, p in v) in allowed
+
+
+def test_first_task_removes_masked_variables():
+    plain, *_ = create_component_qubo(TASKS, ROBOTS, SLOTS)
+    broken, x, _, w = create_component_qubo(TASKS, ROBOTS, SLOTS, symmetry="first_task")
+    # A verliert R2, R3; B verliert R3 – je ein x und len(SLOTS) w
+    assert len(plain.indexer) - len(broken.indexer) == 3 * (1 + len(SLOTS))
+    assert ("A", "R2") not in x and ("A", "R2", 0) not in w
+
+
+def test_load_ordering_penalty_is_zero_iff_loads_non_increasing():
+    tasks = [{"name": "A", "p": 2}, {"name": "B", "p": 1}, {"name": "C", "p": 1}]
+    robots = ["R1", "R2"]
+    ix = Indexer()
+    x = {(t["name"], r): ix.get(("x", t["name"], r)) for t in tasks for r in robots}
+    qb = SparseQuboBuilder(ix)
+    add_load_ordering(qb, tasks, robots, x, 1.0)
+    n_x = len(x)
+    n = len(ix)
+    p = np.array([t["p"] for t in tasks])
+    for assign in itertools.product([0, 1], repeat=n_x):
+        S = np.zeros((1 << (n - n_x), n), dtype=np.int8)
+        S[:, :n_x] = assign
+        S[:, n_x:] = np.array(list(itertools.product([0, 1], repeat=n - n_x)))
+        X = np.array(assign).reshape(len(tasks), len(robots))
+        load = p @ X
+        best = qb.energies(S).min()
+        assert (best == pytest.approx(0.0)) == bool(load[0] >= load[1])
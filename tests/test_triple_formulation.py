@@ -0,0 +1,54 @@
+import numpy as np
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.evaluation.violations import check_samples
+from model.indexer import optimal_variant
+from model.solvers.exact import solve_exact
+from model.triple_formulation import create_triple_qubo
+
+from tests.utils import load_instance
+
+
+def _random_assignments(layout, n, seed=0):
+    """n Samples mit genau einem gesetzten Tripel je Task."""
+    rng = np.random.default_rng(seed)
+    S = np.zeros((n, len(layout)), dtype=np.int8)
+    for t in range(len(layout.task_names)):
+        ids = layout.index[t][layout.index[t] >= 0]
+        S[np.arange(n), rng.choice(ids, size=n)] = 1
+    return S
+
+
+def test_penalties_vanish_exactly_on_feasible_schedules():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    qb, layout, _ = create_triple_qubo(tasks, robots, slots, prec)
+    S = _random_assignments(layout, 400)
+
+    _, x, y, w = create_component_qubo(tasks, robots, slots, prec)
+    X = layout.to_xyw(S, x, y, w)
+    report = check_samples(X, tasks, robots, slots, x, y, w, prec)
+    robot, start = layout.decode(S)
+    assert (report.robot == robot).all() and (report.start == start).all()
+
+    _, groups = qb.energies(S, by_group=True)
+    penalty = groups["overlap"] + groups["c5"]
+    assert report.feasible.any() and not report.feasible.all()
+    assert np.allclose(penalty[report.feasible], 0.0)
+    assert (penalty[~report.feasible] > 0).all()
+
+    completion = (start + layout.durations[None, :]) ** 2
+    assert np.allclose(groups["makespan"], completion.sum(axis=1))
+
+
+def test_exact_ground_state_is_feasible():
+    robots, slots = ["R1", "R2"], [0, 1, 2]
+    tasks = [{"name": "A", "p": 1}, {"name": "B", "p": 2}, {"name": "C", "p": 1}]
+    prec = [("A", "C")]
+    qb, layout, _ = create_triple_qubo(tasks, robots, slots, prec, symmetry="first_task")
+    model = qb.reweighted({"assign": 20, "overlap": 20, "c5": 20, "makespan": 0.1})
+    res = solve_exact(model, num_workers=1)
+    _, x, y, w = create_component_qubo(tasks, robots, slots, prec)
+    report = check_samples(layout.to_xyw(res.ground_states, x, y, w), tasks, robots, slots, x, y, w, prec)
+    assert report.feasible.all()
+    ms, _ = optimal_variant(robots, slots, tasks, prec)
+    assert (report.makespan == ms).all()
@@ -0,0 +1,72 @@
+import numpy as np
+
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.constraints import c3_
+from model.evaluation.violations import check_samples
+from model.indexer import assign_ent_to_layout, iter_valid_variants, optimal_variant
+
+from tests.utils import load_instance
+
+
+def _encode(variant, tasks, robots, slots, x, y, w, n):
+    s = np.zeros(n, dtype=np.int8)
+    for t, (r, z, _) in zip(tasks, variant):
+        s[[x[(t["name"], r)], y[(t["name"], z)], w[(t["name"], r, z)]]] = 1
+    return s
+
+
+def test_valid_variants_are_feasible_and_decoded():
+    robots, slots, tasks, _ = load_instance("amr3_slots4_task4")
+    layout, x, y, w = assign_ent_to_layout(robots, slots, tasks)
+    variants = list(iter_valid_variants(robots, slots, tasks))
+    S = np.array([_encode(v, tasks, robots, slots, x, y, w, len(layout)) for v in variants])
+    report = check_samples(S, tasks, robots, slots, x, y, w)
+    assert report.feasible.all()
+    r_ord = {r: i for i, r in enumerate(robots)}
+    assert (report.robot == [[r_ord[r] for r, _, _ in v] for v in variants]).all()
+    assert (report.start == [[z for _, z, _ in v] for v in variants]).all()
+    assert np.allclose(report.makespan, [max(z + p for _, z, p in v) for v in variants])
+
+
+def test_single_violations_are_counted():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    layout, x, y, w = assign_ent_to_layout(robots, slots, tasks)
+    # T1 und T3 auf R1 überlappend, T3 vor dem Ende von T1 (verletzt C5), T5 ohne Startslot
+    plan = {"T1": ("R1", 0), "T2": ("R2", 0), "T3": ("R1", 0), "T4": ("R3", 0), "T5": ("R3", None)}
+    s = np.zeros(len(layout), dtype=np.int8)
+    for name, (r, z) in plan.items():
+        s[x[(name, r)]] = 1
+        if z is not None:
+            s[[y[(name, z)], w[(name, r, z)]]] = 1
+    report = check_samples(s, tasks, robots, slots, x, y, w, prec)
+    assert report.c1[0] == 1 and report.c4[0] == 1
+    assert report.c3_cap[0] == 1
+    assert report.c5[0] == 2
+    assert not report.feasible[0]
+
+
+def _encode_occupancy(variant, tasks, x, y, w, n):
+    s = np.zeros(n, dtype=np.int8)
+    for t, (r, z, p) in zip(tasks, variant):
+        s[[x[(t["name"], r)], y[(t["name"], z)]]] = 1
+        s[[w[(t["name"], r, k)] for k in range(z, z + p)]] = 1
+    return s
+
+
+@pytest.mark.parametrize("c3_func", [c3_.add_c3_simplified, c3_.add_c3_capacity_no_overlap])
+@pytest.mark.parametrize("window_aware", [False, True])
+def test_occupancy_w_models_are_checked_by_occupancy(c3_func, window_aware):
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    qb, x, y, w = create_component_qubo(tasks, robots, slots, prec, c3_func, window_aware=window_aware)
+    _, variant = optimal_variant(robots, slots, tasks, prec)
+    s = _encode_occupancy(variant, tasks, x, y, w, len(qb.indexer))
+    _, groups = qb.energies(s, by_group=True)
+    assert groups["c3_and"][0] == pytest.approx(0.0) and groups["c3_cap"][0] == pytest.approx(0.0)
+    report = check_samples(s, tasks, robots, slots, x, y, w, prec)
+    assert report.c3_and[0] == 0 and report.feasible[0]
+    # ohne den letzten belegten Slot von T1 ist die Verknüpfung verletzt
+    r, z, p = variant[0]
+    s[w[(tasks[0]["name"], r, z + p - 1)]] = 0
+    assert check_samples(s, tasks, robots, slots, x, y, w, prec).c3_and[0] == 1
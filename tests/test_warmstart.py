@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from model.analyzer.qubo_builder_helper import create_component_qubo
+from model.constraints import c3_
+from model.evaluation.violations import check_samples
+from model.indexer import optimal_variant
+from model.solvers.warmstart import complete_greedy, map_schedule, replan, reverse_anneal_schedule
+
+from tests.utils import WEIGHTS, load_instance
+
+
+@pytest.mark.parametrize("sweeps", [2, 3, 10, 101])
+@pytest.mark.parametrize("pause", [0.0, 0.5, 1.0])
+def test_reverse_schedule_ends_cold(sweeps, pause):
+    sched = reverse_anneal_schedule((0.1, 10.0), sweeps, reheat=0.5, pause=pause)
+    assert len(sched) == sweeps
+    assert sched[-1] == pytest.approx(10.0)
+    assert sched.min() == pytest.approx(1.0)            # β_wende = 10 · (0.1/10)^0.5
+
+
+def test_reverse_schedule_needs_two_sweeps():
+    with pytest.raises(ValueError, match="sweeps"):
+        reverse_anneal_schedule((0.1, 10.0), 1)
+
+
+def test_replan_on_factored_model():
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    base, x, y, w = create_component_qubo(tasks, robots, slots, prec, factored=True)
+    model = base.reweighted(WEIGHTS)
+    previous = {"T1": ("R1", 0), "T2": ("R2", 0), "T3": ("R3", 0)}
+    res = replan(model, previous, tasks, robots, slots, x, y, w, num_reads=4, sweeps=20, seed=0)
+    state = res.info["incumbent"]
+    assert len(state) == len(model.indexer)
+    assert res.info["incumbent_energy"] == pytest.approx(model.energies(state)[0])
+    assert sorted(res.info["inserted_tasks"]) == ["T4", "T5"]
+
+
+@pytest.mark.parametrize("c3_func", [c3_.add_c3_simplified, c3_.add_c3_capacity_no_overlap])
+@pytest.mark.parametrize("window_aware", [False, True])
+def test_warmstart_sets_occupancy_w(c3_func, window_aware):
+    robots, slots, tasks, prec = load_instance("amr3_slots5_task5")
+    qb, x, y, w = create_component_qubo(tasks, robots, slots, prec, c3_func, window_aware=window_aware)
+    model = qb.reweighted(WEIGHTS)
+    _, variant = optimal_variant(robots, slots, tasks, prec)
+    plan = {t["name"]: (r, z) for t, (r, z, _) in zip(tasks, variant)}
+
+    state, open_tasks = map_schedule(plan, tasks, robots, slots, x, y, w, len(qb.indexer))
+    assert open_tasks == []
+    assert state.sum() == sum(2 + p for _, _, p in variant)
+    assert check_samples(state, tasks, robots, slots, x, y, w, prec).feasible[0]
+
+    # die letzten beiden Tasks gierig einfügen: w muss die ganze Dauer belegen
+    previous = {k: v for k, v in plan.items() if k not in ("T4", "T5")}
+    state, open_tasks = map_schedule(previous, tasks, robots, slots, x, y, w, len(qb.indexer))
+    state = complete_greedy(model, state, open_tasks, tasks, robots, slots, x, y, w)
+    _, groups = qb.energies(state, by_group=True)
+    assert groups["c3_and"][0] == pytest.approx(0.0)
+    assert check_samples(state, tasks, robots, slots, x, y, w, prec).c3_and[0] == 0
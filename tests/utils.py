@@ -0,0 +1,54 @@
+import itertools
+import os
+
+import numpy as np
+
+from model.indexer import load_amr_config
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Gewichte, die sich paarweise unterscheiden (Vertauschungen fallen so auf)
+WEIGHTS = {"c1": 3.0, "c2": 2.5, "c3_and": 1.5, "c3_cap": 2.0, "c4": 1.2, "c5": 4.0, "makespan": 0.1}
+
+
+def load_instance(name: str):
+    """(robots, slots, tasks, precedence) einer Instanz aus data/."""
+    return load_amr_config(os.path.join(DATA, f"{name}.json"))
+
+
+def all_states(n: int) -> np.ndarray:
+    """Alle 2^n Belegungen als (2^n, n)-Matrix."""
+    return np.array(list(itertools.product([0, 1], repeat=n)), dtype=np.int8).reshape(-1, n)
+
+
+def coo_dict(coo) -> dict:
+    """(rows, cols, vals) -> {(i, j): Summe}."""
+    rows, cols, vals = coo
+    out = {}
+    for i, j, v in zip(rows.tolist(), cols.tolist(), vals.tolist()):
+        out[(i, j)] = out.get((i, j), 0.0) + v
+    return out
+
+
+def max_coo_diff(a, b) -> float:
+    A, B = coo_dict(a), coo_dict(b)
+    return max((abs(A.get(k, 0.0) - B.get(k, 0.0)) for k in set(A) | set(B)), default=0.0)
+
+
+def keyed_coo(qb, eps: float = 1e-9) -> dict:
+    """QUBO als {(Schlüssel, Schlüssel): Wert} – unabhängig von der Index-Vergabe."""
+    out = {}
+    for (i, j), v in coo_dict(qb.coo()).items():
+        key = tuple(sorted((qb.indexer.reverse(i), qb.indexer.reverse(j)), key=str))
+        out[key] = out.get(key, 0.0) + v
+    return {k: v for k, v in out.items() if abs(v) > eps}
+
+
+def dense_energies(coo, S: np.ndarray) -> np.ndarray:
+    """Referenz-Energie Σ_{i<=j} Q_ij s_i s_j über eine dichte Matrix."""
+    rows, cols, vals = coo
+    n = S.shape[1]
+    Q = np.zeros((n, n))
+    np.add.at(Q, (rows, cols), vals)
+    S = S.astype(np.float64)
+    return np.einsum("ni,ij,nj->n", S, Q, S)